@@ -1,9 +1,9 @@
 import pyJianYingDraft as draft
+from pyJianYingDraft import json_backend
 import logging
 import os
 import sys
 from functools import wraps
-import json
 from datetime import datetime
 from rest_framework import status
 from rest_framework.response import Response
@@ -77,8 +77,8 @@ def save_draft_to_file(draft_content, filename=None):
     os.makedirs(web_output_dir, exist_ok=True)
     file_path = os.path.join(web_output_dir, filename)
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(draft_content, f, ensure_ascii=False, indent=2)
+    with open(file_path, 'wb') as f:
+        f.write(json_backend.dumps_bytes(draft_content, indent=2))
 
     logger.info(f"✅ 草稿文件已保存: {file_path}")
     return file_path
@@ -110,8 +110,8 @@ def create_and_save_script(script, template_name, success_message, additional_da
     Returns:
         Response: API响应，包含序列化的脚本内容
     """
-    # 将Script_file对象序列化为JSON字符串，然后解析为字典
-    script_json = json.loads(script.dumps())
+    # 直接导出为字典, 省去序列化再解析的过程
+    script_json = script.export_dict()
 
     # 准备项目信息
     project_info = {
@@ -48,7 +48,7 @@ def basic_project(request):
         name=f'基础项目_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
         type='basic-project',
         status='completed',
-        draft_content=script.dumps() if hasattr(script, 'dumps') else "{}")
+        draft_content=script.export_dict() if hasattr(script, 'export_dict') else {})
 
     return create_success_response(
         "基础项目创建成功",
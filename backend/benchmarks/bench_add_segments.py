@@ -0,0 +1,38 @@
+"""对比逐个`Script_file.add_segment`与批量`Script_file.add_segments`的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_add_segments [片段数量, ...]
+默认依次测试1万、10万及100万个贴纸片段, 100万个片段需要数GB内存
+"""
+
+import sys
+import time
+from typing import List
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Sticker_segment, Track_type, Timerange
+
+
+def make_segments(count: int) -> List[Sticker_segment]:
+    return [Sticker_segment("7226264888031694140", Timerange(i * 100000, 100000)) for i in range(count)]
+
+def bench(count: int) -> None:
+    script = draft.Script_file(1920, 1080).add_track(Track_type.sticker)
+    segments = make_segments(count)
+    start = time.perf_counter()
+    for seg in segments:
+        script.add_segment(seg)
+    per_call = time.perf_counter() - start
+
+    script = draft.Script_file(1920, 1080).add_track(Track_type.sticker)
+    segments = make_segments(count)
+    start = time.perf_counter()
+    script.add_segments(segments)
+    batch = time.perf_counter() - start
+
+    print(f"{count:>9} 个片段: 逐个添加 {per_call:8.3f}s, 批量添加 {batch:8.3f}s ({per_call / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for n in counts:
+        bench(n)
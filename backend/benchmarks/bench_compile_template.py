@@ -0,0 +1,66 @@
+"""对比逐个草稿"加载模板-替换-导出"与预编译模板渲染的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_compile_template [草稿数量]
+模板包含若干文本片段和一段背景音乐, 每个草稿替换标题文字及背景音乐素材
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Text_segment, Audio_segment, Audio_material, Track_type, Text_slot, Material_slot, trange
+
+
+def write_wav(path: str, seconds: int) -> None:
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(struct.pack("<h", 0) * 8000 * seconds)
+
+def make_template(folder: str) -> str:
+    bgm_path = os.path.join(folder, "bgm.wav")
+    write_wav(bgm_path, 30)
+    script = draft.Script_file(1080, 1920).add_track(Track_type.text).add_track(Track_type.audio)
+    for i in range(20):
+        script.add_segment(Text_segment("第%d行字幕" % i, trange("%ds" % i, "1s")))
+    script.add_segment(Audio_segment(Audio_material(bgm_path), trange(0, "20s")))
+    template_path = os.path.join(folder, "template.json")
+    script.dump(template_path)
+    return template_path
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as folder:
+        template_path = make_template(folder)
+        new_bgm_path = os.path.join(folder, "new_bgm.wav")
+        write_wav(new_bgm_path, 20)
+        new_bgm = Audio_material(new_bgm_path)
+
+        start = time.perf_counter()
+        for i in range(count):
+            script = draft.Script_file.load_template(template_path)
+            script.replace_text(script.get_imported_track(Track_type.text, index=0), 0, "标题%d" % i)
+            script.replace_material_by_name("bgm.wav", new_bgm)
+            reference = script.dumps().encode("utf-8")
+        per_draft = (time.perf_counter() - start) / count
+
+        template = draft.Script_file.load_template(template_path)
+        compiled = template.compile_template({
+            "title": Text_slot(template.get_imported_track(Track_type.text, index=0), 0),
+            "bgm": Material_slot("bgm.wav", "audio"),
+        })
+        assert compiled.render({"title": "标题%d" % (count - 1), "bgm": new_bgm}) == reference
+
+        start = time.perf_counter()
+        for i in range(count * 10):
+            compiled.render({"title": "标题%d" % i, "bgm": new_bgm})
+        per_render = (time.perf_counter() - start) / (count * 10)
+
+    print(f"加载-替换-导出: {per_draft * 1e6:10.1f} us/草稿")
+    print(f"预编译模板渲染: {per_render * 1e6:10.1f} us/草稿  ({per_draft / per_render:.1f}x)")
@@ -0,0 +1,62 @@
+"""测试在1小时长的片段上采样并精简运动曲线的耗时及效果
+
+运行方式(在backend目录下): python -m benchmarks.bench_curve_sampler [时长(小时)]
+每条曲线逐帧(30fps)采样, 报告采样点数、精简后的关键帧数、耗时以及实际的最大偏差
+"""
+
+import math
+import sys
+import time
+from bisect import bisect_right
+from typing import Any, Callable, Dict, Sequence
+
+from pyJianYingDraft import SEC
+from pyJianYingDraft.curve_sampler import sample_curve, simplify_keyframes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+TOLERANCE = 1e-3
+
+
+def max_error(times: Sequence[int], values: Sequence[float], kept_times: Sequence[int], kept_values: Sequence[float]) -> float:
+    """保留的关键帧线性插值后与各采样点的最大偏差"""
+    worst = 0.0
+    for t, v in zip(times, values):
+        i = min(bisect_right(kept_times, t), len(kept_times) - 1)
+        t0, t1, v0, v1 = kept_times[i - 1], kept_times[i], kept_values[i - 1], kept_values[i]
+        worst = max(worst, abs(v0 + (v1 - v0) * (t - t0) / (t1 - t0) - v))
+    return worst
+
+def ken_burns(t: Any) -> Any:
+    """每10秒一段的缓入缓出平移"""
+    p = (t % (10 * SEC)) / (10 * SEC)
+    return p * p * (3 - 2 * p) * 0.5
+
+def envelope(t: Any) -> Any:
+    """周期为8秒的音量起伏"""
+    sin = np.sin if np is not None and not isinstance(t, int) else math.sin
+    return 0.6 + 0.4 * sin(t / SEC * math.pi / 4)
+
+def linear_ramp(t: Any) -> Any:
+    """匀速变化, 理论上只需两个关键帧"""
+    return t / (3600 * SEC)
+
+
+if __name__ == "__main__":
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    duration = int(hours * 3600 * SEC)
+    curves: Dict[str, Callable[[Any], Any]] = {"Ken Burns": ken_burns, "音量包络": envelope, "匀速": linear_ramp}
+
+    print(f"片段时长 {hours:g} 小时, 误差容限 {TOLERANCE}")
+    for name, curve in curves.items():
+        start = time.perf_counter()
+        times, values = sample_curve(curve, duration)
+        sampled = time.perf_counter()
+        kept_times, kept_values = simplify_keyframes(times, values, TOLERANCE)
+        simplified = time.perf_counter()
+        error = max_error(times, values, kept_times, kept_values)
+        print(f"{name:<10}: {len(times):7d} 个采样点 -> {len(kept_times):6d} 个关键帧, "
+              f"采样 {(sampled - start) * 1e3:7.1f} ms, 精简 {(simplified - sampled) * 1e3:7.1f} ms, 最大偏差 {error:.2e}")
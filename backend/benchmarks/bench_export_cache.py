@@ -0,0 +1,41 @@
+"""测试片段导出缓存: 修改少量片段后重新导出轨道的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_export_cache [片段数量]
+"""
+
+import sys
+import time
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Sticker_segment, Track_type, Timerange, Keyframe_property
+
+MODIFIED = 10
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    script = draft.Script_file(1920, 1080).add_track(Track_type.sticker)
+    segments = [Sticker_segment("7226264888031694140", Timerange(i * 100000, 100000)) for i in range(count)]
+    for seg in segments:
+        seg.add_keyframe(Keyframe_property.alpha, 0, 0.0)
+        seg.add_keyframe(Keyframe_property.alpha, 50000, 1.0)
+    script.add_segments(segments)
+    track = script.tracks["sticker"]
+
+    uncached = timed(lambda: [seg.export_json() for seg in track.segments])
+    first = timed(track.export_json)
+    for seg in segments[::count // MODIFIED][:MODIFIED]:
+        seg.clip_settings.transform_x += 0.1
+        seg.volume = 0.5
+    after_edit = timed(track.export_json)
+
+    print(f"{count} 个片段, 修改 {MODIFIED} 个")
+    print(f"逐个导出(无缓存): {uncached * 1e3:8.1f} ms")
+    print(f"首次导出轨道    : {first * 1e3:8.1f} ms")
+    print(f"修改后重新导出  : {after_edit * 1e3:8.1f} ms  ({uncached / after_edit:.1f}x)")
@@ -0,0 +1,39 @@
+"""对比不同id生成器下创建大量关键帧及片段的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_id_factory [关键帧数量]
+"""
+
+import sys
+import time
+import uuid
+
+from pyJianYingDraft import Sticker_segment, Timerange, Keyframe_property, Id_factory, use_id_factory
+from pyJianYingDraft.id_factory import Id_source
+
+
+def build(count: int) -> None:
+    for i in range(count // 4):
+        seg = Sticker_segment("7226264888031694140", Timerange(i * 100000, 100000))
+        for j in range(4):
+            seg.add_keyframe(Keyframe_property.alpha, j * 20000, j / 4)
+
+def timed(source: Id_source, count: int) -> float:
+    with use_id_factory(source):
+        start = time.perf_counter()
+        build(count)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sources = {
+        "uuid4": lambda: uuid.uuid4().hex,
+        "随机前缀+计数器": Id_factory(),
+        "固定种子": Id_factory(seed=0),
+    }
+    baseline = None
+    print(f"{count} 个关键帧, {count // 4} 个贴纸片段")
+    for name, source in sources.items():
+        elapsed = timed(source, count)
+        baseline = baseline or elapsed
+        print(f"{name:<10}: {elapsed * 1e3:8.1f} ms  ({baseline / elapsed:.2f}x)")
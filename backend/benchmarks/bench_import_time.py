@@ -0,0 +1,39 @@
+"""测量导入`pyJianYingDraft`的耗时, 以及首次访问延迟导入的元数据枚举的耗时
+
+每项测量都在新的解释器进程中进行, 取多次运行的中位数.
+运行方式(在backend目录下): python -m benchmarks.bench_import_time [运行次数]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+CASES = {
+    "import pyJianYingDraft": "import pyJianYingDraft",
+    "Script_file, Timerange": "from pyJianYingDraft import Script_file, Timerange",
+    "+ 访问 Filter_type": "from pyJianYingDraft import Script_file, Timerange, Filter_type",
+    "+ 全部元数据枚举": "import pyJianYingDraft.metadata as m; [getattr(m, name) for name in m.__all__]",
+}
+
+TIMER = "import time; _t = time.perf_counter(); {stmt}; print(time.perf_counter() - _t)"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(stmt: str, runs: int) -> float:
+    """在新进程中执行`stmt`若干次, 返回耗时的中位数(秒)"""
+    samples: List[float] = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", TIMER.format(stmt=stmt)],
+                                cwd=BACKEND_DIR, check=True, capture_output=True, text=True).stdout
+        samples.append(float(output))
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    measure(CASES["+ 全部元数据枚举"], 1)  # 预热, 确保字节码已缓存
+    print(f"各取 {runs} 次运行的中位数")
+    for name, stmt in CASES.items():
+        print(f"{name:<24}: {measure(stmt, runs) * 1e3:8.1f} ms")
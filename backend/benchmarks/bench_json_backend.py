@@ -0,0 +1,66 @@
+"""对比各JSON后端解析及序列化草稿的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_json_backend [片段数量]
+分别测试草稿的解析、缩进格式及紧凑格式的序列化, 以及文本素材中嵌套JSON字符串(`content`字段)的编码
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import json_backend
+from pyJianYingDraft import Sticker_segment, Text_segment, Text_style, Track_type, Keyframe_property, Timerange
+
+
+def timed(func: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def make_script(count: int) -> draft.Script_file:
+    script = draft.Script_file(1920, 1080).add_track(Track_type.sticker).add_track(Track_type.text)
+    for i in range(count):
+        seg = Sticker_segment("7226264888031694140", Timerange(i * 100000, 100000))
+        seg.add_keyframe(Keyframe_property.position_x, 0, -0.5)
+        seg.add_keyframe(Keyframe_property.position_x, 50000, 0.5)
+        script.add_segment(seg)
+        script.add_segment(Text_segment("第%d行字幕\n含\"引号\"与\\反斜杠" % i, Timerange(i * 100000, 100000),
+                                        style=Text_style(size=6.0, color=(1.0, 0.8, 0.2))))
+    return script
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    content = make_script(count).export_dict()
+    texts = [{"content": material["content"]} for material in content["materials"]["texts"]]
+    backends = ["json"]
+    try:
+        json_backend.set_backend("orjson")
+        backends.append("orjson")
+    except ValueError:
+        pass  # 未安装orjson
+
+    results: Dict[str, Dict[str, float]] = {}
+    for backend in backends:
+        json_backend.set_backend(backend)  # type: ignore
+        text = json_backend.dumps(content, indent=4)
+        results[backend] = {
+            "解析": timed(lambda: json_backend.loads(text)),
+            "序列化(缩进)": timed(lambda: json_backend.dumps(content, indent=4)),
+            "序列化(紧凑)": timed(lambda: json_backend.dumps(content, separators=(",", ":"))),
+            "文本content字段": timed(lambda: json_backend.dumps(texts, indent=4)),
+        }
+
+    print(f"{count} 个贴纸片段及文本片段, 草稿大小 {len(text) / 1e6:.1f} MB")
+    for item in results["json"]:
+        line = f"{item:<12}"
+        for backend in backends:
+            elapsed = results[backend][item]
+            line += f"  {backend}: {elapsed * 1e3:8.1f} ms"
+            if backend != "json":
+                line += f" ({results['json'][item] / elapsed:.1f}x)"
+        print(line)
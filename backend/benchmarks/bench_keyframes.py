@@ -0,0 +1,64 @@
+"""对比逐个添加与批量添加密集关键帧的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_keyframes [每个片段的关键帧数量]
+"""
+
+import math
+import sys
+import time
+from array import array
+from typing import Any, Callable
+
+from pyJianYingDraft import Sticker_segment, Timerange, Keyframe_property
+
+SEGMENTS = 10
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def new_segment(i: int) -> Sticker_segment:
+    return Sticker_segment("7226264888031694140", Timerange(i * 60_000_000, 60_000_000))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    step = 60_000_000 // count
+    times = [i * step for i in range(count)]
+    values = [math.sin(i / 100) * 0.1 for i in range(count)]
+
+    def one_by_one() -> None:
+        for i in range(SEGMENTS):
+            seg = new_segment(i)
+            for t, v in zip(times, values):
+                seg.add_keyframe(Keyframe_property.position_x, t, v)
+
+    def bulk_list() -> None:
+        for i in range(SEGMENTS):
+            new_segment(i).add_keyframes(Keyframe_property.position_x, times, values)
+
+    def bulk_array() -> None:
+        times_array, values_array = array("q", times), array("d", values)
+        for i in range(SEGMENTS):
+            new_segment(i).add_keyframes(Keyframe_property.position_x, times_array, values_array)
+
+    cases = {"逐个add_keyframe": one_by_one, "add_keyframes(list)": bulk_list, "add_keyframes(array)": bulk_array}
+    try:
+        import numpy as np
+        times_np, values_np = np.array(times, dtype=np.int64), np.array(values)
+        cases["add_keyframes(numpy)"] = lambda: [new_segment(i).add_keyframes(Keyframe_property.position_x, times_np, values_np)
+                                                 for i in range(SEGMENTS)]
+    except ImportError:
+        pass
+
+    print(f"{SEGMENTS} 个片段, 每个片段 {count} 个关键帧")
+    baseline = None
+    for name, func in cases.items():
+        elapsed = timed(func)
+        baseline = baseline or elapsed
+        print(f"{name:<22}: {elapsed * 1e3:9.1f} ms  ({baseline / elapsed:.1f}x)")
+
+    seg = new_segment(0).add_keyframes(Keyframe_property.position_x, times, values)
+    print(f"导出单个片段          : {timed(seg.export_json) * 1e3:9.1f} ms")
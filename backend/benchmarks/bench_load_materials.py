@@ -0,0 +1,52 @@
+"""对比逐个构造素材与用`load_materials`并行加载一批素材的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_load_materials [素材目录]
+不指定素材目录时在临时目录中生成一批WAV音频及PNG图片. 测量时不启用探测缓存.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Video_material, Audio_material
+
+from .bench_probe_cache import AUDIO_POSTFIXES, generate
+
+def load_sequential(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            if path.lower().endswith(AUDIO_POSTFIXES):
+                Audio_material(path)
+            else:
+                Video_material(path)
+        except (OSError, ValueError):
+            pass
+
+def bench(paths: List[str]) -> None:
+    draft.set_probe_cache(None)
+    cases = {
+        "逐个构造": lambda: load_sequential(paths),
+        "线程池 x4": lambda: draft.load_materials(paths, workers=4),
+        "线程池 x16": lambda: draft.load_materials(paths, workers=16),
+        "进程池": lambda: draft.load_materials(paths, use_processes=True),
+    }
+    print(f"{len(paths)} 个素材文件, {os.cpu_count()} 个CPU")
+    baseline = 0.0
+    for name, func in cases.items():
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{name:<10}: {elapsed * 1e3:9.1f} ms  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1:
+            media_paths = sorted(os.path.join(sys.argv[1], name) for name in os.listdir(sys.argv[1]))
+        else:
+            media_paths = generate(temp_dir, 100)
+        bench(media_paths)
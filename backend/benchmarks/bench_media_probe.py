@@ -0,0 +1,66 @@
+"""对比只解析文件头部与调用mediainfo(GIF另需imageio)探测素材的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_media_probe [素材目录]
+不指定素材目录时在临时目录中生成WAV音频、PNG图片及多帧GIF动画.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from PIL import Image
+
+from pyJianYingDraft import local_materials
+from pyJianYingDraft.media_probe import probe_header
+
+from .bench_probe_cache import generate
+
+def generate_gifs(directory: str, count: int) -> List[str]:
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, "anim%d.gif" % i)
+        frames = [Image.new("P", (320, 240), (i + j) % 256) for j in range(30)]
+        frames[0].save(path, save_all=True, append_images=frames[1:], duration=40, loop=0)
+        paths.append(path)
+    return paths
+
+def probe_mediainfo(path: str) -> None:
+    """构造素材原先的探测方式"""
+    import pymediainfo
+    pymediainfo.MediaInfo.parse(path, mediainfo_options={"File_TestContinuousFileNames": "0"})
+    if path.endswith(".gif"):
+        import imageio
+        gif = imageio.get_reader(path)
+        int(round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3))
+        gif.close()
+
+def time_per_file(func: Callable[[str], object], paths: List[str]) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    return (time.perf_counter() - start) / len(paths)
+
+def bench(paths: List[str]) -> None:
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        groups.setdefault(os.path.splitext(path)[1].lower(), []).append(path)
+    native = sum(probe_header(path) is not None for path in paths)
+    print(f"{len(paths)} 个素材文件, 其中 {native} 个可只解析文件头部")
+    probe_mediainfo(paths[0])  # 预先加载mediainfo
+    for postfix, group in sorted(groups.items()):
+        header_time = time_per_file(probe_header, group)
+        mediainfo_time = time_per_file(probe_mediainfo, group)
+        probe_time = time_per_file(local_materials._probe_video if postfix != ".wav" else local_materials._probe_audio, group)
+        print(f"{postfix:<6} x{len(group):<4}: mediainfo {mediainfo_time * 1e3:7.3f} ms/个 | 文件头部 {header_time * 1e3:7.3f} ms/个 "
+              f"({mediainfo_time / header_time:.0f}x) | 素材探测 {probe_time * 1e3:7.3f} ms/个")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1:
+            media_paths = sorted(os.path.join(sys.argv[1], name) for name in os.listdir(sys.argv[1]))
+        else:
+            media_paths = generate(temp_dir, 50) + generate_gifs(temp_dir, 10)
+        bench(media_paths)
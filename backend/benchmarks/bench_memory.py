@@ -0,0 +1,115 @@
+"""测量片段及关键帧对象的内存占用
+
+运行方式(在backend目录下): python -m benchmarks.bench_memory [片段数量]
+分别统计每个贴纸片段(含其时间范围、速度及图像调节设置)与每个关键帧的平均字节数.
+作为对照, 本文件中的`_Dict_*`类按改用`__slots__`之前的属性布局复刻了相应的对象(属性保存在实例字典中,
+关键帧为逐个保存的对象), 二者的差即为改动前后的差别.
+"""
+
+import sys
+import tracemalloc
+from typing import Any, Callable, List, Optional
+
+from pyJianYingDraft import Sticker_segment, Timerange, Keyframe_property
+from pyJianYingDraft.id_factory import new_id
+
+KEYFRAMES_PER_SEGMENT = 20
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """构造对象并返回其间新分配且仍存活的字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+class _Dict_timerange:
+    def __init__(self, start: int, duration: int):
+        self.start = start
+        self.duration = duration
+
+class _Dict_keyframe:
+    def __init__(self, time_offset: int, value: float):
+        self.kf_id = new_id()
+        self.time_offset = time_offset
+        self.values = [value]
+
+class _Dict_keyframe_list:
+    def __init__(self, keyframe_property: Keyframe_property):
+        self.list_id = new_id()
+        self.keyframe_property = keyframe_property
+        self.keyframes: List[_Dict_keyframe] = []
+
+    def add_keyframe(self, time_offset: int, value: float) -> None:
+        self.keyframes.append(_Dict_keyframe(time_offset, value))
+        self.keyframes.sort(key=lambda x: x.time_offset)
+
+class _Dict_speed:
+    def __init__(self, speed: float):
+        self.global_id = new_id()
+        self.speed = speed
+
+class _Dict_clip_settings:
+    def __init__(self) -> None:
+        self.alpha = 1.0
+        self.flip_horizontal, self.flip_vertical = False, False
+        self.rotation = 0.0
+        self.scale_x, self.scale_y = 1.0, 1.0
+        self.transform_x, self.transform_y = 0.0, 0.0
+
+class _Dict_sticker_segment:
+    def __init__(self, resource_id: str, target_timerange: _Dict_timerange):
+        self.segment_id = new_id()
+        self.material_id = new_id()
+        self.target_timerange = target_timerange
+        self.common_keyframes: List[_Dict_keyframe_list] = []
+        self.source_timerange: Optional[_Dict_timerange] = None
+        self.speed = _Dict_speed(1.0)
+        self.volume = 1.0
+        self.extra_material_refs = [self.speed.global_id]
+        self.clip_settings = _Dict_clip_settings()
+        self.uniform_scale = True
+        self.animations_instance = None
+        self.resource_id = resource_id
+
+    def add_keyframe(self, _property: Keyframe_property, time_offset: int, value: float) -> "_Dict_sticker_segment":
+        for kf_list in self.common_keyframes:
+            if kf_list.keyframe_property == _property:
+                kf_list.add_keyframe(time_offset, value)
+                return self
+        kf_list = _Dict_keyframe_list(_property)
+        kf_list.add_keyframe(time_offset, value)
+        self.common_keyframes.append(kf_list)
+        return self
+
+def make_segments(count: int) -> Any:
+    return [Sticker_segment("7226264888031694140", Timerange(i * 100000, 100000)) for i in range(count)]
+
+def make_dict_segments(count: int) -> Any:
+    return [_Dict_sticker_segment("7226264888031694140", _Dict_timerange(i * 100000, 100000)) for i in range(count)]
+
+def add_keyframes(segments: Any) -> Any:
+    for seg in segments:
+        for j in range(KEYFRAMES_PER_SEGMENT):
+            seg.add_keyframe(Keyframe_property.position_x, j * 1000, j / KEYFRAMES_PER_SEGMENT)
+    return segments
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = {}
+    for name, make in (("字典存储(改动前)", make_dict_segments), ("当前", make_segments)):
+        segment_bytes = measure(lambda: make(count))
+        segments = make(count)
+        keyframe_bytes = measure(lambda: add_keyframes(segments))
+        results[name] = (segment_bytes / count, keyframe_bytes / (count * KEYFRAMES_PER_SEGMENT))
+        del segments
+
+    print(f"{count} 个贴纸片段, 每个片段 {KEYFRAMES_PER_SEGMENT} 个关键帧")
+    (before_segment, before_keyframe), (after_segment, after_keyframe) = results.values()
+    print(f"{'':<10}  {'字典存储(改动前)':>10}  {'当前':>10}")
+    print(f"{'每个片段':<8}: {before_segment:10.1f} 字节  {after_segment:10.1f} 字节 ({after_segment / before_segment:.0%})")
+    print(f"{'每个关键帧':<7}: {before_keyframe:10.1f} 字节  {after_keyframe:10.1f} 字节 ({after_keyframe / before_keyframe:.0%})")
@@ -0,0 +1,62 @@
+"""对比直接导入源模块与读取元数据目录两种方式下, 加载元数据枚举的耗时及内存占用
+
+每项测量都在新的解释器进程中进行, 耗时取多次运行的中位数; 内存为另行运行时tracemalloc统计的加载后新增的内存.
+运行方式(在backend目录下): python -m benchmarks.bench_metadata_catalog [运行次数]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+from typing import Tuple
+
+SOURCE = "source_enum({name!r})"
+CATALOG = "enum_type({name!r})"
+
+CASES = {
+    "单个滤镜": "{filter}.书意.value",
+    "全部视频特效": "[x.value for x in {scene}]",
+    "全部枚举": "[x.value for name in ENUM_MODULES for x in {each}]",
+}
+
+TIMER = """import time
+from pyJianYingDraft.metadata.catalog import ENUM_MODULES, enum_type, source_enum
+_t = time.perf_counter()
+{stmt}
+print(time.perf_counter() - _t)
+"""
+
+MEMORY = """import tracemalloc
+from pyJianYingDraft.metadata.catalog import ENUM_MODULES, enum_type, source_enum
+tracemalloc.start()
+{stmt}
+print(tracemalloc.get_traced_memory()[0])
+"""
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run(script: str) -> float:
+    """在新进程中执行脚本, 返回其输出的数值"""
+    return float(subprocess.run([sys.executable, "-c", script],
+                                cwd=BACKEND_DIR, check=True, capture_output=True, text=True).stdout)
+
+def measure(stmt: str, runs: int) -> Tuple[float, float]:
+    """返回执行`stmt`的耗时(秒, 取`runs`次运行的中位数)及内存占用(字节)"""
+    elapsed = statistics.median(run(TIMER.format(stmt=stmt)) for _ in range(runs))
+    return elapsed, run(MEMORY.format(stmt=stmt))
+
+def format_case(case: str, loader: str) -> str:
+    return case.format(filter=loader.format(name="Filter_type"), scene=loader.format(name="Video_scene_effect_type"),
+                       each=loader.replace("{name!r}", "name"))
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    subprocess.run([sys.executable, "-m", "pyJianYingDraft.metadata"], cwd=BACKEND_DIR, check=True)
+    print(f"耗时取 {runs} 次运行的中位数")
+    for name, case in CASES.items():
+        source_time, source_memory = measure(format_case(case, SOURCE), runs)
+        catalog_time, catalog_memory = measure(format_case(case, CATALOG), runs)
+        print(f"{name:<8}: 源模块 {source_time * 1e3:7.1f} ms {source_memory / 1024:7.0f} KB | "
+              f"目录 {catalog_time * 1e3:7.1f} ms {catalog_memory / 1024:7.0f} KB "
+              f"({source_time / catalog_time:.1f}x, 内存 {catalog_memory / source_memory:.0%})")
@@ -0,0 +1,54 @@
+"""对比元数据枚举按名称查找及搜索的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_metadata_lookup [查找次数]
+"""
+
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+from pyJianYingDraft.metadata import Video_scene_effect_type, search
+from pyJianYingDraft.metadata.effect_meta import normalize_name
+from pyJianYingDraft.metadata.effect_search import all_enum_types
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def scan_from_name(name: str) -> Any:
+    """逐个比较成员名称的查找方式"""
+    name = normalize_name(name)
+    for effect in Video_scene_effect_type:
+        if normalize_name(effect.name) == name:
+            return effect
+    raise ValueError(name)
+
+def scan_search(query: str, members: List[Any]) -> List[Any]:
+    """逐个检查全部成员的子串匹配"""
+    query = normalize_name(query)
+    return [effect for effect in members if query in normalize_name(effect.name)][:10]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    random.seed(0)
+    names = [effect.name for effect in random.choices(list(Video_scene_effect_type), k=count)]
+    queries = [name[:2] for name in names]
+    members = [effect for enum_type in all_enum_types() for effect in enum_type]
+
+    first_lookup = timed(lambda: Video_scene_effect_type.from_name(names[0]))
+    scan = timed(lambda: [scan_from_name(name) for name in names])
+    indexed = timed(lambda: [Video_scene_effect_type.from_name(name) for name in names])
+    print(f"from_name, {len(list(Video_scene_effect_type))} 个成员, {count} 次查找 (首次查找含建立索引 {first_lookup * 1e3:.1f} ms)")
+    print(f"  逐个比较: {scan / count * 1e6:8.2f} us/次")
+    print(f"  索引查找: {indexed / count * 1e6:8.2f} us/次  ({scan / indexed:.0f}x)")
+
+    first_search = timed(lambda: search(queries[0]))
+    scan = timed(lambda: [scan_search(query, members) for query in queries[:count // 10]]) / (count // 10)
+    indexed = timed(lambda: [search(query) for query in queries]) / count
+    print(f"search, 全部 {len(members)} 个成员, 以名称前两个字符查询 (首次搜索含建立索引 {first_search * 1e3:.1f} ms)")
+    print(f"  逐个扫描: {scan * 1e6:8.2f} us/次")
+    print(f"  索引搜索: {indexed * 1e6:8.2f} us/次  ({scan / indexed:.0f}x)")
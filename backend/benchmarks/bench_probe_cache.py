@@ -0,0 +1,69 @@
+"""对比不使用缓存、首次写入缓存及命中缓存时构造素材的耗时
+
+运行方式(在backend目录下): python -m benchmarks.bench_probe_cache [素材目录]
+不指定素材目录时在临时目录中生成一批WAV音频及PNG图片; 指定时使用目录下的全部文件, 非音频文件作为视频素材加载.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+import zlib
+from typing import List, Optional
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Video_material, Audio_material, Probe_cache
+
+AUDIO_POSTFIXES = (".wav", ".mp3", ".aac", ".m4a", ".flac")
+
+def write_png(path: str, width: int, height: int) -> None:
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    rows = b"".join(b"\x00" + bytes(width * 3) for _ in range(height))
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                   + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+def generate(directory: str, count: int) -> List[str]:
+    paths = []
+    for i in range(count):
+        wav_path = os.path.join(directory, "clip%d.wav" % i)
+        with wave.open(wav_path, "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(8000)
+            file.writeframes(bytes(2 * 8000 * (i % 5 + 1)))
+        png_path = os.path.join(directory, "image%d.png" % i)
+        write_png(png_path, 64 + i, 32 + i)
+        paths += [wav_path, png_path]
+    return paths
+
+def load_all(paths: List[str]) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        if path.lower().endswith(AUDIO_POSTFIXES):
+            Audio_material(path)
+        else:
+            Video_material(path)
+    return time.perf_counter() - start
+
+def bench(paths: List[str], cache_path: str) -> None:
+    print(f"{len(paths)} 个素材文件")
+    baseline: Optional[float] = None
+    for name, cache in [("不使用缓存", None), ("首次写入缓存", Probe_cache(cache_path)), ("命中缓存", Probe_cache(cache_path))]:
+        draft.set_probe_cache(cache)
+        elapsed = load_all(paths)
+        baseline = baseline or elapsed
+        print(f"{name:<8}: {elapsed * 1e3:9.1f} ms, {elapsed / len(paths) * 1e3:7.3f} ms/个  ({baseline / elapsed:.1f}x)")
+    draft.set_probe_cache(None)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1:
+            media_paths = sorted(os.path.join(sys.argv[1], name) for name in os.listdir(sys.argv[1]))
+        else:
+            media_paths = generate(temp_dir, 100)
+        bench(media_paths, os.path.join(temp_dir, "probe_cache.sqlite3"))
@@ -0,0 +1,44 @@
+"""测试`batch.render_many`随工作进程数量的扩展性
+
+运行方式(在backend目录下): python -m benchmarks.bench_render_many [草稿数量]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Mapping
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Audio_material, Track_type
+from pyJianYingDraft.batch import render_many
+
+from .bench_compile_template import make_template, write_wav
+
+
+def apply(script: draft.Script_file, row: Mapping[str, Any]) -> None:
+    script.replace_text(script.get_imported_track(Track_type.text, index=0), 0, row["title"])
+    script.replace_material_by_name("bgm.wav", Audio_material(row["bgm"]))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as folder:
+        template_folder = os.path.join(folder, "template")
+        os.makedirs(template_folder)
+        shutil.move(make_template(folder), os.path.join(template_folder, "draft_content.json"))
+        new_bgm_path = os.path.join(folder, "new_bgm.wav")
+        write_wav(new_bgm_path, 20)
+        drafts = draft.Draft_folder(folder)
+
+        rows = [{"draft_name": "draft_%d" % i, "title": "标题%d" % i, "bgm": new_bgm_path} for i in range(count)]
+        worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            results = render_many(drafts, "template", rows, apply, workers=workers, allow_replace=True)
+            elapsed = time.perf_counter() - start
+            assert all(result.success for result in results)
+            baseline = baseline or elapsed
+            print(f"{workers:>3} 个进程: {count / elapsed:8.1f} 草稿/秒  ({baseline / elapsed:.2f}x)")
@@ -0,0 +1,32 @@
+"""对比`Script_file`构造速度: 每次解析模板文件(旧实现) vs 进程内缓存模板
+
+运行方式(在backend目录下): python -m benchmarks.bench_script_init
+"""
+
+import json
+import os
+import timeit
+from unittest import mock
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import script_file
+
+NUMBER = 20000
+
+
+def parse_template_file():
+    """旧实现: 每次构造都打开并解析模板文件"""
+    with open(os.path.join(os.path.dirname(script_file.__file__), draft.Script_file.TEMPLATE_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def construct() -> None:
+    draft.Script_file(1920, 1080)
+
+
+if __name__ == "__main__":
+    with mock.patch.object(script_file, "_builtin_template", parse_template_file):
+        before = timeit.timeit(construct, number=NUMBER)
+    after = timeit.timeit(construct, number=NUMBER)
+
+    print(f"每次解析模板: {NUMBER / before:10.0f} 次/秒")
+    print(f"缓存模板    : {NUMBER / after:10.0f} 次/秒  ({before / after:.1f}x)")
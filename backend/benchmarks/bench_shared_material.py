@@ -0,0 +1,75 @@
+"""测量从同一素材截取大量片段时的耗时及内存占用, 并与每个片段各自深复制一份素材的旧做法对比
+
+运行方式(在backend目录下): python -m benchmarks.bench_shared_material [片段数量, ...]
+默认依次测试1000及5000个片段, 素材为临时生成的一张图片及一段60s的WAV音频.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from typing import Callable, List, Tuple, TypeVar
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import Video_material, Audio_material, Video_segment, Audio_segment, Track_type, Timerange
+
+from .bench_probe_cache import write_png
+
+_Material = TypeVar("_Material", Video_material, Audio_material)
+
+def deep_copied(material: _Material) -> _Material:
+    """旧做法: 片段构造时`deepcopy(material)`得到的副本"""
+    new = object.__new__(type(material))
+    new.__dict__.update(copy.deepcopy(material.__dict__))
+    return new
+
+def shared(material: _Material) -> _Material:
+    return material
+
+def build(video: Video_material, audio: Audio_material, count: int,
+          share: Callable[[_Material], _Material]) -> Tuple[draft.Script_file, List[object]]:
+    script = draft.Script_file(1920, 1080).add_track(Track_type.video).add_track(Track_type.audio)
+    segments: List[object] = []
+    for i in range(count):
+        target = Timerange(i * 10000, 10000)
+        segments.append(Video_segment(share(video), target, source_timerange=Timerange(i * 10000, 10000)))
+        segments.append(Audio_segment(share(audio), target, source_timerange=Timerange(i * 10000, 10000)))
+    script.add_segments(segments[0::2]).add_segments(segments[1::2])
+    return script, segments
+
+def bench(video: Video_material, audio: Audio_material, count: int) -> None:
+    results = {}
+    for name, share in [("各自复制", deep_copied), ("共享素材", shared)]:
+        start = time.perf_counter()
+        build(video, audio, count, share)[0].dumps()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        kept = build(video, audio, count, share)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        results[name] = (elapsed, memory)
+
+    (old_time, old_memory), (new_time, new_memory) = results.values()
+    print(f"{count:>6} x 2 个片段: 各自复制 {old_time * 1e3:8.1f} ms {old_memory / 2 ** 20:6.1f} MB | "
+          f"共享素材 {new_time * 1e3:8.1f} ms {new_memory / 2 ** 20:6.1f} MB "
+          f"({old_time / new_time:.1f}x, 内存 {new_memory / old_memory:.0%})")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 5000]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path, audio_path = os.path.join(temp_dir, "source.png"), os.path.join(temp_dir, "source.wav")
+        write_png(image_path, 1920, 1080)
+        with wave.open(audio_path, "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(1)
+            file.setframerate(8000)
+            file.writeframes(bytes(8000 * 60))
+        video_material, audio_material = Video_material(image_path), Audio_material(audio_path)
+        for n in counts:
+            bench(video_material, audio_material, n)
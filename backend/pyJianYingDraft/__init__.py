@@ -1,16 +1,13 @@
+import importlib
+from typing import Any, Dict, List, TYPE_CHECKING
+
 from .audio_segment import Audio_segment
 from .draft_folder import Draft_folder
 from .effect_segment import Effect_segment, Filter_segment
-from .jianying_controller import Jianying_controller, Export_resolution, Export_framerate
+from .id_factory import Id_factory, set_id_factory, use_id_factory
 from .keyframe import Keyframe_property
-from .local_materials import Crop_settings, Video_material, Audio_material
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .metadata import Font_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Mask_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-from .metadata import Transition_type, Filter_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
+from .local_materials import Crop_settings, Local_material, Video_material, Audio_material
+from .metadata.catalog import ENUM_MODULES
 from .script_file import Script_file
 from .template_mode import Shrink_mode, Extend_mode
 from .text_segment import Text_segment, Text_style, Text_border, Text_background
@@ -19,6 +16,47 @@ from .time_util import Timerange
 from .track import Track_type
 from .video_segment import Video_segment, Sticker_segment, Clip_settings
 
+if TYPE_CHECKING:
+    from .compiled_template import Text_slot, Material_slot, Compiled_template
+    from .draft_reader import Draft_reader
+    from .local_materials import load_materials
+    from .probe_cache import Probe_cache, set_probe_cache
+    from .jianying_controller import Jianying_controller, Export_resolution, Export_framerate
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .metadata import Font_type, Mask_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import Transition_type, Filter_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
+
+# 以下名称在首次访问时才导入: 元数据枚举类按需从元数据目录加载, `jianying_controller`依赖仅在Windows上可用的`uiautomation`,
+# 其余为只在特定场景下使用的功能
+_lazy_names: Dict[str, str] = {
+    "Text_slot": "compiled_template",
+    "Material_slot": "compiled_template",
+    "Compiled_template": "compiled_template",
+    "Draft_reader": "draft_reader",
+    "load_materials": "local_materials",
+    "Probe_cache": "probe_cache",
+    "set_probe_cache": "probe_cache",
+    "Jianying_controller": "jianying_controller",
+    "Export_resolution": "jianying_controller",
+    "Export_framerate": "jianying_controller",
+    **dict.fromkeys(ENUM_MODULES, "metadata"),
+}
+"""延迟导入的名称到其所在子模块的映射"""
+
+def __getattr__(name: str) -> Any:
+    module_name = _lazy_names.get(name)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    globals()[name] = value  # 缓存, 此后不再经过`__getattr__`
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_lazy_names))
+
 __all__ = [
     "Font_type",
     "Mask_type",
@@ -36,8 +74,10 @@ __all__ = [
     "Video_scene_effect_type",
     "Video_character_effect_type",
     "Crop_settings",
+    "Local_material",
     "Video_material",
     "Audio_material",
+    "load_materials",
     "Keyframe_property",
     "Timerange",
     "Audio_segment",
@@ -54,7 +94,16 @@ __all__ = [
     "Shrink_mode",
     "Extend_mode",
     "Script_file",
+    "Text_slot",
+    "Material_slot",
+    "Compiled_template",
     "Draft_folder",
+    "Draft_reader",
+    "Id_factory",
+    "set_id_factory",
+    "use_id_factory",
+    "Probe_cache",
+    "set_probe_cache",
     "Jianying_controller",
     "Export_resolution",
     "Export_framerate",
@@ -1,14 +1,18 @@
 """定义视频/文本动画相关类"""
 
-import uuid
-from typing import Literal, Dict, List, Any
+from typing import Literal, Dict, List, Tuple, Any, TYPE_CHECKING
 from typing import Union, Optional
 
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-from .metadata.animation_meta import Animation_meta
+from .export_cache import Export_cached
+from .id_factory import new_id
 from .time_util import Timerange
 
+if TYPE_CHECKING:
+    # 元数据模块较大, 仅在需要时才导入
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata.animation_meta import Animation_meta
+
 
 class Animation:
     """一个视频/文本动画效果"""
@@ -30,7 +34,7 @@ class Animation:
     is_video_animation: bool
     """是否为视频动画, 在子类中定义"""
 
-    def __init__(self, animation_meta: Animation_meta, start: int, duration: int):
+    def __init__(self, animation_meta: "Animation_meta", start: int, duration: int):
         self.name = animation_meta.title
         self.effect_id = animation_meta.effect_id
         self.resource_id = animation_meta.resource_id
@@ -38,6 +42,10 @@ class Animation:
         self.start = start
         self.duration = duration
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.name, self.effect_id, self.animation_type, self.resource_id,
+                self.start, self.duration, self.is_video_animation)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "anim_adjust_params": None,
@@ -60,8 +68,9 @@ class Video_animation(Animation):
 
     animation_type: Literal["in", "out", "group"]
 
-    def __init__(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type],
+    def __init__(self, animation_type: Union["Intro_type", "Outro_type", "Group_animation_type"],
                  start: int, duration: int):
+        from .metadata import Intro_type, Outro_type, Group_animation_type
         super().__init__(animation_type.value, start, duration)
 
         if isinstance(animation_type, Intro_type):
@@ -78,8 +87,9 @@ class Text_animation(Animation):
 
     animation_type: Literal["in", "out", "loop"]
 
-    def __init__(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
+    def __init__(self, animation_type: Union["Text_intro", "Text_outro", "Text_loop_anim"],
                  start: int, duration: int):
+        from .metadata import Text_intro, Text_outro, Text_loop_anim
         super().__init__(animation_type.value, start, duration)
 
         if isinstance(animation_type, Text_intro):
@@ -91,7 +101,7 @@ class Text_animation(Animation):
 
         self.is_video_animation = False
 
-class Segment_animations:
+class Segment_animations(Export_cached):
     """附加于某素材上的一系列动画
 
     对视频片段：入场、出场或组合动画；对文本片段：入场、出场或循环动画"""
@@ -103,7 +113,7 @@ class Segment_animations:
     """动画列表"""
 
     def __init__(self):
-        self.animation_id = uuid.uuid4().hex
+        self.animation_id = new_id()
         self.animations = []
 
     def get_animation_trange(self, animation_type: Literal["in", "out", "group", "loop"]) -> Optional[Timerange]:
@@ -130,6 +140,9 @@ class Segment_animations:
 
         self.animations.append(animation)
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.animation_id, tuple(animation.export_state() for animation in self.animations))
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "id": self.animation_id,
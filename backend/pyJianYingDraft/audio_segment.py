@@ -3,20 +3,24 @@
 包含淡入淡出效果、音频特效等相关类
 """
 
-import uuid
-from copy import deepcopy
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Any, Iterable, TYPE_CHECKING
 from typing import Optional, Literal, Union
 
-from .keyframe import Keyframe_property, Keyframe_list
+from .curve_sampler import Curve, DEFAULT_INTERVAL, sample_curve, simplify_keyframes
+from .export_cache import Export_cached
+from .id_factory import new_id
+from .keyframe import Keyframe_property
 from .local_materials import Audio_material
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
 from .metadata import Effect_param_instance
 from .segment import Media_segment
 from .time_util import tim, Timerange
 
+if TYPE_CHECKING:
+    # 元数据模块较大, 仅在需要时才导入
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
 
-class Audio_fade:
+
+class Audio_fade(Export_cached):
     """音频淡入淡出效果"""
 
     fade_id: str
@@ -30,10 +34,13 @@ class Audio_fade:
     def __init__(self, in_duration: int, out_duration: int):
         """根据给定的淡入/淡出时长构造一个淡入淡出效果"""
 
-        self.fade_id = uuid.uuid4().hex
+        self.fade_id = new_id()
         self.in_duration = in_duration
         self.out_duration = out_duration
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.fade_id, self.in_duration, self.out_duration)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "id": self.fade_id,
@@ -43,7 +50,7 @@ class Audio_fade:
             "type": "audio_fade"
         }
 
-class Audio_effect:
+class Audio_effect(Export_cached):
     """音频特效对象"""
 
     name: str
@@ -58,12 +65,13 @@ class Audio_effect:
 
     audio_adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type],
+    def __init__(self, effect_meta: Union["Audio_scene_effect_type", "Tone_effect_type", "Speech_to_song_type"],
                  params: Optional[List[Optional[float]]] = None):
         """根据给定的音效元数据及参数列表构造一个音频特效对象, params的范围是0~100"""
+        from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
 
         self.name = effect_meta.value.name
-        self.effect_id = uuid.uuid4().hex
+        self.effect_id = new_id()
         self.resource_id = effect_meta.value.resource_id
         self.audio_adjust_params = []
 
@@ -81,6 +89,10 @@ class Audio_effect:
 
         self.audio_adjust_params = effect_meta.value.parse_params(params)
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.name, self.effect_id, self.resource_id, self.category_id, self.category_name,
+                tuple(param.export_state() for param in self.audio_adjust_params))
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "audio_adjust_params": [param.export_json() for param in self.audio_adjust_params],
@@ -101,8 +113,10 @@ class Audio_effect:
 class Audio_segment(Media_segment):
     """安放在轨道上的一个音频片段"""
 
+    __slots__ = ("material_instance", "fade", "effects")
+
     material_instance: Audio_material
-    """音频素材实例"""
+    """音频素材实例, 素材不可修改, 可能与其他片段共享"""
 
     fade: Optional[Audio_fade]
     """音频淡入淡出效果, 可能为空
@@ -143,11 +157,11 @@ class Audio_segment(Media_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material  # 素材不可修改, 直接共享而无须复制
         self.fade = None
         self.effects = []
 
-    def add_effect(self, effect_type: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type],
+    def add_effect(self, effect_type: Union["Audio_scene_effect_type", "Tone_effect_type", "Speech_to_song_type"],
                    params: Optional[List[Optional[float]]] = None) -> "Audio_segment":
         """为音频片段添加一个作用于整个片段的音频效果, 目前“声音成曲”效果不能自动被剪映所识别
 
@@ -198,16 +212,39 @@ class Audio_segment(Media_segment):
             time_offset (`int`): 关键帧的时间偏移量, 单位为微秒
             volume (`float`): 音量在`time_offset`处的值
         """
-        _property = Keyframe_property.volume
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, volume)
-                return self
-        kf_list = Keyframe_list(_property)
-        kf_list.add_keyframe(time_offset, volume)
-        self.common_keyframes.append(kf_list)
+        self._keyframe_list(Keyframe_property.volume).add_keyframe(time_offset, volume)
+        return self
+
+    def add_keyframes(self, times: Iterable[int], volumes: Iterable[float]) -> "Audio_segment":
+        """批量创建*控制音量*的关键帧, 效果与对每组值调用`add_keyframe`相同, 但适用于成千上万个关键帧
+
+        Args:
+            times (`Iterable[int]`): 各关键帧的时间偏移量, 单位为微秒, 可以是`array`或NumPy数组, 无需有序
+            volumes (`Iterable[float]`): 各时间偏移量处的音量, 与`times`一一对应
+
+        Raises:
+            `ValueError`: `times`与`volumes`的长度不一致
+        """
+        self._keyframe_list(Keyframe_property.volume).add_keyframes(times, volumes)
         return self
 
+    def add_volume_curve(self, curve: Curve, *, tolerance: float = 1e-3, interval: int = DEFAULT_INTERVAL) -> "Audio_segment":
+        """在整个片段时长内对音量包络采样, 精简后作为*控制音量*的关键帧加入
+
+        生成的关键帧间线性插值的结果在每个采样点处与包络的偏差不超过`tolerance`, 详见`curve_sampler`模块
+
+        Args:
+            curve (`Callable[[int], float]` or `Sequence[float]`): 以相对片段开头的时间偏移量(微秒)为自变量的函数,
+                或在片段时长内均匀分布的一组音量值
+            tolerance (`float`, optional): 允许的最大音量偏差, 默认为0.001
+            interval (`int`, optional): 对函数采样的间隔, 单位为微秒, 默认为30fps下的一帧
+
+        Raises:
+            `ValueError`: 参数不合法
+        """
+        times, volumes = simplify_keyframes(*sample_curve(curve, self.duration, interval=interval), tolerance)
+        return self.add_keyframes(times, volumes)
+
     def export_json(self) -> Dict[str, Any]:
         json_dict = super().export_json()
         json_dict.update({
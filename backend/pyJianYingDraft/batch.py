@@ -0,0 +1,158 @@
+"""以同一模板批量生成草稿
+
+模板只在主进程中解析一次, 工作进程通过fork继承解析结果(写时复制), 每行参数在工作进程中
+从解析结果创建一份草稿对象, 经用户提供的函数修改后写入草稿文件夹
+"""
+
+import multiprocessing
+import os
+import shutil
+import traceback
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from . import json_backend
+from .draft_folder import Draft_folder
+from .script_file import Script_file
+
+
+Row = Mapping[str, Any]
+Apply_function = Callable[[Script_file, Row], Any]
+"""修改草稿的函数, 接收从模板创建的草稿对象以及一行参数"""
+
+class Render_result:
+    """单行参数的生成结果"""
+
+    index: int
+    """参数行的下标, 从0开始"""
+    draft_name: Optional[str]
+    """生成的草稿名称, 未能取得名称时为None"""
+    success: bool
+    """是否成功生成"""
+    error: Optional[str]
+    """失败时的错误信息(含调用栈), 成功时为None"""
+
+    def __init__(self, index: int, draft_name: Optional[str], error: Optional[str] = None):
+        self.index = index
+        self.draft_name = draft_name
+        self.success = error is None
+        self.error = error
+
+    def __repr__(self) -> str:
+        if self.success:
+            return "Render_result(%d, %r, success)" % (self.index, self.draft_name)
+        return "Render_result(%d, %r, failed: %s)" % (self.index, self.draft_name, self.error.splitlines()[-1])  # type: ignore
+
+class _Job:
+    """工作进程所需的全部状态, 在fork时被继承, 否则通过进程初始化函数传递并在各进程中重新解析模板"""
+
+    def __init__(self, folder_path: str, template_name: str, apply: Apply_function, name_key: str,
+                 allow_replace: bool, compact: bool, content: Optional[Dict[str, Any]] = None):
+        self.folder_path = folder_path
+        self.template_name = template_name
+        self.apply = apply
+        self.name_key = name_key
+        self.allow_replace = allow_replace
+        self.compact = compact
+        self.content = content
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 不经fork传递时由子进程自行解析模板
+        state = dict(self.__dict__)
+        state["content"] = None
+        return state
+
+    @property
+    def template_path(self) -> str:
+        return os.path.join(self.folder_path, self.template_name)
+
+    def load(self) -> None:
+        """解析模板草稿的内容"""
+        if self.content is None:
+            with open(os.path.join(self.template_path, "draft_content.json"), "r", encoding="utf-8") as f:
+                self.content = json_backend.load(f)
+
+    def run(self, index: int, row: Row) -> Render_result:
+        assert self.content is not None
+        draft_name: Optional[str] = None
+        try:
+            draft_name = row[self.name_key]
+            draft_path = os.path.join(self.folder_path, draft_name)  # type: ignore
+            if os.path.exists(draft_path) and not self.allow_replace:
+                raise FileExistsError(f"新草稿 {draft_name} 已存在且不允许覆盖")
+
+            json_path = os.path.join(draft_path, "draft_content.json")
+            script = Script_file.from_content(self.content, json_path)
+            self.apply(script, row)
+
+            # 复制草稿文件夹中的其他文件, 再写出修改后的草稿内容
+            shutil.copytree(self.template_path, draft_path, dirs_exist_ok=self.allow_replace,
+                            ignore=shutil.ignore_patterns("draft_content.json"))
+            script.save(compact=self.compact, atomic=True)
+        except Exception:
+            return Render_result(index, draft_name, traceback.format_exc())
+        return Render_result(index, draft_name)
+
+_job: Optional[_Job] = None
+"""当前进程中的任务状态"""
+
+def _init_worker(job: _Job) -> None:
+    global _job
+    if _job is None:
+        job.load()
+        _job = job
+
+def _run_row(item: Tuple[int, Row]) -> Render_result:
+    assert _job is not None
+    return _job.run(*item)
+
+def render_many(folder: Draft_folder, template_name: str, rows: Iterable[Row], apply: Apply_function, *,
+                workers: Optional[int] = None, name_key: str = "draft_name", allow_replace: bool = False,
+                compact: bool = False, chunksize: int = 4) -> List[Render_result]:
+    """以`folder`中的草稿为模板, 为每行参数生成一份草稿, 并行执行
+
+    每行参数对应的草稿名称由`row[name_key]`给出, 生成过程相当于依次调用`duplicate_as_template`、`apply`及`save`.
+    单行的失败不影响其它行, 其错误信息记录在返回结果中.
+
+    在支持fork的平台上, 工作进程直接继承主进程中解析好的模板, `apply`及各行参数也无需可序列化;
+    否则各工作进程各自解析一次模板, 此时`apply`须为模块级函数.
+
+    Args:
+        folder (`Draft_folder`): 草稿文件夹, 模板及生成的草稿均位于其中
+        template_name (`str`): 模板草稿名称
+        rows (`Iterable[Mapping[str, Any]]`): 各行参数
+        apply (`Callable[[Script_file, Mapping[str, Any]], Any]`): 根据一行参数修改草稿的函数, 返回值被忽略
+        workers (`int`, optional): 工作进程数量, 默认为CPU核数. 为1时在当前进程中顺序执行
+        name_key (`str`, optional): 参数行中草稿名称的键, 默认为`"draft_name"`
+        allow_replace (`bool`, optional): 是否允许覆盖重名的草稿, 默认为否
+        compact (`bool`, optional): 是否以紧凑格式写出草稿, 默认为否
+        chunksize (`int`, optional): 每次分派给工作进程的行数, 默认为4
+
+    Returns:
+        `List[Render_result]`: 与参数行一一对应的生成结果
+
+    Raises:
+        `FileNotFoundError`: 模板草稿不存在
+    """
+    template_path = os.path.join(folder.folder_path, template_name)
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"模板草稿 {template_name} 不存在")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    job = _Job(folder.folder_path, template_name, apply, name_key, allow_replace, compact)
+    job.load()
+    if workers <= 1:
+        return [job.run(index, row) for index, row in enumerate(rows)]
+
+    global _job
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _job = job  # 由子进程继承
+        try:
+            with context.Pool(workers) as pool:
+                return pool.map(_run_row, enumerate(rows), chunksize)
+        finally:
+            _job = None
+
+    with multiprocessing.get_context().Pool(workers, _init_worker, (job,)) as pool:
+        return pool.map(_run_row, enumerate(rows), chunksize)
@@ -0,0 +1,162 @@
+"""预编译的草稿模板
+
+模板被预先序列化为若干字节片段, 片段之间是具名槽位所对应的JSON值,
+渲染时只需序列化槽位的新值并与各片段拼接, 而无需重新加载、修改并导出整个草稿
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional
+
+from . import json_backend
+from .template_mode import EditableTrack
+
+
+class Text_slot:
+    """文本槽位, 填入的值与`Script_file.replace_text`的`text`参数含义相同"""
+
+    track: EditableTrack
+    """所在的文本轨道, 由`get_imported_track`获取"""
+    segment_index: int
+    """片段下标, 从0开始"""
+    recalc_style: bool
+    """是否重新计算字体样式分布"""
+
+    def __init__(self, track: EditableTrack, segment_index: int, recalc_style: bool = True):
+        """定义一个文本槽位, 参数含义与`Script_file.replace_text`一致
+
+        Args:
+            track (`Editable_track`): 文本轨道, 由`get_imported_track`获取
+            segment_index (`int`): 片段下标, 从0开始
+            recalc_style (`bool`): 是否重新计算字体样式分布, 默认开启.
+        """
+        self.track = track
+        self.segment_index = segment_index
+        self.recalc_style = recalc_style
+
+class Material_slot:
+    """素材槽位, 填入的值为`Video_material`或`Audio_material`, 效果与`Script_file.replace_material_by_name`相同"""
+
+    material_name: str
+    """要替换的素材名称"""
+    material_type: Literal["video", "audio"]
+    """素材类型"""
+    replace_crop: bool
+    """是否替换原素材的裁剪设置, 仅对视频素材有效"""
+
+    def __init__(self, material_name: str, material_type: Literal["video", "audio"] = "video", replace_crop: bool = False):
+        """定义一个素材槽位, 参数含义与`Script_file.replace_material_by_name`一致
+
+        Args:
+            material_name (`str`): 要替换的素材名称
+            material_type (`"video"` or `"audio"`, optional): 素材类型, 默认为视频
+            replace_crop (`bool`, optional): 是否替换原素材的裁剪设置, 默认为否. 仅对视频素材有效.
+        """
+        if material_type not in ("video", "audio"):
+            raise ValueError("不支持的素材类型 '%s'" % material_type)
+        self.material_name = material_name
+        self.material_type = material_type
+        self.replace_crop = replace_crop
+
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+MISSING: Any = object()
+"""表示某个占位处的字段在模板中不存在, 此时未填充的占位不输出该字段"""
+
+Slot_filler = Callable[[Any], Dict[int, Any]]
+"""将槽位的值转换为各占位处新JSON值(以占位序号为键)的函数, 未返回的占位处保持模板中的原值"""
+
+class Compiled_template:
+    """预编译的草稿模板, 由`Script_file.compile_template`生成
+
+    渲染结果与在模板上依次调用相应的替换方法后导出的内容逐字节一致
+    """
+
+    slot_names: List[str]
+    """全部槽位的名称"""
+
+    def __init__(self, text: str, sentinel_prefix: str, keys: List[str], defaults: List[Any],
+                 fillers: Dict[str, Slot_filler], compact: bool):
+        """切分序列化后的模板
+
+        Args:
+            text (`str`): 序列化后的模板, 其中第i个占位处为JSON字符串`"{sentinel_prefix}{i}@@"`
+            sentinel_prefix (`str`): 占位字符串的前缀, 不应包含需要转义的字符
+            keys (`List[str]`): 各占位处的字段名
+            defaults (`List[Any]`): 各占位处在模板中的原值, 字段原本不存在(位于所在对象末尾)时为`MISSING`
+            fillers (`Dict[str, Slot_filler]`): 各槽位的填充函数
+            compact (`bool`): 模板是否以紧凑格式序列化
+        """
+        self._compact = compact
+        self._fillers = fillers
+        self.slot_names = list(fillers.keys())
+
+        item_sep, key_sep = (",", ":") if compact else (",", ": ")
+        pieces = text.split('"' + sentinel_prefix)
+        fragments: List[str] = [pieces[0]]
+        self._positions: Dict[int, int] = {}
+        self._newlines: List[str] = []
+        for position, piece in enumerate(pieces[1:]):
+            index, rest = piece.split('@@"', 1)
+            self._positions[int(index)] = position
+            # 记录占位所在行的缩进, 以便为多行的JSON值补齐缩进
+            line = fragments[-1][fragments[-1].rfind("\n") + 1:]
+            self._newlines.append("\n" + line[:len(line) - len(line.lstrip(" "))])
+            fragments.append(rest)
+        assert len(self._positions) == len(keys) == len(defaults)
+
+        # 原本不存在的字段连同其前面的分隔符和字段名一起作为占位处的内容
+        self._prefixes: List[bytes] = [b""] * len(defaults)
+        for index, (key, value) in enumerate(zip(keys, defaults)):
+            if value is not MISSING:
+                continue
+            position = self._positions[index]
+            prefix = item_sep + ("" if compact else self._newlines[position]) + json.dumps(key, ensure_ascii=False) + key_sep
+            assert fragments[position].endswith(prefix)
+            fragments[position] = fragments[position][:-len(prefix)]
+            self._prefixes[position] = prefix.encode("utf-8")
+
+        # 片段与各占位处的默认内容交替排列, 渲染时只需替换被填充的占位
+        self._parts: List[bytes] = [fragments[0].encode("utf-8")]
+        for fragment in fragments[1:]:
+            self._parts.append(b"")
+            self._parts.append(fragment.encode("utf-8"))
+        for index, value in enumerate(defaults):
+            if value is not MISSING:
+                position = self._positions[index]
+                self._parts[2 * position + 1] = self._encode(value, position)
+
+    def _encode(self, value: Any, position: int) -> bytes:
+        if self._compact or not isinstance(value, (dict, list)):
+            # 标量的序列化结果与格式选项无关, 且紧凑格式可使用更快的C实现
+            text = _COMPACT_ENCODER.encode(value)
+        else:
+            # 字符串中的换行符总是被转义, 因此可以安全地为每一行补齐所在位置的缩进
+            text = json_backend.dumps(value, indent=4).replace("\n", self._newlines[position])
+        return self._prefixes[position] + text.encode("utf-8")
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> bytes:
+        """以给定的槽位值渲染草稿, 返回UTF-8编码的草稿文件内容
+
+        Args:
+            values (`Mapping[str, Any]`, optional): 槽位名称到值的映射, 未给出的槽位保持模板中的原值
+
+        Raises:
+            `ValueError`: 槽位名称不存在, 或值不符合要求
+            `TypeError`: 素材槽位的值类型不正确
+        """
+        parts = list(self._parts)
+        if values:
+            for name, value in values.items():
+                filler = self._fillers.get(name)
+                if filler is None:
+                    raise ValueError("模板中不存在名为 '%s' 的槽位" % name)
+                for index, json_value in filler(value).items():
+                    position = self._positions[index]
+                    parts[2 * position + 1] = self._encode(json_value, position)
+        return b"".join(parts)
+
+    def dump(self, file_path: str, values: Optional[Mapping[str, Any]] = None) -> None:
+        """以给定的槽位值渲染草稿并写入文件, 参数含义同`render`"""
+        data = self.render(values)
+        with open(file_path, "wb") as f:
+            f.write(data)
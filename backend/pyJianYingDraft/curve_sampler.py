@@ -0,0 +1,165 @@
+"""将连续的运动曲线转换为关键帧
+
+先在片段的时间范围内对曲线逐帧采样, 再以给定的误差容限精简采样点: 剪映在关键帧之间线性插值,
+因此只需保留足够的点, 使得折线在每个采样点处与曲线的偏差都不超过容限即可
+"""
+
+from array import array
+from types import ModuleType
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from .time_util import SEC
+
+Curve = Union[Callable[[Any], Any], Sequence[float]]
+"""运动曲线, 可以是以时间偏移量(微秒)为自变量的函数, 也可以是在时间范围内均匀分布的一组采样值"""
+
+DEFAULT_INTERVAL = SEC // 30
+"""默认的采样间隔, 即30fps下的一帧, 单位为微秒"""
+
+def _import_numpy() -> Optional[ModuleType]:
+    """在首次采样时才导入NumPy(导入较慢), 未安装时返回None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def sample_curve(curve: Curve, duration: int, *, interval: int = DEFAULT_INTERVAL) -> Tuple["array[int]", "array[float]"]:
+    """在`[0, duration]`范围内对曲线采样, 返回采样点的时间偏移量及值
+
+    若`curve`为函数, 则每隔`interval`微秒采样一次, 且总是包含两个端点. 安装了NumPy时会先尝试以整个时间数组调用函数
+    (适用于以NumPy运算写成的曲线), 失败时再逐点调用.
+    若`curve`为一组值, 则认为它们均匀分布在整个时间范围内(首尾分别对应两个端点), `interval`被忽略.
+
+    Args:
+        curve (`Callable[[int], float]` or `Sequence[float]`): 运动曲线
+        duration (`int`): 采样的时间范围长度, 单位为微秒
+        interval (`int`, optional): 采样间隔, 单位为微秒, 默认为30fps下的一帧
+
+    Raises:
+        `ValueError`: `duration`或`interval`不为正, 或给出的采样值少于两个
+    """
+    if duration <= 0:
+        raise ValueError("采样的时间范围长度必须为正")
+    np = _import_numpy()
+    if not callable(curve):
+        count = len(curve)
+        if count < 2:
+            raise ValueError("至少需要两个采样值")
+        times = array("q", [round(i * duration / (count - 1)) for i in range(count)])
+        if np is not None and isinstance(curve, np.ndarray):
+            return times, array("d", curve.astype("=f8").tobytes())
+        return times, array("d", curve)
+
+    if interval <= 0:
+        raise ValueError("采样间隔必须为正")
+    times = array("q", range(0, duration, interval))
+    times.append(duration)
+
+    if np is not None:
+        time_array = np.frombuffer(times, dtype=np.int64)
+        try:
+            result = np.asarray(curve(time_array), dtype=np.float64)
+        except (TypeError, ValueError):
+            result = None
+        if result is not None and result.shape in ((), time_array.shape):
+            return times, array("d", np.broadcast_to(result, time_array.shape).astype("=f8").tobytes())
+    return times, array("d", [curve(t) for t in times])
+
+_EXACT_WINDOW_LIMIT = 256
+"""贪心扫描到的窗口(以采样点计)不超过此长度时才通过动态规划求最少点数, 否则直接采用贪心的结果"""
+
+def _simplify_greedy(times: Sequence[int], values: Sequence[float], tolerance: float) -> Tuple[List[int], int]:
+    """从每个保留点出发, 选择可以一步到达的最远点作为下一个保留点, 返回保留点的下标及扫描过的最长窗口"""
+    count = len(times)
+    kept = [0]
+    longest = 0
+    anchor = 0
+    while anchor < count - 1:
+        anchor_time, anchor_value = times[anchor], values[anchor]
+        low, high = float("-inf"), float("inf")
+        best = k = anchor + 1
+        for k in range(anchor + 1, count):
+            dt = times[k] - anchor_time
+            if dt <= 0:
+                break  # 时间相同的点无法被跨越
+            offset = values[k] - anchor_value
+            if low <= offset / dt <= high:
+                best = k
+            # 收紧允许的斜率区间, 使经过点k时的偏差不超过容限
+            low = max(low, (offset - tolerance) / dt)
+            high = min(high, (offset + tolerance) / dt)
+            if low > high:
+                break
+        longest = max(longest, k - anchor)
+        kept.append(best)
+        anchor = best
+    return kept, longest
+
+def _simplify_exact(times: Sequence[int], values: Sequence[float], tolerance: float, budget: int) -> Optional[List[int]]:
+    """由后向前动态规划, 求出保留点数最少时各保留点的下标; 扫描的点数总计超过`budget`时放弃并返回None"""
+    count = len(times)
+    # cost[i]为从点i到终点最少还需保留的点数, following[i]为取得该值时的下一个保留点, 同样点数时取最远的点
+    cost = [0] * count
+    following = [count - 1] * count
+    for anchor in range(count - 2, -1, -1):
+        anchor_time, anchor_value = times[anchor], values[anchor]
+        low, high = float("-inf"), float("inf")
+        best = k = anchor + 1
+        best_cost = cost[best]
+        for k in range(anchor + 1, count):
+            dt = times[k] - anchor_time
+            if dt <= 0:
+                break
+            offset = values[k] - anchor_value
+            if cost[k] <= best_cost and low <= offset / dt <= high:
+                best, best_cost = k, cost[k]
+            bound = (offset - tolerance) / dt
+            if bound > low:
+                low = bound
+            bound = (offset + tolerance) / dt
+            if bound < high:
+                high = bound
+            if low > high:
+                break
+        budget -= k - anchor
+        if budget < 0:
+            return None
+        cost[anchor] = best_cost + 1
+        following[anchor] = best
+
+    kept = [0]
+    while kept[-1] != count - 1:
+        kept.append(following[kept[-1]])
+    return kept
+
+def simplify_keyframes(times: Sequence[int], values: Sequence[float], tolerance: float) -> Tuple["array[int]", "array[float]"]:
+    """以给定误差容限精简按时间排序的采样点, 返回保留下来的点
+
+    保留的点构成的折线在每个原采样点处与其值的偏差都不超过`tolerance`, 首尾两点总是被保留.
+    从某点出发可以一步到达的点构成一个窗口: 中间各点所允许的斜率区间的交集随终点后移而单调收缩, 收缩为空时窗口结束.
+    先以贪心策略(每步选择可一步到达的最远点)求出一组解, 若各窗口都较短, 再在各窗口内由后向前动态规划求出点数最少的解,
+    耗时为O(n·w), w为窗口的平均长度.
+    曲线中存在很长的近似线性区段时, 动态规划的耗时会退化为平方级, 此时直接返回贪心的结果, 其点数可能略多于最少值.
+
+    Args:
+        times (`Sequence[int]`): 采样点的时间偏移量, 须按升序排列
+        values (`Sequence[float]`): 采样点的值
+        tolerance (`float`): 允许的最大偏差, 须非负
+
+    Raises:
+        `ValueError`: `times`与`values`长度不一致, 或`tolerance`为负
+    """
+    count = len(times)
+    if count != len(values):
+        raise ValueError("时间偏移量与值的数量不一致 (%d != %d)" % (count, len(values)))
+    if tolerance < 0:
+        raise ValueError("误差容限不能为负")
+    if count <= 2:
+        return array("q", times), array("d", values)
+
+    kept, longest = _simplify_greedy(times, values, tolerance)
+    if len(kept) > 2 and longest <= _EXACT_WINDOW_LIMIT:
+        # 其余起点的窗口未必与贪心扫描到的一样短, 因此限制动态规划的总工作量
+        kept = _simplify_exact(times, values, tolerance, 2 * longest * count) or kept
+    return array("q", [times[i] for i in kept]), array("d", [values[i] for i in kept])
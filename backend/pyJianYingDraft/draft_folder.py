@@ -2,9 +2,12 @@
 
 import os
 import shutil
-from typing import List
+from typing import List, TYPE_CHECKING
 
-from .script_file import Script_file
+from .script_file import Script_file, print_material_info
+
+if TYPE_CHECKING:
+    from .draft_reader import Draft_reader
 
 
 class Draft_folder:
@@ -62,8 +65,28 @@ class Draft_folder:
         if not os.path.exists(draft_path):
             raise FileNotFoundError(f"草稿文件夹 {draft_name} 不存在")
 
-        script_file = self.load_template(draft_name)
-        script_file.inspect_material()
+        # 只逐个解析所需的素材类别, 而不加载整个草稿
+        with self.open_reader(draft_name) as reader:
+            print_material_info(reader.iter_materials("stickers"), reader.iter_materials("effects"))
+
+    def open_reader(self, draft_name: str) -> "Draft_reader":
+        """以增量读取的方式打开指定名称的草稿, 适用于只需检查部分内容的大型草稿
+
+        Args:
+            draft_name (`str`): 草稿名称, 即相应文件夹名称
+
+        Returns:
+            `Draft_reader`: 草稿文件的增量读取器, 使用完毕后应调用其`close`方法或将其作为上下文管理器使用
+
+        Raises:
+            `FileNotFoundError`: 对应的草稿不存在
+        """
+        draft_path = os.path.join(self.folder_path, draft_name)
+        if not os.path.exists(draft_path):
+            raise FileNotFoundError(f"草稿文件夹 {draft_name} 不存在")
+
+        from .draft_reader import Draft_reader
+        return Draft_reader(os.path.join(draft_path, "draft_content.json"))
 
     def load_template(self, draft_name: str) -> Script_file:
         """在文件夹中打开一个草稿作为模板, 并在其上进行编辑
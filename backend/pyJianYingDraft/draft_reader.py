@@ -0,0 +1,230 @@
+"""草稿文件的增量读取器
+
+通过内存映射扫描`draft_content.json`的结构, 记录各顶层字段、各类素材及各轨道在文件中的位置,
+只在需要时解析相应的部分, 从而以有限的内存检查非常大的草稿文件
+"""
+
+import itertools
+import json
+import mmap
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from . import json_backend
+
+_Span = Tuple[int, int]
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+_SCALAR = re.compile(rb"[^,:\]}\s]+")
+
+def _repeat_atomic(item: bytes, names: Iterator[int]) -> bytes:
+    """将`item`重复零次或多次且匹配后不回溯, 避免正则引擎为长匹配保存大量回溯状态
+
+    Python 3.11起直接使用占有量词, 更早的版本以"先行断言+反向引用"的等价写法模拟
+    """
+    if sys.version_info >= (3, 11):
+        return b"(?:" + item + b")*+"
+    name = b"_r%d" % next(names)
+    return b"(?=(?P<" + name + b">(?:" + item + b")*))(?P=" + name + b")"
+
+def _next_bracket_pattern(nesting: int) -> bytes:
+    """匹配到下一个"未配对"括号为止的正则表达式
+
+    字符串以及嵌套不超过`nesting`层的完整对象/数组会被整体跳过, 以减少在Python中逐个处理括号的次数
+    """
+    names = itertools.count()
+    other = rb'[^"\[\]{}]'
+    skippable = _STRING_PATTERN
+    for _ in range(nesting):
+        group = (rb'[\[{]' + _repeat_atomic(other, names)
+                 + _repeat_atomic(rb'(?:' + skippable + rb')' + _repeat_atomic(other, names), names) + rb'[\]}]')
+        skippable = _STRING_PATTERN + rb'|' + group
+    return (_repeat_atomic(other, names)
+            + _repeat_atomic(rb'(?:' + skippable + rb')' + _repeat_atomic(other, names), names) + rb'[\[\]{}]')
+
+_NEXT_BRACKET = re.compile(_next_bracket_pattern(4), re.DOTALL)
+
+_OPEN = frozenset(b"[{")
+_QUOTE = ord('"')
+
+
+class Draft_reader:
+    """以内存映射方式按需读取草稿文件的各个部分, 可作为上下文管理器使用
+
+    注意: 每次读取都会重新解析相应部分, 不会缓存解析结果
+    """
+
+    json_path: str
+    """草稿文件路径"""
+
+    def __init__(self, json_path: str):
+        """打开草稿文件并扫描其顶层结构
+
+        Args:
+            json_path (`str`): 草稿文件(一般为`draft_content.json`)路径
+
+        Raises:
+            `FileNotFoundError`: 文件不存在
+            `ValueError`: 文件不是一个JSON对象
+        """
+        self.json_path = json_path
+        self._file = open(json_path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            self._file.close()
+            raise ValueError("JSON文件 '%s' 为空" % json_path)
+
+        start = 3 if self._buf[:3] == b"\xef\xbb\xbf" else 0
+        start = self._skip_ws(start)
+        if self._buf[start:start + 1] != b"{":
+            self.close()
+            raise ValueError("JSON文件 '%s' 的内容不是一个对象" % json_path)
+        try:
+            self._top_level = self._object_spans(start)
+            self._material_spans: Dict[str, _Span] = {}
+            if "materials" in self._top_level:
+                self._material_spans = self._object_spans(self._top_level["materials"][0])
+            self._track_spans: List[_Span] = []
+            if "tracks" in self._top_level:
+                self._track_spans = self._array_spans(self._top_level["tracks"][0])
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """释放内存映射并关闭文件"""
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> "Draft_reader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def keys(self) -> List[str]:
+        """草稿文件的所有顶层字段名"""
+        return list(self._top_level.keys())
+
+    def get(self, key: str) -> Any:
+        """解析并返回指定的顶层字段
+
+        Raises:
+            `KeyError`: 字段不存在
+        """
+        return self._load(self._top_level[key])
+
+    @property
+    def duration(self) -> int:
+        """草稿总时长, 单位为微秒"""
+        return int(self.get("duration"))
+
+    def material_types(self) -> List[str]:
+        """`materials`中所有素材类别的名称"""
+        return list(self._material_spans.keys())
+
+    def iter_materials(self, material_type: str) -> Iterator[Dict[str, Any]]:
+        """逐个解析并返回指定类别的素材, 类别不存在时不返回任何内容"""
+        if material_type not in self._material_spans:
+            return
+        for span in self._array_spans(self._material_spans[material_type][0]):
+            yield self._load(span)
+
+    def __len__(self) -> int:
+        """轨道数量"""
+        return len(self._track_spans)
+
+    def get_track(self, index: int) -> Dict[str, Any]:
+        """解析并返回指定下标的轨道(含其全部片段)"""
+        return self._load(self._track_spans[index])
+
+    def iter_tracks(self) -> Iterator[Dict[str, Any]]:
+        """逐个解析并返回轨道"""
+        for span in self._track_spans:
+            yield self._load(span)
+
+    def list_tracks(self) -> List[Dict[str, Any]]:
+        """列出各轨道的概要信息(类型、名称、id及片段数量), 不解析其中的片段"""
+        ret: List[Dict[str, Any]] = []
+        for start, _ in self._track_spans:
+            fields = self._object_spans(start)
+            info: Dict[str, Any] = {key: self._load(fields[key]) for key in ("type", "name", "id") if key in fields}
+            info["segment_count"] = len(self._array_spans(fields["segments"][0])) if "segments" in fields else 0
+            ret.append(info)
+        return ret
+
+    # 以下为结构扫描的实现
+
+    def _load(self, span: _Span) -> Any:
+        return json_backend.loads(self._buf[span[0]:span[1]])
+
+    def _skip_ws(self, pos: int) -> int:
+        return _WHITESPACE.match(self._buf, pos).end()  # type: ignore
+
+    def _value_end(self, pos: int) -> int:
+        """返回从`pos`开始的JSON值的结束位置"""
+        first = self._buf[pos]
+        if first == _QUOTE:
+            return self._match(_STRING, pos)
+        if first not in _OPEN:
+            return self._match(_SCALAR, pos)
+
+        # 从开括号之后开始匹配, 避免整个值被当作一个完整的组跳过
+        depth = 1
+        for m in _NEXT_BRACKET.finditer(self._buf, pos + 1):
+            end = m.end()
+            depth += 1 if self._buf[end - 1] in _OPEN else -1
+            if depth == 0:
+                return end
+        raise ValueError("JSON文件 '%s' 在位置 %d 处的值没有结束" % (self.json_path, pos))
+
+    def _match(self, pattern: "re.Pattern[bytes]", pos: int) -> int:
+        m = pattern.match(self._buf, pos)
+        if m is None:
+            raise ValueError("JSON文件 '%s' 在位置 %d 处格式错误" % (self.json_path, pos))
+        return m.end()
+
+    def _expect(self, pos: int, chars: bytes) -> int:
+        pos = self._skip_ws(pos)
+        char = self._buf[pos:pos + 1]
+        if len(char) == 0 or char not in chars:
+            raise ValueError("JSON文件 '%s' 在位置 %d 处格式错误, 期望 %s" % (self.json_path, pos, chars))
+        return pos
+
+    def _object_spans(self, start: int) -> Dict[str, _Span]:
+        """扫描从`start`处的'{'开始的对象, 返回各字段值的位置"""
+        spans: Dict[str, _Span] = {}
+        pos = self._skip_ws(start + 1)
+        if self._buf[pos:pos + 1] == b"}":
+            return spans
+        while True:
+            pos = self._skip_ws(pos)
+            key_end = self._match(_STRING, pos)
+            key = json.loads(self._buf[pos:key_end])
+            pos = self._expect(key_end, b":")
+            value_start = self._skip_ws(pos + 1)
+            value_end = self._value_end(value_start)
+            spans[key] = (value_start, value_end)
+            pos = self._expect(value_end, b",}")
+            if self._buf[pos:pos + 1] == b"}":
+                return spans
+            pos += 1
+
+    def _array_spans(self, start: int) -> List[_Span]:
+        """扫描从`start`处的'['开始的数组, 返回各元素的位置"""
+        spans: List[_Span] = []
+        pos = self._skip_ws(start + 1)
+        if self._buf[pos:pos + 1] == b"]":
+            return spans
+        while True:
+            value_start = self._skip_ws(pos)
+            value_end = self._value_end(value_start)
+            spans.append((value_start, value_end))
+            pos = self._expect(value_end, b",]")
+            if self._buf[pos:pos + 1] == b"]":
+                return spans
+            pos += 1
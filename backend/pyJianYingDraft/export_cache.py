@@ -0,0 +1,33 @@
+"""导出结果的缓存"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class Export_cached(ABC):
+    """可以缓存`export_json`结果的对象
+
+    对象的`export_state`给出决定导出结果的全部状态, 状态不变时直接返回上次的导出结果
+    """
+
+    __slots__ = ("_export_cache",)
+
+    @abstractmethod
+    def export_json(self) -> Dict[str, Any]:
+        """导出为草稿中的JSON对象, 每次调用都应返回新建的结果"""
+
+    @abstractmethod
+    def export_state(self) -> Any:
+        """决定导出结果的全部状态, 以`==`与上次导出时的状态比较, 应比`export_json`本身廉价得多"""
+
+    def export_json_cached(self) -> Dict[str, Any]:
+        """返回缓存的导出结果, 仅在`export_state`发生变化时重新导出
+
+        返回值在多次导出间共享, 调用方不应修改它
+        """
+        state = self.export_state()
+        cache = getattr(self, "_export_cache", None)
+        if cache is None or cache[0] != state:
+            cache = (state, self.export_json())
+            self._export_cache = cache
+        return cache[1]
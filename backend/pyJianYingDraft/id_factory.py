@@ -0,0 +1,92 @@
+"""草稿中各对象id的生成
+
+片段、轨道、关键帧等对象在创建时均需要一个32位十六进制的id. 默认的生成器以进程内随机的前缀加上递增的计数器
+构成id, 比逐个调用`uuid.uuid4()`快得多且同样不会重复; 指定随机种子时则生成确定的id序列, 便于得到可复现的输出.
+
+生成器可以全局设置, 也可以只对当前线程或某个`Script_file`生效.
+"""
+
+import itertools
+import os
+import random
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+Id_source = Callable[[], str]
+"""id生成函数, 每次调用返回一个新的id"""
+
+class Id_factory:
+    """以"前缀+计数器"方式生成id的生成器, 生成的id为32位十六进制字符串, 与`uuid.uuid4().hex`格式一致"""
+
+    seed: Optional[int]
+    """随机种子, 为None时前缀完全随机"""
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed (`int`, optional): 随机种子. 指定时每次`reset`后均生成相同的id序列, 否则前缀随机生成且在fork出的子进程中自动更换.
+        """
+        self.seed = seed
+        self.reset()
+        if seed is None:
+            _random_factories.add(self)
+
+    def reset(self) -> None:
+        """重新生成前缀并将计数器归零, 对指定了种子的生成器而言即是从头开始生成同样的id序列"""
+        if self.seed is None:
+            self._prefix = os.urandom(8).hex()
+        else:
+            self._prefix = "%016x" % random.Random(self.seed).getrandbits(64)
+        self._counter = itertools.count()
+
+    def __call__(self) -> str:
+        return self._prefix + "%016x" % next(self._counter)
+
+_random_factories: "weakref.WeakSet[Id_factory]" = weakref.WeakSet()
+"""所有前缀随机的生成器, fork后需在子进程中更换前缀以免与父进程及兄弟进程重复"""
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: [factory.reset() for factory in list(_random_factories)])
+
+_default_source: Id_source = Id_factory()
+_local = threading.local()
+
+def new_id() -> str:
+    """用当前线程生效的生成器生成一个新id"""
+    source = getattr(_local, "source", None)
+    if source is None:
+        return _default_source()
+    return source()
+
+def get_id_factory() -> Id_source:
+    """当前线程生效的id生成器"""
+    source = getattr(_local, "source", None)
+    return _default_source if source is None else source
+
+def set_id_factory(source: Optional[Id_source], *, thread_only: bool = False) -> None:
+    """设置id生成器
+
+    Args:
+        source (`Id_factory` or `Callable[[], str]`, optional): 新的生成器, 为None时恢复为默认的随机生成器(全局)或取消当前线程的设置
+        thread_only (`bool`, optional): 是否仅对当前线程生效, 默认为否, 即修改全局默认的生成器
+    """
+    global _default_source
+    if thread_only:
+        _local.source = source
+    else:
+        _default_source = Id_factory() if source is None else source
+
+@contextmanager
+def use_id_factory(source: Optional[Id_source]) -> Iterator[None]:
+    """在`with`块内让当前线程使用`source`生成id, 退出时恢复原来的设置; `source`为None时不做任何改变"""
+    if source is None:
+        yield
+        return
+    previous = getattr(_local, "source", None)
+    _local.source = source
+    try:
+        yield
+    finally:
+        _local.source = previous
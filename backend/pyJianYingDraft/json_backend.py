@@ -0,0 +1,129 @@
+"""可替换的JSON编解码后端
+
+默认在安装了`orjson`时使用它加速草稿的解析与序列化, 否则使用标准库`json`.
+无论使用哪个后端, `dumps`的输出都与相同参数下的`json.dumps(..., ensure_ascii=False)`逐字节一致:
+键的顺序保持不变, 非ASCII字符不转义, 浮点数的格式也相同. 对于`orjson`无法给出一致结果的输入
+(如格式不同的浮点数、超出64位的整数、非字符串的键、非默认的分隔符等), 会自动退回到标准库实现.
+
+唯一的例外是`NaN`与`Infinity`: 它们不是合法的JSON值, `orjson`将其输出为`null`.
+"""
+
+import json
+import re
+from typing import Any, Literal, Optional, TextIO, Tuple, Union
+
+Backend_name = Literal["json", "orjson"]
+
+orjson: Any = None
+"""`orjson`模块, 在首次使用JSON后端时才导入: 它会连带导入`uuid`、`zoneinfo`等模块, 耗时与导入本包相当"""
+_backend: Optional[Backend_name] = None
+"""当前使用的JSON后端, 为None表示尚未确定"""
+
+_COMPACT_SEPARATORS = (",", ":")
+_INDENT_SEPARATORS = (",", ": ")
+
+_EXPONENT = re.compile(rb"e-?\d+(?:[,\]}\n]|\Z)")
+"""`orjson`输出中可能以科学计数法表示的浮点数, 其格式(如`1e16`)与标准库(`1e+16`)不同"""
+_SMALL_FLOAT = b"0.0000"
+"""`orjson`将绝对值小于1e-4的部分浮点数输出为小数形式(如`0.00001`), 而标准库输出为`1e-05`"""
+
+def _import_orjson() -> bool:
+    """导入`orjson`, 返回其是否可用"""
+    global orjson
+    if orjson is None:
+        try:
+            import orjson as module
+        except ImportError:
+            return False
+        orjson = module
+    return True
+
+def get_backend() -> Backend_name:
+    """当前使用的JSON后端名称, 默认在安装了`orjson`时使用它, 否则使用标准库"""
+    global _backend
+    if _backend is None:
+        _backend = "orjson" if _import_orjson() else "json"
+    return _backend
+
+def set_backend(name: Backend_name) -> None:
+    """切换全局使用的JSON后端
+
+    Args:
+        name (`"json"` or `"orjson"`): 后端名称, `"json"`表示标准库
+
+    Raises:
+        `ValueError`: 后端名称不存在, 或相应的库未安装
+    """
+    global _backend
+    if name not in ("json", "orjson"):
+        raise ValueError("不支持的JSON后端 '%s'" % name)
+    if name == "orjson" and not _import_orjson():
+        raise ValueError("未安装orjson, 无法使用该后端")
+    _backend = name
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """解析JSON文本, 结果与`json.loads`相同"""
+    if get_backend() == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 由标准库处理NaN等扩展语法, 或抛出更详细的错误信息
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+def load(fp: TextIO) -> Any:
+    """从文件对象中读取并解析JSON, 结果与`json.load`相同"""
+    return loads(fp.read())
+
+def dumps(obj: Any, *, indent: Optional[int] = None, separators: Optional[Tuple[str, str]] = None) -> str:
+    """序列化`obj`, 结果与`json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators)`逐字节一致"""
+    if get_backend() == "orjson":
+        data = _orjson_dumps(obj, indent, separators)
+        if data is not None:
+            return data.decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators)
+
+def dumps_bytes(obj: Any, *, indent: Optional[int] = None, separators: Optional[Tuple[str, str]] = None) -> bytes:
+    """同`dumps`, 但返回UTF-8编码的结果"""
+    if get_backend() == "orjson":
+        data = _orjson_dumps(obj, indent, separators)
+        if data is not None:
+            return data
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators).encode("utf-8")
+
+def _orjson_dumps(obj: Any, indent: Optional[int], separators: Optional[Tuple[str, str]]) -> Optional[bytes]:
+    """尝试用orjson序列化, 无法保证与标准库结果一致时返回None"""
+    if indent is None:
+        # orjson只能输出紧凑格式
+        if separators is None or tuple(separators) != _COMPACT_SEPARATORS:
+            return None
+        option = 0
+    else:
+        # orjson只支持2格缩进, 4格缩进由2格缩进转换而来
+        if indent not in (2, 4) or (separators is not None and tuple(separators) != _INDENT_SEPARATORS):
+            return None
+        option = orjson.OPT_INDENT_2
+
+    try:
+        # 子类(如IntEnum)及dataclass等类型的序列化方式与标准库不同, 交给标准库处理
+        data: bytes = orjson.dumps(obj, option=option | orjson.OPT_PASSTHROUGH_SUBCLASS |
+                                   orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        return None  # 超出64位的整数、非字符串的键、不支持的类型等
+    if data.find(_SMALL_FLOAT) >= 0 or _EXPONENT.search(data) is not None:
+        return None  # 可能含有格式不同的浮点数(也可能只是字符串中的内容, 此时退回标准库同样正确)
+
+    if indent == 4:
+        data = _double_indent(data)
+    return data
+
+def _double_indent(data: bytes) -> bytes:
+    """将2格缩进的JSON转换为4格缩进"""
+    depth = 0
+    while data.find(b"\n" + b"  " * (depth + 1)) >= 0:
+        depth += 1
+    # 由深至浅将每级缩进替换为一个控制字符(它在JSON输出中总是被转义, 不会与内容混淆), 最后统一展开
+    for level in range(depth, 0, -1):
+        data = data.replace(b"\n" + b"  " * level, b"\n" + b"\x01" * level)
+    return data.replace(b"\x01", b"    ")
@@ -0,0 +1,97 @@
+"""流式JSON写出工具
+
+输出与相同格式选项下的`json.dumps(..., ensure_ascii=False)`逐字节一致,
+但数组可以延迟生成, 从而在写出过程中逐个导出并释放元素
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from . import json_backend
+
+
+class Lazy_array:
+    """延迟生成的JSON数组, 写出时才逐个迭代其元素"""
+
+    items: Iterable[Any]
+    """数组元素的来源, 可以是生成器"""
+
+    def __init__(self, items: Iterable[Any]):
+        self.items = items
+
+
+def format_options(compact: bool) -> Dict[str, Any]:
+    """与`compact`选项对应的`json.dumps`格式参数"""
+    if compact:
+        return {"indent": None, "separators": (",", ":")}
+    return {"indent": 4}
+
+
+def write_json(fp: TextIO, obj: Any, *, compact: bool = False) -> None:
+    """将`obj`写入文本文件对象`fp`, 其中的`Lazy_array`会被逐元素展开
+
+    Args:
+        fp (`TextIO`): 以文本模式打开的文件对象
+        obj (`Any`): 要写出的JSON对象
+        compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为否, 即缩进4格
+    """
+    _Writer(fp, compact).write(obj, 0)
+
+
+def _has_lazy(obj: Dict[str, Any]) -> bool:
+    for value in obj.values():
+        if isinstance(value, Lazy_array):
+            return True
+        if isinstance(value, dict) and _has_lazy(value):
+            return True
+    return False
+
+
+class _Writer:
+    def __init__(self, fp: TextIO, compact: bool):
+        self.fp = fp
+        self.options = format_options(compact)
+        self.indent: Optional[int] = self.options["indent"]
+        self.item_sep, self.key_sep = (",", ":") if compact else (",", ": ")
+
+    def _newline(self, level: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    def _encode_leaf(self, obj: Any, level: int) -> str:
+        text = json_backend.dumps(obj, **self.options)
+        if self.indent is None or level == 0:
+            return text
+        # 字符串中的换行符总是被转义, 因此可以安全地为每一行补齐外层缩进
+        return text.replace("\n", self._newline(level))
+
+    def write(self, obj: Any, level: int) -> None:
+        if isinstance(obj, Lazy_array):
+            self._write_array(obj.items, level)
+        elif isinstance(obj, dict) and obj and _has_lazy(obj):
+            self._write_dict(obj, level)
+        else:
+            self.fp.write(self._encode_leaf(obj, level))
+
+    def _write_dict(self, obj: Dict[str, Any], level: int) -> None:
+        self.fp.write("{")
+        first = True
+        for key, value in obj.items():
+            prefix = "" if first else self.item_sep
+            self.fp.write(prefix + self._newline(level + 1) + json.dumps(key, ensure_ascii=False) + self.key_sep)
+            self.write(value, level + 1)
+            first = False
+        self.fp.write(self._newline(level) + "}")
+
+    def _write_array(self, items: Iterable[Any], level: int) -> None:
+        self.fp.write("[")
+        empty = True
+        for item in items:
+            prefix = "" if empty else self.item_sep
+            self.fp.write(prefix + self._newline(level + 1))
+            self.write(item, level + 1)
+            empty = False
+        if not empty:
+            self.fp.write(self._newline(level))
+        self.fp.write("]")
@@ -1,11 +1,16 @@
-import uuid
 
+from array import array
+from bisect import bisect_right
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from .id_factory import new_id
 
 class Keyframe:
     """一个关键帧（关键点）, 目前只支持线性插值"""
 
+    __slots__ = ("kf_id", "time_offset", "values")
+
     kf_id: str
     """关键帧全局id, 自动生成"""
     time_offset: int
@@ -13,25 +18,34 @@ class Keyframe:
     values: List[float]
     """关键帧的值, 似乎一般只有一个元素"""
 
-    def __init__(self, time_offset: int, value: float):
-        """给定时间偏移量及关键值, 初始化关键帧"""
-        self.kf_id = uuid.uuid4().hex
+    def __init__(self, time_offset: int, value: float, kf_id: Optional[str] = None):
+        """给定时间偏移量及关键值, 初始化关键帧
+
+        Args:
+            time_offset (`int`): 时间偏移量, 单位为微秒
+            value (`float`): 关键值
+            kf_id (`str`, optional): 关键帧id, 默认自动生成
+        """
+        self.kf_id = kf_id if kf_id is not None else new_id()
 
         self.time_offset = time_offset
         self.values = [value]
 
     def export_json(self) -> Dict[str, Any]:
-        return {
-            # 默认值
-            "curveType": "Line",
-            "graphID": "",
-            "left_control": {"x": 0.0, "y": 0.0},
-            "right_control": {"x": 0.0, "y": 0.0},
-            # 自定义属性
-            "id": self.kf_id,
-            "time_offset": self.time_offset,
-            "values": self.values
-        }
+        return _keyframe_json(self.kf_id, self.time_offset, self.values)
+
+def _keyframe_json(kf_id: str, time_offset: int, values: List[float]) -> Dict[str, Any]:
+    return {
+        # 默认值
+        "curveType": "Line",
+        "graphID": "",
+        "left_control": {"x": 0.0, "y": 0.0},
+        "right_control": {"x": 0.0, "y": 0.0},
+        # 自定义属性
+        "id": kf_id,
+        "time_offset": time_offset,
+        "values": values
+    }
 
 class Keyframe_property(Enum):
     """关键帧所控制的属性类型"""
@@ -63,32 +77,121 @@ class Keyframe_property(Enum):
     """音量, 1.0为原始音量, 仅对`Audio_segment`和`Video_segment`有效"""
 
 class Keyframe_list:
-    """关键帧列表, 记录与某个特定属性相关的一系列关键帧"""
+    """关键帧列表, 记录与某个特定属性相关的一系列关键帧
+
+    关键帧以列存储: 时间偏移量及关键值分别保存在按时间排序的数组中, 各关键帧的id直到导出时才生成,
+    `Keyframe`对象也只在访问`keyframes`时临时创建
+    """
+
+    __slots__ = ("list_id", "keyframe_property", "_times", "_values", "_ids")
 
     list_id: str
     """关键帧列表全局id, 自动生成"""
     keyframe_property: Keyframe_property
     """关键帧对应的属性"""
-    keyframes: List[Keyframe]
-    """关键帧列表"""
+
+    _times: "array[int]"
+    """各关键帧的时间偏移量, 单位为微秒, 升序排列"""
+    _values: "array[float]"
+    """各关键帧的值, 与`_times`一一对应"""
+    _ids: List[str]
+    """已生成的关键帧id, 第i个id属于按时间排序后的第i个关键帧, 数量可能少于关键帧数量"""
 
     def __init__(self, keyframe_property: Keyframe_property):
         """为给定的关键帧属性初始化关键帧列表"""
-        self.list_id = uuid.uuid4().hex
+        self.list_id = new_id()
 
         self.keyframe_property = keyframe_property
-        self.keyframes = []
+        self._times = array("q")
+        self._values = array("d")
+        self._ids = []
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def keyframes(self) -> List[Keyframe]:
+        """按时间排序的关键帧列表, 每次访问时根据列数据重新创建, 修改它不会影响本对象"""
+        ids = self._ensure_ids()
+        return [Keyframe(time_offset, value, kf_id) for kf_id, time_offset, value in zip(ids, self._times, self._values)]
+
+    @property
+    def times(self) -> "array[int]":
+        """各关键帧的时间偏移量(升序), 单位为微秒, 返回副本"""
+        return array("q", self._times)
+
+    @property
+    def values(self) -> "array[float]":
+        """各关键帧的值, 与`times`一一对应, 返回副本"""
+        return array("d", self._values)
 
     def add_keyframe(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 向此关键帧列表中添加一个关键帧"""
-        keyframe = Keyframe(time_offset, value)
-        self.keyframes.append(keyframe)
-        self.keyframes.sort(key=lambda x: x.time_offset)
+        time_offset = round(time_offset)
+        # 与已有关键帧时间相同时插入在其后
+        index = bisect_right(self._times, time_offset)
+        self._times.insert(index, time_offset)
+        self._values.insert(index, value)
+
+    def add_keyframes(self, times: Iterable[int], values: Iterable[float]):
+        """批量添加关键帧, 效果与依次调用`add_keyframe`相同
+
+        Args:
+            times (`Iterable[int]`): 各关键帧的时间偏移量, 单位为微秒, 可以是`array`或NumPy数组. 非整数值将被四舍五入.
+            values (`Iterable[float]`): 各关键帧的值, 与`times`一一对应
+
+        Raises:
+            `ValueError`: `times`与`values`的长度不一致
+        """
+        new_times = _to_array("q", times)
+        new_values = _to_array("d", values)
+        if len(new_times) != len(new_values):
+            raise ValueError("时间偏移量与关键值的数量不一致 (%d != %d)" % (len(new_times), len(new_values)))
+        if len(new_times) == 0:
+            return
+
+        in_order = all(new_times[i] <= new_times[i + 1] for i in range(len(new_times) - 1))
+        if in_order and (len(self._times) == 0 or self._times[-1] <= new_times[0]):
+            self._times.extend(new_times)
+            self._values.extend(new_values)
+            return
+
+        # 稳定排序, 时间相同的关键帧保持添加顺序
+        times_all = self._times + new_times
+        values_all = self._values + new_values
+        order = sorted(range(len(times_all)), key=times_all.__getitem__)
+        self._times = array("q", [times_all[i] for i in order])
+        self._values = array("d", [values_all[i] for i in order])
+
+    def _ensure_ids(self) -> List[str]:
+        """为尚无id的关键帧生成id"""
+        for _ in range(len(self._times) - len(self._ids)):
+            self._ids.append(new_id())
+        return self._ids
+
+    def export_state(self) -> Tuple[Any, ...]:
+        """决定导出结果的状态"""
+        # 关键帧id按位置分配且一经生成就不再改变, 因此无需计入状态
+        return (self.list_id, self.keyframe_property, self._times.tobytes(), self._values.tobytes())
 
     def export_json(self) -> Dict[str, Any]:
+        ids = self._ensure_ids()
         return {
             "id": self.list_id,
-            "keyframe_list": [kf.export_json() for kf in self.keyframes],
+            "keyframe_list": [_keyframe_json(kf_id, time_offset, [value])
+                              for kf_id, time_offset, value in zip(ids, self._times, self._values)],
             "material_id": "",
             "property_type": self.keyframe_property.value
         }
+
+def _to_array(typecode: str, data: Iterable[Any]) -> "array[Any]":
+    """将序列转换为给定类型的数组, 对NumPy数组直接复制其内存"""
+    if isinstance(data, array) and data.typecode == typecode:
+        return array(typecode, data)
+    if hasattr(data, "astype") and hasattr(data, "tobytes"):  # NumPy数组, 无需导入numpy即可处理
+        if typecode == "q":
+            data = data.round()  # type: ignore
+        return array(typecode, data.astype("=i8" if typecode == "q" else "=f8").tobytes())  # type: ignore
+    if typecode == "q":
+        return array(typecode, [round(item) for item in data])
+    return array(typecode, data)
@@ -1,14 +1,21 @@
 import os
-import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, List, Iterable, Union, TypeVar, TYPE_CHECKING
 from typing import Optional, Literal
 
-import pymediainfo
+from .export_cache import Export_cached
+from .media_probe import Media_tracks, probe_header
+from .probe_cache import cached_probe, get_probe_cache, set_probe_cache
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 # 这个类可以用来设置素材的裁剪参数, 例如裁剪视频的某个区域
 class Crop_settings:
-    """素材的裁剪设置, 各属性均在0-1之间, 注意素材的坐标原点在左上角"""
+    """素材的裁剪设置, 各属性均在0-1之间, 注意素材的坐标原点在左上角. 构造后不可修改"""
+
+    __slots__ = ("upper_left_x", "upper_left_y", "upper_right_x", "upper_right_y",
+                 "lower_left_x", "lower_left_y", "lower_right_x", "lower_right_y")
 
     upper_left_x: float
     upper_left_y: float
@@ -33,6 +40,16 @@ class Crop_settings:
         self.lower_right_x = lower_right_x
         self.lower_right_y = lower_right_y
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # 各属性只能在构造时赋值一次, 因此同一个裁剪设置可以被多个素材共享(包括作为默认参数)
+        if hasattr(self, name):
+            raise AttributeError("裁剪设置不可修改, 请构造新的`Crop_settings`")
+        object.__setattr__(self, name, value)
+
+    def export_state(self) -> Tuple[float, ...]:
+        return (self.upper_left_x, self.upper_left_y, self.upper_right_x, self.upper_right_y,
+                self.lower_left_x, self.lower_left_y, self.lower_right_x, self.lower_right_y)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "upper_left_x": self.upper_left_x,
@@ -46,16 +63,146 @@ class Crop_settings:
         }
 
 
-# 素材类 提供的构造函数可以从指定位置加载视频或音频素材
-class Video_material:
-    """本地视频素材（视频或图片）, 一份素材可以在多个片段中使用"""
+def _read_tracks(path: str) -> Optional[Media_tracks]:
+    """读取素材的轨道信息: 常见格式只解析文件头部, 其余格式交给mediainfo; mediainfo不可用时返回None"""
+    tracks = probe_header(path)
+    if tracks is not None:
+        return tracks
+
+    import pymediainfo  # 导入较慢, 仅在文件头部解析不了时才导入
+    if not pymediainfo.MediaInfo.can_parse():
+        return None
+    # 以文件对象的形式传入, mediainfo便不会把同目录下编号连续的图片视为图片序列.
+    # 这与设置"File_TestContinuousFileNames"选项等效, 但后者在解析结束后会重置全局选项, 使并行解析出错
+    with open(path, "rb") as file:
+        info: pymediainfo.MediaInfo = pymediainfo.MediaInfo.parse(file)  # type: ignore
+
+    tracks = Media_tracks()
+    if len(info.video_tracks):
+        track = info.video_tracks[0]
+        tracks.video = (track.width, track.height,
+                        None if track.duration is None else int(track.duration * 1e3))  # type: ignore
+    if len(info.image_tracks):
+        tracks.image = (info.image_tracks[0].width, info.image_tracks[0].height)
+    if len(info.audio_tracks) and info.audio_tracks[0].duration is not None:
+        tracks.audio_duration = int(info.audio_tracks[0].duration * 1e3)  # type: ignore
+    return tracks
+
+def _probe_video(path: str) -> Dict[str, Any]:
+    """读取视频或图片素材的类型、时长及宽高
+
+    Raises:
+        `ValueError`: 不支持的素材文件类型.
+    """
+    postfix = os.path.splitext(path)[1]
+    tracks = _read_tracks(path)
+    if tracks is None:
+        raise ValueError(f"不支持的视频素材类型 '{postfix}'")
+
+    # 有视频轨道的视为视频素材
+    if tracks.video is not None:
+        width, height, duration = tracks.video
+        if duration is None:
+            raise ValueError(f"无法读取视频素材 {path} 的时长")
+        return {"material_type": "video", "duration": duration, "width": width, "height": height}
+    # gif文件的时长为首帧延时乘以帧数, 文件头部解析不了时使用imageio库获取
+    elif postfix.lower() == ".gif" and tracks.image is not None:
+        duration = tracks.gif_duration
+        if duration is None:
+            import imageio
+            gif = imageio.get_reader(path)
+            try:
+                frame_delay = gif.get_meta_data().get("duration")
+                if frame_delay is None:
+                    raise ValueError(f"无法读取gif素材 {path} 的帧延时")
+                duration = int(round(frame_delay * gif.get_length() * 1e3))
+            finally:
+                gif.close()
+        return {"material_type": "video", "duration": duration,
+                "width": tracks.image[0], "height": tracks.image[1]}
+    elif tracks.image is not None:
+        return {"material_type": "photo", "duration": 10800000000,  # 相当于3h
+                "width": tracks.image[0], "height": tracks.image[1]}
+    else:
+        raise ValueError(f"输入的素材文件 {path} 没有视频轨道或图片轨道")
+
+def _probe_audio(path: str) -> Dict[str, Any]:
+    """读取音频素材的时长
+
+    Raises:
+        `ValueError`: 不支持的素材文件类型, 或文件不是纯音频文件.
+    """
+    tracks = _read_tracks(path)
+    if tracks is None:
+        raise ValueError("不支持的音频素材类型 %s" % os.path.splitext(path)[1])
+    if tracks.video is not None:
+        raise ValueError("音频素材不应包含视频轨道")
+    if tracks.audio_duration is None:
+        raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
+    return {"duration": tracks.audio_duration}
+
+
+def _material_id(material_name: str) -> str:
+    """由素材名生成的素材id, 同名素材的id相同"""
+    import uuid  # 导入较慢, 在首次创建素材时才导入
+    return uuid.uuid3(uuid.NAMESPACE_DNS, material_name).hex
+
+_Material = TypeVar("_Material", bound="Local_material")
+
+class Local_material(Export_cached):
+    """本地素材的基类
+
+    素材在构造完成后不可修改, 因此任意多个片段都可以直接共享同一个素材实例, 复制素材也只会返回其本身.
+    需要修改时调用`replace`得到修改后的副本(写时复制), 原素材及引用它的片段均不受影响.
+    """
 
     material_id: str
     """素材全局id, 自动生成"""
-    local_material_id: str
-    """素材本地id, 意义暂不明确"""
     material_name: str
     """素材名称"""
+
+    def _freeze(self) -> None:
+        """在构造完成时调用, 此后素材不可修改"""
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get("_frozen") and name != "_export_cache":
+            raise AttributeError("素材 '%s' 不可修改, 请使用`replace`得到修改后的副本" % self.material_name)
+        object.__setattr__(self, name, value)
+
+    def __copy__(self: _Material) -> _Material:
+        return self
+
+    def __deepcopy__(self: _Material, memo: Dict[int, Any]) -> _Material:
+        return self
+
+    def replace(self: _Material, **changes: Any) -> _Material:
+        """返回修改了给定属性的素材副本, 原素材不受影响
+
+        修改`material_name`而未指定`material_id`时, 素材id随新名称重新生成.
+        注意草稿中的素材以id区分, 同一草稿中不应同时使用id相同而内容不同的素材.
+
+        Raises:
+            `AttributeError`: 素材没有给定的属性
+        """
+        new = object.__new__(type(self))
+        state = dict(self.__dict__)
+        for name, value in changes.items():
+            if name.startswith("_") or name not in state:
+                raise AttributeError("素材没有属性 '%s'" % name)
+            state[name] = value
+        if "material_name" in changes and "material_id" not in changes:
+            state["material_id"] = _material_id(state["material_name"])
+        new.__dict__.update(state)
+        return new
+
+
+# 素材类 提供的构造函数可以从指定位置加载视频或音频素材
+class Video_material(Local_material):
+    """本地视频素材（视频或图片）, 一份素材可以在多个片段中使用"""
+
+    local_material_id: str
+    """素材本地id, 意义暂不明确"""
     path: str
     """素材文件路径"""
     duration: int
@@ -84,52 +231,28 @@ class Video_material:
             `ValueError`: 不支持的素材文件类型.
         """
         path = os.path.abspath(path)
-        postfix = os.path.splitext(path)[1]
         if not os.path.exists(path):
             raise FileNotFoundError(f"找不到 {path}")
 
         self.material_name = material_name if material_name else os.path.basename(
             path)
-        self.material_id = uuid.uuid3(
-            uuid.NAMESPACE_DNS, self.material_name).hex
+        self.material_id = _material_id(self.material_name)
         self.path = path
         self.crop_settings = crop_settings
         self.local_material_id = ""
 
-        if not pymediainfo.MediaInfo.can_parse():
-            raise ValueError(f"不支持的视频素材类型 '{postfix}'")
-
-        info: pymediainfo.MediaInfo = \
-            pymediainfo.MediaInfo.parse(path, mediainfo_options={
-                                        "File_TestContinuousFileNames": "0"})  # type: ignore
-        # 有视频轨道的视为视频素材
-        if len(info.video_tracks):
-            self.material_type = "video"
-            self.duration = int(
-                info.video_tracks[0].duration * 1e3)  # type: ignore
-            # type: ignore
-            self.width, self.height = info.video_tracks[0].width, info.video_tracks[0].height
-        # gif文件使用imageio库获取长度
-        elif postfix.lower() == ".gif":
-            import imageio
-            gif = imageio.get_reader(path)
-
-            self.material_type = "video"
-            self.duration = int(
-                round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3))
-            # type: ignore
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height
-            gif.close()
-        elif len(info.image_tracks):
-            self.material_type = "photo"
-            self.duration = 10800000000  # 相当于3h
-            # type: ignore
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height
-        else:
-            raise ValueError(f"输入的素材文件 {path} 没有视频轨道或图片轨道")
+        info = cached_probe("video", path, _probe_video)
+        self.material_type = info["material_type"]
+        self.duration = info["duration"]
+        self.width, self.height = info["width"], info["height"]
+        self._freeze()
 
     # 导出为JSON格式, 方便传输或存储
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.material_id, self.local_material_id, self.material_name, self.path, self.duration,
+                self.width, self.height, self.material_type, self.crop_settings.export_state())
+
     def export_json(self) -> Dict[str, Any]:
         video_material_json = {
             "audio_fade": None,
@@ -153,13 +276,9 @@ class Video_material:
         return video_material_json
 
 
-class Audio_material:
-    """本地音频素材"""
+class Audio_material(Local_material):
+    """本地音频素材, 一份素材可以在多个片段中使用"""
 
-    material_id: str
-    """素材全局id, 自动生成"""
-    material_name: str
-    """素材名称"""
     path: str
     """素材文件路径"""
 
@@ -183,20 +302,14 @@ class Audio_material:
 
         self.material_name = material_name if material_name else os.path.basename(
             path)
-        self.material_id = uuid.uuid3(
-            uuid.NAMESPACE_DNS, self.material_name).hex
+        self.material_id = _material_id(self.material_name)
         self.path = path
 
-        if not pymediainfo.MediaInfo.can_parse():
-            raise ValueError("不支持的音频素材类型 %s" % os.path.splitext(path)[1])
-        info: pymediainfo.MediaInfo = pymediainfo.MediaInfo.parse(
-            path)  # type: ignore
-        if len(info.video_tracks):
-            raise ValueError("音频素材不应包含视频轨道")
-        if not len(info.audio_tracks):
-            raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
-        self.duration = int(
-            info.audio_tracks[0].duration * 1e3)  # type: ignore
+        self.duration = cached_probe("audio", path, _probe_audio)["duration"]
+        self._freeze()
+
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.material_id, self.material_name, self.path, self.duration)
 
     def export_json(self) -> Dict[str, Any]:
         return {
@@ -238,3 +351,69 @@ class Audio_material:
             "video_id": "",
             "wave_points": []
         }
+
+
+AUDIO_POSTFIXES = frozenset((".mp3", ".wav", ".aac", ".m4a", ".flac", ".ogg", ".opus", ".wma", ".amr", ".ape"))
+"""自动判断素材类型时优先作为音频素材尝试的文件后缀"""
+
+def _load_material(path: str, kind: Literal["auto", "video", "audio"]) -> Union[Video_material, Audio_material, Exception]:
+    """加载单个素材, 异常作为返回值而非抛出, 以免一个素材的意外错误(如第三方库的异常)中断整批加载"""
+    try:
+        if kind == "video":
+            return Video_material(path)
+        if kind == "audio":
+            return Audio_material(path)
+
+        # 先按后缀猜测素材类型, 猜错时再尝试另一种
+        loaders = [Video_material, Audio_material]
+        if os.path.splitext(path)[1].lower() in AUDIO_POSTFIXES:
+            loaders.reverse()
+        try:
+            return loaders[0](path)
+        except ValueError as error:
+            try:
+                return loaders[1](path)
+            except ValueError:
+                raise error from None
+    except Exception as error:
+        return error
+
+def load_materials(paths: Iterable[str], workers: Optional[int] = None,
+                   kind: Literal["auto", "video", "audio"] = "auto",
+                   use_processes: bool = False) -> List[Union[Video_material, Audio_material, Exception]]:
+    """并行加载一批本地素材, 返回值与`paths`一一对应
+
+    单个素材加载失败时不会中断其余素材, 而是在对应位置返回其异常(通常为`FileNotFoundError`或`ValueError`),
+    调用方可用`isinstance(result, Exception)`区分.
+
+    Args:
+        paths (`Iterable[str]`): 素材文件路径
+        workers (`int`, optional): 并行的线程或进程数, 默认由`concurrent.futures`决定
+        kind (`str`, optional): 素材类型. "video"加载为`Video_material`(视频或图片), "audio"加载为`Audio_material`,
+            默认的"auto"根据文件内容自动判断: 有视频或图片轨道的为视频或图片素材, 否则为音频素材.
+        use_processes (`bool`, optional): 是否使用进程池, 默认使用线程池. 探测主要耗时在mediainfo中且不持有GIL,
+            因此线程池通常已足够; 当前的探测缓存会传给各工作进程.
+
+    Raises:
+        `ValueError`: `kind`或`workers`取值无效
+    """
+    if kind not in ("auto", "video", "audio"):
+        raise ValueError("不支持的素材类型 '%s'" % kind)
+    if workers is not None and workers <= 0:
+        raise ValueError("并行数必须为正")
+    paths = list(paths)
+    if len(paths) <= 1 or workers == 1:
+        return [_load_material(path, kind) for path in paths]
+
+    # concurrent.futures(尤其是进程池所需的multiprocessing)导入较慢, 仅在并行加载时导入
+    executor: "Executor"
+    if use_processes:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers, initializer=set_probe_cache, initargs=(get_probe_cache(),))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(workers)
+    with executor:
+        # 进程池按批分发任务以减少进程间通信
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4)) if use_processes else 1
+        return list(executor.map(_load_material, paths, [kind] * len(paths), chunksize=chunksize))
@@ -0,0 +1,243 @@
+"""只读取文件头部的媒体信息探测
+
+构造本地素材只需要时长与尺寸, 对于MP4/MOV、WAV、PNG、JPEG及GIF这几种常见格式, 这些信息都可以直接从文件头部的
+少数几个结构中读出, 无须加载mediainfo或解码GIF的全部帧. 文件经`mmap`映射后按需跳转读取, 通常只会触及几KB的数据.
+
+解析结果与mediainfo(及GIF的imageio)保持一致: 时长舍入到整毫秒, 视频尺寸取自编码参数而非显示尺寸.
+遇到无法识别或不确定能与mediainfo一致的情况(如分片MP4、非PCM编码的WAV)时返回None, 由调用方改用mediainfo.
+"""
+
+import mmap
+import struct
+from typing import Iterator, Optional, Tuple, Union
+
+_Buffer = Union[bytes, mmap.mmap]
+
+class Media_tracks:
+    """媒体文件中与构造素材相关的轨道信息"""
+
+    __slots__ = ("video", "image", "audio_duration", "gif_duration")
+
+    video: Optional[Tuple[int, int, Optional[int]]]
+    """首个视频轨道的(宽, 高, 时长), 时长单位为微秒, 无法获取时为None"""
+    image: Optional[Tuple[int, int]]
+    """首个图片轨道的(宽, 高)"""
+    audio_duration: Optional[int]
+    """首个音频轨道的时长, 单位为微秒; 没有音频轨道时为None"""
+    gif_duration: Optional[int]
+    """GIF动画的时长, 单位为微秒, 与imageio的算法一致, 为首帧延时乘以帧数; 不是GIF或无法确定时为None"""
+
+    def __init__(self, *, video: Optional[Tuple[int, int, Optional[int]]] = None,
+                 image: Optional[Tuple[int, int]] = None,
+                 audio_duration: Optional[int] = None, gif_duration: Optional[int] = None):
+        self.video = video
+        self.image = image
+        self.audio_duration = audio_duration
+        self.gif_duration = gif_duration
+
+def _ms_to_us(numerator: int, denominator: int) -> int:
+    """将`numerator / denominator`秒舍入到整毫秒后转为微秒, 与mediainfo报告的精度及舍入方式(四舍六入五成双)一致"""
+    ms, remainder = divmod(numerator * 1000, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and ms & 1):
+        ms += 1
+    return ms * 1000
+
+def _iter_boxes(buf: _Buffer, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """依次给出[start, end)范围内各个box的(类型, 内容起点, 终点)
+
+    Raises:
+        `ValueError`: box大小越界
+    """
+    while start + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", buf, start)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", buf, start + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header or start + size > end:
+            raise ValueError("box '%s' 越界" % kind)
+        yield kind, start + header, start + size
+        start += size
+
+def _find_box(buf: _Buffer, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    """按类型路径逐层查找首个匹配的box, 返回其内容的(起点, 终点)"""
+    for kind in path:
+        for box_kind, start, box_end in _iter_boxes(buf, start, end):
+            if box_kind == kind:
+                end = box_end
+                break
+        else:
+            return None
+    return start, end
+
+def _read_full_box(buf: _Buffer, start: int, v0: Tuple[int, str], v1: Tuple[int, str]) -> Tuple[int, ...]:
+    """读取FullBox中随版本号改变位置或宽度的字段, `v0`/`v1`分别为两个版本下字段相对于版本号之后的(偏移, 格式)"""
+    offset, fmt = v1 if buf[start] == 1 else v0
+    return struct.unpack_from(fmt, buf, start + 4 + offset)
+
+def _probe_mp4(buf: _Buffer) -> Optional[Media_tracks]:
+    moov = _find_box(buf, 0, len(buf), b"moov")
+    if moov is None or _find_box(buf, *moov, b"mvex") is not None:
+        return None  # 分片MP4的时长在各分片中, 交给mediainfo
+    mvhd = _find_box(buf, *moov, b"mvhd")
+    if mvhd is None:
+        return None
+    timescale, = _read_full_box(buf, mvhd[0], (8, ">I"), (16, ">I"))
+    if timescale == 0:
+        return None
+
+    tracks = Media_tracks()
+    for kind, start, end in _iter_boxes(buf, *moov):
+        if kind != b"trak":
+            continue
+        tkhd = _find_box(buf, start, end, b"tkhd")
+        hdlr = _find_box(buf, start, end, b"mdia", b"hdlr")
+        if tkhd is None or hdlr is None:
+            return None
+        # 与mediainfo一致, 轨道时长取自tkhd(以mvhd的时间单位表示)
+        duration, = _read_full_box(buf, tkhd[0], (16, ">I"), (24, ">Q"))
+        if duration == 0 or duration in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+            return None
+        handler = bytes(buf[hdlr[0] + 8:hdlr[0] + 12])
+
+        if handler == b"vide" and tracks.video is None:
+            stsd = _find_box(buf, start, end, b"mdia", b"minf", b"stbl", b"stsd")
+            if stsd is None or stsd[1] - stsd[0] < 8 + 8 + 28:
+                return None
+            # 视觉样本描述中的编码宽高: 8字节box头后跟24字节保留字段
+            width, height = struct.unpack_from(">HH", buf, stsd[0] + 8 + 8 + 24)
+            if width == 0 or height == 0:
+                return None
+            tracks.video = (width, height, _ms_to_us(duration, timescale))
+        elif handler == b"soun" and tracks.audio_duration is None:
+            tracks.audio_duration = _ms_to_us(duration, timescale)
+    return tracks
+
+_WAV_PCM_FORMATS = (0x0001, 0x0003)
+"""时长可直接由数据大小算出的WAV编码: 整数及浮点PCM"""
+
+def _probe_wav(buf: _Buffer) -> Optional[Media_tracks]:
+    fmt: Optional[Tuple[int, ...]] = None
+    data_size: Optional[int] = None
+    start = 12
+    while start + 8 <= len(buf) and data_size is None:
+        kind, size = struct.unpack_from("<4sI", buf, start)
+        if kind == b"fmt ":
+            fmt = struct.unpack_from("<HHIIH", buf, start + 8)
+            if fmt[0] == 0xFFFE:  # WAVE_FORMAT_EXTENSIBLE, 实际编码在子格式GUID的前两字节
+                fmt = (struct.unpack_from("<H", buf, start + 8 + 24)[0],) + fmt[1:]
+        elif kind == b"data":
+            data_size = size
+            if start + 8 + size > len(buf):
+                return None  # 数据块大小无效(如录制中断的文件), 交给mediainfo
+        start += 8 + size + (size & 1)
+
+    if fmt is None or data_size is None:
+        return None
+    format_tag, _, sample_rate, byte_rate, block_align = fmt
+    if format_tag not in _WAV_PCM_FORMATS or byte_rate == 0 or byte_rate != sample_rate * block_align:
+        return None
+    return Media_tracks(audio_duration=_ms_to_us(data_size, byte_rate))
+
+def _probe_png(buf: _Buffer) -> Optional[Media_tracks]:
+    if buf[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack_from(">II", buf, 16)
+    return Media_tracks(image=(width, height))
+
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xD9)])
+"""不带长度字段的JPEG标记"""
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+"""帧头(SOF)标记, 排除了同一范围内的DHT, JPG及DAC"""
+
+def _probe_jpeg(buf: _Buffer) -> Optional[Media_tracks]:
+    start = 2
+    while start + 4 <= len(buf):
+        if buf[start] != 0xFF:
+            return None
+        marker = buf[start + 1]
+        if marker == 0xFF:  # 填充字节
+            start += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            start += 2
+            continue
+        if marker == 0xDA:  # 在帧头之前就开始了扫描数据
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack_from(">HH", buf, start + 5)
+            return Media_tracks(image=(width, height))
+        start += 2 + struct.unpack_from(">H", buf, start + 2)[0]
+    return None
+
+def _skip_sub_blocks(buf: _Buffer, start: int) -> int:
+    """跳过GIF的一串数据子块, 返回其后的位置"""
+    while True:
+        size = buf[start]
+        start += 1 + size
+        if size == 0:
+            return start
+
+def _probe_gif(buf: _Buffer) -> Optional[Media_tracks]:
+    width, height, flags = struct.unpack_from("<HHB", buf, 6)
+    start = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+
+    first_delay: Optional[int] = None
+    frames = 0
+    while True:
+        block = buf[start]
+        if block == 0x3B:  # 文件结尾
+            break
+        elif block == 0x21:  # 扩展块
+            if buf[start + 1] == 0xF9 and frames == 0 and buf[start + 2] >= 4:  # 图形控制扩展中的帧延时, 单位为1/100秒
+                first_delay = struct.unpack_from("<H", buf, start + 4)[0]
+            start = _skip_sub_blocks(buf, start + 2)
+        elif block == 0x2C:  # 图像描述符, 其后为局部颜色表及图像数据
+            packed = buf[start + 9]
+            start += 10 + (3 << ((packed & 7) + 1) if packed & 0x80 else 0)
+            start = _skip_sub_blocks(buf, start + 1)
+            frames += 1
+        else:
+            return None
+
+    if frames == 0:
+        return None
+    gif_duration = None if first_delay is None else first_delay * 10 * frames * 1000
+    return Media_tracks(image=(width, height), gif_duration=gif_duration)
+
+def _probe_buffer(buf: _Buffer) -> Optional[Media_tracks]:
+    head = bytes(buf[:12])
+    if head[4:8] in (b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"):
+        return _probe_mp4(buf)
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return _probe_wav(buf)
+    if head[:8] == b"\x89PNG\r\n\x1a\n":
+        return _probe_png(buf)
+    if head[:3] == b"\xff\xd8\xff":
+        return _probe_jpeg(buf)
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return _probe_gif(buf)
+    return None
+
+def probe_header(path: str) -> Optional[Media_tracks]:
+    """只解析文件头部获取轨道信息, 支持MP4/MOV、WAV、PNG、JPEG及GIF
+
+    Returns:
+        轨道信息; 文件格式不受支持、文件已损坏或无法确定与mediainfo结果一致时返回None
+
+    Raises:
+        `FileNotFoundError`: 文件不存在
+    """
+    with open(path, "rb") as file:
+        try:
+            buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            return None
+        try:
+            return _probe_buffer(buf)
+        except (struct.error, IndexError, ValueError):
+            return None
+        finally:
+            buf.close()
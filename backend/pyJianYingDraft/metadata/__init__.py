@@ -1,14 +1,33 @@
-"""记录各种特效/音效/滤镜等的元数据"""
+"""记录各种特效/音效/滤镜等的元数据
 
-from .animation_meta import Intro_type, Outro_type, Group_animation_type
-from .animation_meta import Text_intro, Text_outro, Text_loop_anim
-from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .effect_meta import Effect_meta, Effect_param_instance
-from .filter_meta import Filter_type
-from .font_meta import Font_type
-from .mask_meta import Mask_type, Mask_meta
-from .transition_meta import Transition_type
-from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
+各元数据枚举类在首次访问时才加载, 一般为预先构建的元数据目录的轻量视图, 详见`catalog`模块
+"""
+
+from typing import Any, List, TYPE_CHECKING
+
+from .catalog import ENUM_MODULES, enum_type
+from .effect_meta import Effect_meta, Effect_param_instance, Mask_meta
+from .effect_search import search
+
+if TYPE_CHECKING:
+    from .animation_meta import Intro_type, Outro_type, Group_animation_type
+    from .animation_meta import Text_intro, Text_outro, Text_loop_anim
+    from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .filter_meta import Filter_type
+    from .font_meta import Font_type
+    from .mask_meta import Mask_type
+    from .transition_meta import Transition_type
+    from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
+
+def __getattr__(name: str) -> Any:
+    if name not in ENUM_MODULES:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = enum_type(name)
+    globals()[name] = value  # 缓存, 此后不再经过`__getattr__`
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(ENUM_MODULES))
 
 __all__ = [
     "Effect_meta",
@@ -28,5 +47,6 @@ __all__ = [
     "Tone_effect_type",
     "Speech_to_song_type",
     "Video_scene_effect_type",
-    "Video_character_effect_type"
+    "Video_character_effect_type",
+    "search"
 ]
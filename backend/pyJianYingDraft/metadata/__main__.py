@@ -0,0 +1,13 @@
+"""由各`*_meta`源模块构建元数据目录, 修改源模块后应重新运行
+
+运行方式(在backend目录下): python -m pyJianYingDraft.metadata [目录文件路径]
+"""
+
+import os
+import sys
+
+from .catalog import CATALOG_PATH, build_catalog
+
+path = sys.argv[1] if len(sys.argv) > 1 else CATALOG_PATH
+counts = build_catalog(path)
+print("已写入 %s: %d 个枚举类, %d 个成员, %.1f KB" % (path, len(counts), sum(counts.values()), os.path.getsize(path) / 1024))
@@ -1,22 +1,6 @@
 from .effect_meta import Effect_enum
-
-class Animation_meta:
-    title: str
-    is_vip: bool
-    duration: int
-    """效果默认时长, 单位为微秒"""
-
-    resource_id: str
-    effect_id: str
-    md5: str
-
-    def __init__(self, title: str, is_vip: bool, duration: float, resource_id: str, effect_id: str, md5: str):
-        self.title = title
-        self.is_vip = is_vip
-        self.duration = int(round(duration * 1e6))
-        self.resource_id = resource_id
-        self.effect_id = effect_id
-        self.md5 = md5
+from .effect_meta import Animation_meta
+from .catalog import publish
 
 class Intro_type(Effect_enum):
     """剪映自带的视频/图片入场动画类型"""
@@ -687,3 +671,5 @@ class Text_loop_anim(Effect_enum):
     随机弹跳    = Animation_meta("随机弹跳", True, 0.0, "7045150354672980516", "1644538", "8656e9848f862adf1adfa30c26113a80")
     颤抖_II     = Animation_meta("颤抖 II", True, 0.0, "6986920909927879199", "1446098", "8d180f0ad5ff173a44f9142baeee536c")
     飘起        = Animation_meta("飘起", True, 0.0, "7211060597352305189", "10749797", "1ab6d9a8761c108da6989633b933647e")
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
@@ -1,5 +1,6 @@
 from .effect_meta import Effect_enum
 from .effect_meta import Effect_meta, Effect_param
+from .catalog import publish
 
 class Tone_effect_type(Effect_enum):
     """剪映自带的音频“音色”效果类型"""
@@ -365,3 +366,5 @@ class Speech_to_song_type(Effect_enum):
     爵士        = Effect_meta("爵士", True, "7264413578860433978", "20120940", "8dd8889045e6c065177df791ddb3dfb8", [])
     节奏蓝调    = Effect_meta("节奏蓝调", True, "7252918101958726200", "17345046", "8dd8889045e6c065177df791ddb3dfb8", [])
     雷鬼        = Effect_meta("雷鬼", True, "7264413386962637368", "20120864", "8dd8889045e6c065177df791ddb3dfb8", [])
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
@@ -0,0 +1,404 @@
+"""元数据目录: 将各`*_meta`模块中的枚举表预先编译为紧凑的索引文件, 运行时按需读取
+
+`*_meta`模块中定义的枚举类是元数据的来源, 也供IDE及类型检查器使用. 构建步骤(`python -m pyJianYingDraft.metadata`)
+将其中全部成员序列化为`catalog.bin`, 此后`pyJianYingDraft.metadata`中的枚举类即为该文件的轻量视图:
+首次访问某个枚举类时只读取它的成员名表, 成员的元数据在首次访问`value`时才从文件中解码.
+若目录文件不存在, 或某个源模块在构建目录后被修改过, 则相应的枚举类回退为源模块中定义的`Enum`.
+源模块被导入时会通过`publish`将其中的同名属性替换为上述枚举类, 因此每个元数据枚举在运行时只有一个类.
+
+文件格式(整数均为小端序):
+    - 8字节魔数`PJYMETA1`及4字节的头部长度, 随后是UTF-8编码的JSON头部
+      `{"modules": {模块名: [源文件大小, CRC32]}, "enums": {枚举类名: [模块名, 元数据类型, 文档字符串, 成员表偏移, 成员表长度]}}`
+    - 数据区, 其中的偏移量均相对于数据区开头. 每个枚举类先依次存放各成员的记录(按`_RECORD_FIELDS`中的顺序排列的
+      属性值组成的JSON数组), 再存放成员表`[[成员名, ...], [记录偏移, ...]]`, 记录偏移比成员多一个, 作为最后一条记录的结尾
+"""
+
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Type
+
+from .. import json_backend
+from .effect_meta import Effect_lookup, Effect_meta, Effect_param, Animation_meta, Transition_meta, Mask_meta
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.bin")
+"""默认的目录文件路径"""
+
+ENUM_MODULES: Dict[str, str] = {
+    "Filter_type": "filter_meta",
+    "Font_type": "font_meta",
+    "Mask_type": "mask_meta",
+    "Transition_type": "transition_meta",
+    "Intro_type": "animation_meta",
+    "Outro_type": "animation_meta",
+    "Group_animation_type": "animation_meta",
+    "Text_intro": "animation_meta",
+    "Text_outro": "animation_meta",
+    "Text_loop_anim": "animation_meta",
+    "Audio_scene_effect_type": "audio_effect_meta",
+    "Tone_effect_type": "audio_effect_meta",
+    "Speech_to_song_type": "audio_effect_meta",
+    "Video_scene_effect_type": "video_effect_meta",
+    "Video_character_effect_type": "video_effect_meta",
+}
+"""全部元数据枚举类及其所在的源模块"""
+
+_MAGIC = b"PJYMETA1"
+_PREAMBLE = struct.Struct("<8sI")
+
+_RECORD_FIELDS: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "effect": (Effect_meta, ("name", "is_vip", "resource_id", "effect_id", "md5", "params")),
+    "animation": (Animation_meta, ("title", "is_vip", "duration", "resource_id", "effect_id", "md5")),
+    "transition": (Transition_meta, ("name", "is_vip", "resource_id", "effect_id", "md5", "default_duration", "is_overlap")),
+    "mask": (Mask_meta, ("name", "resource_type", "resource_id", "effect_id", "md5", "default_aspect_ratio")),
+}
+"""各类元数据在记录中保存的属性, 记录即为按此顺序排列的属性值"""
+
+_PARAM_FIELDS = ("name", "default_value", "min_value", "max_value")
+"""`Effect_param`在记录中保存的属性"""
+
+_lock = threading.RLock()
+"""保护目录的打开、视图类的创建及成员元数据的解码, 可重入以便在持有锁时导入源模块"""
+
+def _encode_record(kind: str, meta: Any) -> bytes:
+    """将一个元数据对象编码为一条记录
+
+    Raises:
+        `ValueError`: 元数据对象的属性与`_RECORD_FIELDS`中记录的不一致
+    """
+    fields = _RECORD_FIELDS[kind][1]
+    if set(vars(meta)) != set(fields):
+        raise ValueError("%s 的属性 %s 与目录记录的属性 %s 不一致" % (type(meta).__name__, sorted(vars(meta)), fields))
+    record = [getattr(meta, field) for field in fields]
+    if kind == "effect":
+        record[-1] = [[getattr(param, field) for field in _PARAM_FIELDS] for param in meta.params]
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _decode_record(kind: str, record: List[Any]) -> Any:
+    """由一条记录重建元数据对象, 其属性与源模块中构造的对象完全相同
+
+    字符串均被驻留, 使各成员间大量重复的参数名、md5等只保存一份, 与源模块中共享的字符串常量相当
+    """
+    meta_class, fields = _RECORD_FIELDS[kind]
+    meta = meta_class.__new__(meta_class)
+    for field, value in zip(fields, record):  # 逐个赋值以使用共享键的实例字典, 与构造函数的效果相同
+        setattr(meta, field, sys.intern(value) if isinstance(value, str) else value)
+    if kind == "effect":
+        meta.params = [Effect_param(sys.intern(name), *values) for name, *values in meta.params]
+    return meta
+
+def _source_signature(module_name: str) -> Optional[List[int]]:
+    """源模块文件的大小及CRC32, 源文件不存在(例如只发布了字节码)时返回None"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), module_name + ".py")
+    try:
+        with open(path, "rb") as file:
+            content = file.read()
+    except FileNotFoundError:
+        return None
+    return [len(content), zlib.crc32(content)]
+
+class Catalog_enum_type(type):
+    """元数据目录中枚举视图类的元类, 提供与`Enum`一致的类级接口: 迭代、按名称索引、`__members__`等"""
+
+    _member_map_: Dict[str, Any]
+    _member_list_: Tuple[Any, ...]
+
+    def __getattr__(cls, name: str) -> Any:
+        """按名称访问成员, 成员不作为类属性保存以节省内存"""
+        try:
+            return cls.__dict__["_member_map_"][name]
+        except KeyError:
+            raise AttributeError("type object %r has no attribute %r" % (cls.__name__, name)) from None
+
+    def __dir__(cls) -> List[str]:
+        return sorted(set(super().__dir__()) | set(cls._member_map_))
+
+    def __iter__(cls) -> Iterator[Any]:
+        return iter(cls._member_list_)
+
+    def __reversed__(cls) -> Iterator[Any]:
+        return reversed(cls._member_list_)
+
+    def __len__(cls) -> int:
+        return len(cls._member_list_)
+
+    def __bool__(cls) -> bool:
+        return True
+
+    def __contains__(cls, member: object) -> bool:
+        return isinstance(member, cls)
+
+    def __getitem__(cls, name: str) -> Any:
+        return cls._member_map_[name]
+
+    def __call__(cls, value: Any) -> Any:
+        """与`Enum`相同, 按元数据对象查找成员"""
+        for member in cls._member_list_:
+            if member.value is value or member.value == value:
+                return member
+        raise ValueError("%r is not a valid %s" % (value, cls.__qualname__))
+
+    @property
+    def __members__(cls) -> Mapping[str, Any]:
+        return MappingProxyType(cls._member_map_)
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        if name in cls.__dict__.get("_member_map_", ()):
+            raise AttributeError("cannot reassign member %r" % name)
+        super().__setattr__(name, value)
+
+    def __delattr__(cls, name: str) -> None:
+        if name in cls.__dict__.get("_member_map_", ()):
+            raise AttributeError("cannot delete member %r" % name)
+        super().__delattr__(name)
+
+    def __repr__(cls) -> str:
+        return "<enum %r>" % cls.__name__
+
+class Catalog_enum(Effect_lookup, metaclass=Catalog_enum_type):
+    """元数据目录中枚举视图类的基类, 其成员的用法与`Effect_enum`的成员相同"""
+
+    __slots__ = ("_name_", "_index_", "_value_")
+
+    _member_map_: Dict[str, "Catalog_enum"] = {}
+    """成员名到成员的映射"""
+    _member_list_: Tuple["Catalog_enum", ...] = ()
+    """按定义顺序排列的全部成员"""
+    _catalog_: "Metadata_catalog"
+    """成员的元数据所在的目录"""
+    _kind_: str
+    """元数据类型, 即`_RECORD_FIELDS`中的键"""
+    _offsets_: "array[int]"
+    """各成员记录在数据区中的偏移, 比成员多一个"""
+
+    _name_: str
+    _index_: int
+    _value_: Any
+
+    @property
+    def name(self) -> str:
+        """成员名"""
+        return self._name_
+
+    @property
+    def value(self) -> Any:
+        """成员的元数据, 在首次访问时从目录文件中解码"""
+        value = self._value_
+        if value is None:
+            with _lock:
+                if self._value_ is None:
+                    cls = type(self)
+                    start, end = cls._offsets_[self._index_], cls._offsets_[self._index_ + 1]
+                    self._value_ = _decode_record(cls._kind_, cls._catalog_.read(start, end))
+                value = self._value_
+        return value
+
+    def __repr__(self) -> str:
+        return "<%s.%s: %r>" % (type(self).__name__, self._name_, self.value)
+
+    def __str__(self) -> str:
+        return "%s.%s" % (type(self).__name__, self._name_)
+
+    def __reduce_ex__(self, protocol: Any) -> Tuple[Any, Tuple[type, str]]:
+        return getattr, (type(self), self._name_)
+
+    def __copy__(self) -> "Catalog_enum":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Catalog_enum":
+        return self
+
+class Metadata_catalog:
+    """以内存映射方式按需读取的元数据目录文件"""
+
+    path: str
+    """目录文件路径"""
+    modules: Dict[str, List[int]]
+    """构建目录时各源模块文件的大小及CRC32"""
+    enums: Dict[str, List[Any]]
+    """各枚举类的[所在模块, 元数据类型, 文档字符串, 成员表偏移, 成员表长度]"""
+
+    def __init__(self, path: str = CATALOG_PATH):
+        """打开目录文件并读取其头部
+
+        Raises:
+            `FileNotFoundError`: 文件不存在
+            `ValueError`: 文件不是有效的元数据目录
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self._buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # 空文件无法映射
+                raise ValueError("元数据目录 '%s' 为空" % path)
+
+        if len(self._buf) < _PREAMBLE.size or self._buf[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError("'%s' 不是有效的元数据目录" % path)
+        header_size = _PREAMBLE.unpack_from(self._buf)[1]
+        self._data_start = _PREAMBLE.size + header_size
+        header = json_backend.loads(self._buf[_PREAMBLE.size:self._data_start])
+        self.modules = header["modules"]
+        self.enums = header["enums"]
+        self._current: Dict[str, bool] = {}
+
+    def close(self) -> None:
+        """释放内存映射"""
+        self._buf.close()
+
+    def read(self, start: int, end: int) -> Any:
+        """解析数据区中`[start, end)`范围内的JSON"""
+        return json_backend.loads(self._buf[self._data_start + start:self._data_start + end])
+
+    def is_current(self, module_name: str) -> bool:
+        """指定源模块自构建目录以来是否未被修改, 源文件不存在时视为未修改"""
+        current = self._current.get(module_name)
+        if current is None:
+            signature = _source_signature(module_name)
+            current = signature is None or signature == self.modules.get(module_name)
+            self._current[module_name] = current
+        return current
+
+    def load_enum(self, enum_name: str) -> Type[Catalog_enum]:
+        """读取指定枚举类的成员表, 创建相应的视图类
+
+        Raises:
+            `KeyError`: 目录中没有该枚举类
+        """
+        _, kind, doc, start, length = self.enums[enum_name]
+        names, offsets = self.read(start, start + length)
+        cls = Catalog_enum_type(enum_name, (Catalog_enum,), {
+            "__module__": __package__, "__qualname__": enum_name, "__doc__": doc, "__slots__": (),
+            "_catalog_": self, "_kind_": kind, "_offsets_": array("q", offsets),
+        })
+        members: Dict[str, Catalog_enum] = {}
+        for index, name in enumerate(names):
+            member = object.__new__(cls)
+            member._name_, member._index_, member._value_ = name, index, None
+            members[name] = member
+        type.__setattr__(cls, "_member_map_", members)
+        type.__setattr__(cls, "_member_list_", tuple(members.values()))
+        return cls
+
+_catalog: Optional[Metadata_catalog] = None
+_catalog_opened = False
+_enum_types: Dict[str, type] = {}
+"""已加载的枚举类, 可能是目录中的视图类, 也可能是源模块中的`Enum`"""
+_source_enums: Dict[str, type] = {}
+"""源模块中定义的`Enum`, 由`publish`在源模块导入时登记"""
+
+def get_catalog() -> Optional[Metadata_catalog]:
+    """默认的元数据目录, 在首次调用时打开, 目录文件不存在或无效时返回None"""
+    global _catalog, _catalog_opened
+    if not _catalog_opened:
+        try:
+            _catalog = Metadata_catalog()
+        except (FileNotFoundError, ValueError):
+            _catalog = None
+        _catalog_opened = True
+    return _catalog
+
+def enum_type(enum_name: str) -> type:
+    """获取指定的元数据枚举类
+
+    若元数据目录可用, 且该枚举类所在的源模块自构建目录以来未被修改, 则返回目录中的视图类, 否则导入源模块并返回其中的`Enum`.
+
+    Raises:
+        `KeyError`: 不存在该元数据枚举类
+    """
+    cls = _enum_types.get(enum_name)
+    if cls is not None:
+        return cls
+
+    module_name = ENUM_MODULES[enum_name]
+    with _lock:
+        cls = _enum_types.get(enum_name)
+        if cls is None:
+            catalog = get_catalog()
+            if catalog is not None and enum_name in catalog.enums and catalog.is_current(module_name):
+                cls = catalog.load_enum(enum_name)
+            else:
+                cls = source_enum(enum_name)
+            _enum_types[enum_name] = cls
+    return cls
+
+def source_enum(enum_name: str) -> type:
+    """获取源模块中定义的元数据枚举类(`Enum`), 必要时导入源模块
+
+    Raises:
+        `KeyError`: 不存在该元数据枚举类
+    """
+    cls = _source_enums.get(enum_name)
+    if cls is None:
+        importlib.import_module("." + ENUM_MODULES[enum_name], __package__)
+        cls = _source_enums[enum_name]
+    return cls
+
+def publish(namespace: Dict[str, Any]) -> None:
+    """在源模块末尾调用: 登记其中定义的枚举类, 并将模块中的同名属性替换为`enum_type`返回的类
+
+    这样无论从`pyJianYingDraft.metadata`还是从源模块获取, 得到的都是同一个枚举类, 其成员也可以互换使用
+    """
+    module_name = namespace["__name__"].rpartition(".")[2]
+    enum_names = [enum_name for enum_name, name in ENUM_MODULES.items() if name == module_name]
+    for enum_name in enum_names:
+        _source_enums[enum_name] = namespace[enum_name]
+    for enum_name in enum_names:
+        namespace[enum_name] = enum_type(enum_name)
+
+def build_catalog(path: str = CATALOG_PATH) -> Dict[str, int]:
+    """由各源模块中的枚举类构建元数据目录文件, 已存在的文件将被替换
+
+    Args:
+        path (`str`, optional): 目录文件路径, 默认为`CATALOG_PATH`
+
+    Returns:
+        `Dict[str, int]`: 各枚举类的成员数量
+
+    Raises:
+        `ValueError`: 某个枚举类的成员无法存入目录, 例如包含别名、元数据类型不一致或成员名与视图类的属性冲突
+    """
+    modules: Dict[str, Optional[List[int]]] = {}
+    enums: Dict[str, List[Any]] = {}
+    counts: Dict[str, int] = {}
+    data = bytearray()
+    for enum_name, module_name in ENUM_MODULES.items():
+        source = source_enum(enum_name)
+        modules[module_name] = _source_signature(module_name)
+
+        members = list(source)
+        if len(members) != len(source.__members__):
+            raise ValueError("%s 包含别名成员, 无法存入目录" % enum_name)
+        kinds = {kind for kind, (meta_class, _) in _RECORD_FIELDS.items()
+                 if all(type(member.value) is meta_class for member in members)}
+        if len(kinds) != 1:
+            raise ValueError("%s 的成员不是同一种已知的元数据类型" % enum_name)
+        kind = kinds.pop()
+
+        offsets = [len(data)]
+        for member in members:
+            if hasattr(Catalog_enum, member.name):
+                raise ValueError("%s 的成员名 %r 与视图类的属性冲突" % (enum_name, member.name))
+            data += _encode_record(kind, member.value)
+            offsets.append(len(data))
+        table = json.dumps([[member.name for member in members], offsets],
+                           ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        enums[enum_name] = [module_name, kind, source.__dict__.get("__doc__"), len(data), len(table)]
+        data += table
+        counts[enum_name] = len(members)
+
+    header = json.dumps({"modules": modules, "enums": enums}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_PREAMBLE.pack(_MAGIC, len(header)))
+        file.write(header)
+        file.write(data)
+    os.replace(temp_path, path)
+    return counts
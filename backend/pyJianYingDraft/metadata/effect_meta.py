@@ -1,6 +1,6 @@
 from enum import Enum
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from typing import TypeVar, Optional
 
 class Effect_param:
@@ -34,6 +34,9 @@ class Effect_param_instance(Effect_param):
         self.index = index
         self.value = value
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.name, self.default_value, self.min_value, self.max_value, self.index, self.value)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "default_value": self.default_value,
@@ -86,11 +89,94 @@ class Effect_meta:
             ret.append(Effect_param_instance(param, i, val))
         return ret
 
+class Animation_meta:
+    title: str
+    is_vip: bool
+    duration: int
+    """效果默认时长, 单位为微秒"""
 
-Effect_enum_subclass = TypeVar("Effect_enum_subclass", bound="Effect_enum")
+    resource_id: str
+    effect_id: str
+    md5: str
 
-class Effect_enum(Enum):
-    """特效枚举基类, 提供一个`from_name`方法用于根据名称获取特效元数据"""
+    def __init__(self, title: str, is_vip: bool, duration: float, resource_id: str, effect_id: str, md5: str):
+        self.title = title
+        self.is_vip = is_vip
+        self.duration = int(round(duration * 1e6))
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+class Transition_meta:
+    """转场元数据"""
+
+    name: str
+    """转场名称"""
+    is_vip: bool
+    """是否为VIP特权"""
+
+    resource_id: str
+    """资源ID"""
+    effect_id: str
+    """效果ID"""
+    md5: str
+
+    default_duration: int
+    """默认持续时间, 单位为微秒"""
+    is_overlap: bool
+    """是否允许重叠(?)"""
+
+    def __init__(self, name: str, is_vip: bool, resource_id: str, effect_id: str, md5: str, default_duration: float, is_overlap: bool):
+        self.name = name
+        self.is_vip = is_vip
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+        self.default_duration = int(round(default_duration * 1e6))
+        self.is_overlap = is_overlap
+
+class Mask_meta:
+    """蒙版元数据"""
+
+    name: str
+    """转场名称"""
+
+    resource_type: str
+    """资源类型, 与蒙版形状相关"""
+
+    resource_id: str
+    """资源ID"""
+    effect_id: str
+    """效果ID"""
+    md5: str
+
+    default_aspect_ratio: float
+    """默认宽高比(宽高都是相对素材的比例)"""
+
+    def __init__(self, name: str, resource_type: str, resource_id: str, effect_id: str, md5: str, default_aspect_ratio: float):
+        self.name = name
+        self.resource_type = resource_type
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+        self.default_aspect_ratio = default_aspect_ratio
+
+
+Effect_enum_subclass = TypeVar("Effect_enum_subclass", bound="Effect_lookup")
+
+def normalize_name(name: str) -> str:
+    """名称的规范形式: 忽略大小写、空格和下划线"""
+    return name.lower().replace(" ", "").replace("_", "")
+
+_name_indexes: Dict[type, Dict[str, Any]] = {}
+"""各枚举类的规范化名称到成员的映射, 在首次查找时建立"""
+
+class Effect_lookup:
+    """按名称查找枚举成员的类方法, 由`Effect_enum`及元数据目录中的枚举视图类共用"""
+
+    __slots__ = ()
 
     @classmethod
     def from_name(cls: "type[Effect_enum_subclass]", name: str) -> Effect_enum_subclass:
@@ -102,8 +188,29 @@ class Effect_enum(Enum):
         Raises:
             `ValueError`: 特效名称不存在
         """
-        name = name.lower().replace(" ", "").replace("_", "")
-        for effect in cls:
-            if effect.name.lower().replace(" ", "").replace("_", "") == name:
-                return effect
-        raise ValueError(f"Effect named '{name}' not found")
+        index = _name_indexes.get(cls)
+        if index is None:
+            index = {}
+            for effect in cls:
+                index.setdefault(normalize_name(effect.name), effect)
+            _name_indexes[cls] = index
+
+        name = normalize_name(name)
+        effect = index.get(name)
+        if effect is None:
+            raise ValueError(f"Effect named '{name}' not found")
+        return effect
+
+    @classmethod
+    def search(cls: "type[Effect_enum_subclass]", query: str, limit: int = 10) -> List[Effect_enum_subclass]:
+        """在本枚举类中按名称搜索, 用于自动补全, 匹配规则同`metadata.search`
+
+        Args:
+            query (str): 查询字符串, 忽略大小写、空格和下划线
+            limit (int, optional): 最多返回的结果数量, 默认为10
+        """
+        from .effect_search import search
+        return search(query, limit, types=[cls])  # type: ignore
+
+class Effect_enum(Effect_lookup, Enum):
+    """特效枚举基类, 提供一个`from_name`方法用于根据名称获取特效元数据"""
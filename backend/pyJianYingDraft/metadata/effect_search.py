@@ -0,0 +1,130 @@
+"""跨全部元数据枚举的名称搜索, 用于自动补全
+
+每个枚举成员以其成员名及元数据中的显示名称(规范化后)作为搜索键. 索引在首次搜索时建立, 包括:
+按字典序排列的键(用于二分查找前缀匹配)以及字符二元组到键的倒排表(用于子串匹配).
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from .effect_meta import Effect_enum, normalize_name
+
+def all_enum_types() -> List[Type[Effect_enum]]:
+    """全部元数据枚举类"""
+    from . import Intro_type, Outro_type, Group_animation_type
+    from . import Text_intro, Text_outro, Text_loop_anim
+    from . import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from . import Filter_type, Font_type, Mask_type, Transition_type
+    from . import Video_scene_effect_type, Video_character_effect_type
+    return [Filter_type, Font_type, Mask_type, Transition_type,
+            Intro_type, Outro_type, Group_animation_type, Text_intro, Text_outro, Text_loop_anim,
+            Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type,
+            Video_scene_effect_type, Video_character_effect_type]
+
+def _display_name(effect: Effect_enum) -> Optional[str]:
+    """元数据中记录的显示名称, 动画元数据中为`title`"""
+    value = effect.value
+    return getattr(value, "name", None) or getattr(value, "title", None)
+
+class Effect_search_index:
+    """一组枚举类的名称搜索索引"""
+
+    _members: List[Effect_enum]
+    """全部枚举成员, 按枚举类及定义顺序排列"""
+    _keys: List[Tuple[str, int]]
+    """全部(规范化的搜索键, 成员序号), 按键的字典序排列"""
+    _key_texts: List[str]
+    """与`_keys`对应的搜索键, 供二分查找使用"""
+    _grams: Dict[str, List[int]]
+    """长度为1及2的子串到`_keys`下标的倒排表"""
+
+    def __init__(self, enum_types: Iterable[Type[Effect_enum]]):
+        self._members = []
+        keys: Set[Tuple[str, int]] = set()
+        for enum_type in enum_types:
+            for effect in enum_type:
+                index = len(self._members)
+                self._members.append(effect)
+                keys.add((normalize_name(effect.name), index))
+                display_name = _display_name(effect)
+                if display_name:
+                    keys.add((normalize_name(display_name), index))
+
+        self._keys = sorted(keys)
+        self._key_texts = [key for key, _ in self._keys]
+        self._grams = {}
+        for position, key in enumerate(self._key_texts):
+            grams = set(key)
+            grams.update(key[i:i + 2] for i in range(len(key) - 1))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(position)
+
+    def search(self, query: str, limit: int = 10, types: Optional[Sequence[Type[Effect_enum]]] = None) -> List[Effect_enum]:
+        """按名称搜索枚举成员, 参数及返回值含义同模块级的`search`函数"""
+        query = normalize_name(query)
+        if not query or limit <= 0:
+            return []
+
+        # 候选键: 包含查询中全部二元组(查询仅一个字符时为该字符)的键
+        grams = {query} if len(query) == 1 else {query[i:i + 2] for i in range(len(query) - 1)}
+        postings = sorted((self._grams.get(gram, []) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        # 排序依据: 完全匹配 < 前缀匹配 < 其它子串匹配, 其次为匹配位置、键长度及成员定义顺序
+        best: Dict[int, Tuple[int, int, int, int]] = {}
+        for position in candidates:
+            key, member_index = self._keys[position]
+            found = key.find(query)
+            if found < 0:
+                continue
+            if types is not None and not isinstance(self._members[member_index], tuple(types)):
+                continue
+            rank = (0 if key == query else 1 if found == 0 else 2, found, len(key), member_index)
+            if member_index not in best or rank < best[member_index]:
+                best[member_index] = rank
+        ranked = sorted(best, key=best.__getitem__)
+        return [self._members[i] for i in ranked[:limit]]
+
+    def prefix_matches(self, prefix: str) -> List[Effect_enum]:
+        """搜索键以`prefix`开头的全部成员, 按键的字典序排列"""
+        prefix = normalize_name(prefix)
+        ret: List[Effect_enum] = []
+        seen: Set[int] = set()
+        start = bisect_left(self._key_texts, prefix)
+        for key, member_index in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            if member_index not in seen:
+                seen.add(member_index)
+                ret.append(self._members[member_index])
+        return ret
+
+_index: Optional[Effect_search_index] = None
+"""覆盖全部元数据枚举的索引, 在首次搜索时建立"""
+
+def get_index() -> Effect_search_index:
+    """覆盖全部元数据枚举的搜索索引"""
+    global _index
+    if _index is None:
+        _index = Effect_search_index(all_enum_types())
+    return _index
+
+def search(query: str, limit: int = 10, *, types: Optional[Sequence[Type[Effect_enum]]] = None) -> List[Effect_enum]:
+    """在全部元数据枚举(滤镜、字体、转场、动画、特效等)中按名称搜索, 用于自动补全
+
+    成员名及元数据中的显示名称均参与匹配, 匹配时忽略大小写、空格和下划线.
+    结果按完全匹配、前缀匹配、其它子串匹配的顺序排列, 同类匹配中匹配位置靠前、名称较短者优先.
+
+    Args:
+        query (str): 查询字符串
+        limit (int, optional): 最多返回的结果数量, 默认为10
+        types (`Sequence[Type[Effect_enum]]`, optional): 仅在这些枚举类中搜索, 默认为全部
+
+    Returns:
+        `List[Effect_enum]`: 匹配的枚举成员, 可通过`type(member)`得知其所属的枚举类
+    """
+    return get_index().search(query, limit, types)
@@ -2,6 +2,7 @@
 
 from .effect_meta import Effect_enum
 from .effect_meta import Effect_meta, Effect_param
+from .catalog import publish
 
 class Filter_type(Effect_enum):
     """剪映自带的滤镜效果类型
@@ -601,3 +602,5 @@ class Filter_type(Effect_enum):
                               Effect_param("effects_adjust_filter", 1.000, 0.000, 1.000)])
     """滤镜强度可调"""
     龙舌兰      = Effect_meta("龙舌兰", True, "7252674245396942139", "7252674245396942139", "254083154fd15d41d41cc3763eda9f40", [])
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
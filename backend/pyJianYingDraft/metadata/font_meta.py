@@ -2,6 +2,7 @@
 
 from .effect_meta import Effect_enum
 from .effect_meta import Effect_meta
+from .catalog import publish
 
 class Font_type(Effect_enum):
     CC_Captial          = Effect_meta("CC-Captial", True, "7418508570066424330", "84086581", "8ba811d327acd1516615259819da72a2")
@@ -339,3 +340,5 @@ class Font_type(Effect_enum):
     青鸟华光黑变        = Effect_meta("青鸟华光黑变", True, "7410326723322991154", "81332672", "6ca836ce90531a01adfd2909d6d119e3")
     高字标志圆          = Effect_meta("高字标志圆", True, "7312720780599497225", "34549540", "b063783985f84f53748319de1532b926")
     鱼太闲躺平体        = Effect_meta("鱼太闲躺平体", True, "7312720611694875162", "34549531", "928979b4f0c9ba5ac430fc2990d0ea9d")
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
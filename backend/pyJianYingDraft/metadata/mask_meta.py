@@ -1,33 +1,8 @@
 """视频蒙版元数据"""
 
 from .effect_meta import Effect_enum
-
-class Mask_meta:
-    """蒙版元数据"""
-
-    name: str
-    """转场名称"""
-
-    resource_type: str
-    """资源类型, 与蒙版形状相关"""
-
-    resource_id: str
-    """资源ID"""
-    effect_id: str
-    """效果ID"""
-    md5: str
-
-    default_aspect_ratio: float
-    """默认宽高比(宽高都是相对素材的比例)"""
-
-    def __init__(self, name: str, resource_type: str, resource_id: str, effect_id: str, md5: str, default_aspect_ratio: float):
-        self.name = name
-        self.resource_type = resource_type
-        self.resource_id = resource_id
-        self.effect_id = effect_id
-        self.md5 = md5
-
-        self.default_aspect_ratio = default_aspect_ratio
+from .effect_meta import Mask_meta
+from .catalog import publish
 
 class Mask_type(Effect_enum):
     """蒙版类型"""
@@ -40,3 +15,5 @@ class Mask_type(Effect_enum):
     矩形 = Mask_meta("矩形", "rectangle", "6791700809454195207", "636077", "ef361d96c456cd6077c76d737f98898d", 1.0)
     爱心 = Mask_meta("爱心", "geometric_shape", "6794051276482023949", "636079", "0bf09fa1e3a32464fed4f71e49a8ab01", 1.115)
     星形 = Mask_meta("星形", "geometric_shape", "6794051169434997255", "636081", "155612dee601d3f5422a3fbeabc7610c", 1.05)
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
@@ -1,35 +1,8 @@
 """转场效果元数据"""
 
 from .effect_meta import Effect_enum
-
-class Transition_meta:
-    """转场元数据"""
-
-    name: str
-    """转场名称"""
-    is_vip: bool
-    """是否为VIP特权"""
-
-    resource_id: str
-    """资源ID"""
-    effect_id: str
-    """效果ID"""
-    md5: str
-
-    default_duration: int
-    """默认持续时间, 单位为微秒"""
-    is_overlap: bool
-    """是否允许重叠(?)"""
-
-    def __init__(self, name: str, is_vip: bool, resource_id: str, effect_id: str, md5: str, default_duration: float, is_overlap: bool):
-        self.name = name
-        self.is_vip = is_vip
-        self.resource_id = resource_id
-        self.effect_id = effect_id
-        self.md5 = md5
-
-        self.default_duration = int(round(default_duration * 1e6))
-        self.is_overlap = is_overlap
+from .effect_meta import Transition_meta
+from .catalog import publish
 
 class Transition_type(Effect_enum):
     """转场类型"""
@@ -760,3 +733,5 @@ class Transition_type(Effect_enum):
     """默认时长: 0.70s"""
     黑色反转片  = Transition_meta("黑色反转片", True, "7202075814085530149", "9683173", "8e31bcdedda0fe123ad1a71a967ecaa1", 0.800000, True)
     """默认时长: 0.80s"""
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
@@ -2,6 +2,7 @@
 
 from .effect_meta import Effect_enum
 from .effect_meta import Effect_meta, Effect_param
+from .catalog import publish
 
 class Video_scene_effect_type(Effect_enum):
     """剪映自带的画面特效类型"""
@@ -9617,3 +9618,5 @@ class Video_character_effect_type(Effect_enum):
         - effects_adjust_speed: 默认0.50, 0.00 ~ 1.00
         - effects_adjust_filter: 默认0.50, 0.00 ~ 1.00
     """
+
+publish(globals())  # 以元数据目录中的视图类替换上述枚举类, 见`catalog`模块
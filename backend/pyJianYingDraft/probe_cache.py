@@ -0,0 +1,220 @@
+"""本地素材探测结果的持久化缓存
+
+构造`Video_material`/`Audio_material`时需要探测素材的时长与尺寸, 不常见的格式还要借助mediainfo,
+对同一批素材反复生成草稿时这部分耗时可以通过缓存消除. 缓存保存在本地SQLite文件中,
+以(绝对路径, 文件大小, 修改时间, inode)判断文件是否未变, 超出容量时淘汰最久未使用的条目.
+每个线程及进程使用各自的数据库连接, 因此可由多个并行的工作线程或进程共享.
+
+缓存默认关闭, 可以调用`set_probe_cache`启用, 或通过环境变量`PYJIANYINGDRAFT_PROBE_CACHE`指定缓存文件路径
+(子进程会继承环境变量, 适用于进程池).
+"""
+
+import json
+import os
+import threading
+import time
+import warnings
+from typing import Any, Callable, Dict, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+
+Probe_result = Dict[str, Any]
+"""一次探测的结果, 如素材类型、时长及宽高, 须能以JSON表示"""
+
+ENV_VAR = "PYJIANYINGDRAFT_PROBE_CACHE"
+"""指定默认缓存文件路径的环境变量"""
+
+_TOUCH_INTERVAL_NS = 60 * 10 ** 9
+"""命中时至多每隔这么久更新一次条目的最近使用时间, 以免每次命中都要写数据库"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (path, kind)
+);
+CREATE INDEX IF NOT EXISTS probes_last_used ON probes (last_used);
+"""
+
+def _file_key(path: str) -> Tuple[int, int, int]:
+    """文件的(大小, 修改时间, inode), 任一项改变即视为文件已改变"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+class Probe_cache:
+    """保存在SQLite文件中的探测结果缓存, 可在多个线程及进程间共享"""
+
+    path: str
+    """缓存文件路径"""
+    max_entries: int
+    """最多保存的条目数, 超出时淘汰最久未使用的条目"""
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        """
+        Args:
+            path (`str`): 缓存文件路径, 不存在时自动创建
+            max_entries (`int`, optional): 最多保存的条目数, 默认为100000
+
+        Raises:
+            `ValueError`: `max_entries`不为正
+        """
+        if max_entries <= 0:
+            raise ValueError("缓存容量必须为正")
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._warned = False
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """序列化时只保留路径及容量, 数据库连接在使用时重新打开, 因此缓存对象可以传给进程池的工作进程"""
+        return Probe_cache, (self.path, self.max_entries)
+
+    def _connection(self) -> "sqlite3.Connection":
+        """当前线程的数据库连接, 在首次使用或fork后重新打开"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            import sqlite3  # 导入较慢, 在首次使用缓存时才导入
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _warn(self, error: Exception) -> None:
+        if not self._warned:
+            self._warned = True
+            warnings.warn("素材探测缓存 '%s' 不可用, 将直接探测素材: %s" % (self.path, error), RuntimeWarning, stacklevel=3)
+
+    def get(self, kind: str, path: str) -> Optional[Probe_result]:
+        """查找文件的缓存结果, 文件在缓存之后被修改过或缓存不可用时返回None
+
+        Args:
+            kind (`str`): 探测类型, 如"video"或"audio", 同一文件的不同类型分别缓存
+            path (`str`): 文件路径
+
+        Raises:
+            `FileNotFoundError`: 文件不存在
+        """
+        import sqlite3
+        path = os.path.abspath(path)
+        key = _file_key(path)
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT size, mtime_ns, inode, result, last_used FROM probes WHERE path = ? AND kind = ?",
+                               (path, kind)).fetchone()
+            if row is None or tuple(row[:3]) != key:
+                return None
+            now = time.time_ns()
+            if now - row[4] > _TOUCH_INTERVAL_NS:
+                conn.execute("UPDATE probes SET last_used = ? WHERE path = ? AND kind = ?", (now, path, kind))
+        except (sqlite3.Error, OSError) as error:
+            self._warn(error)
+            return None
+        return json.loads(row[3])
+
+    def put(self, kind: str, path: str, result: Probe_result, file_key: Optional[Tuple[int, int, int]] = None) -> None:
+        """保存文件的探测结果, 并在超出容量时淘汰最久未使用的条目
+
+        Args:
+            kind (`str`): 探测类型
+            path (`str`): 文件路径
+            result (`Probe_result`): 探测结果
+            file_key (`Tuple[int, int, int]`, optional): 探测前记录的文件(大小, 修改时间, inode). 若指定且与当前不一致,
+                说明文件在探测过程中被修改, 此时不保存结果.
+
+        Raises:
+            `FileNotFoundError`: 文件不存在
+        """
+        path = os.path.abspath(path)
+        key = _file_key(path)
+        if file_key is not None and key != file_key:
+            return
+        import sqlite3
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (path, kind, *key, json.dumps(result), time.time_ns()))
+                excess = conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    conn.execute("DELETE FROM probes WHERE rowid IN "
+                                 "(SELECT rowid FROM probes ORDER BY last_used LIMIT ?)", (excess,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError) as error:
+            self._warn(error)
+
+    def probe(self, kind: str, path: str, prober: Callable[[str], Probe_result]) -> Probe_result:
+        """返回文件的缓存结果, 未命中时调用`prober(path)`探测并保存结果
+
+        Args:
+            kind (`str`): 探测类型
+            path (`str`): 文件路径
+            prober (`Callable[[str], Probe_result]`): 探测函数, 其抛出的异常会原样传出且不会被缓存
+
+        Raises:
+            `FileNotFoundError`: 文件不存在
+        """
+        path = os.path.abspath(path)
+        result = self.get(kind, path)
+        if result is None:
+            key = _file_key(path)
+            result = prober(path)
+            self.put(kind, path, result, key)
+        return result
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._connection().execute("DELETE FROM probes")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+
+    def close(self) -> None:
+        """关闭当前线程的数据库连接, 之后再次使用时会重新打开"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+_cache: Optional[Probe_cache] = None
+_cache_configured = False
+
+def get_probe_cache() -> Optional[Probe_cache]:
+    """当前生效的探测缓存, 未启用时返回None. 若从未调用过`set_probe_cache`, 则根据环境变量`PYJIANYINGDRAFT_PROBE_CACHE`决定"""
+    global _cache, _cache_configured
+    if not _cache_configured:
+        env_path = os.environ.get(ENV_VAR)
+        _cache = Probe_cache(env_path) if env_path else None
+        _cache_configured = True
+    return _cache
+
+def set_probe_cache(cache: Union[Probe_cache, str, None]) -> None:
+    """设置全局生效的探测缓存
+
+    Args:
+        cache (`Probe_cache`, `str` or None): 缓存对象或缓存文件路径, 为None时关闭缓存
+    """
+    global _cache, _cache_configured
+    _cache = Probe_cache(cache) if isinstance(cache, str) else cache
+    _cache_configured = True
+
+def cached_probe(kind: str, path: str, prober: Callable[[str], Probe_result]) -> Probe_result:
+    """若启用了探测缓存则经由缓存探测文件, 否则直接调用`prober(path)`"""
+    cache = get_probe_cache()
+    if cache is None:
+        return prober(path)
+    return cache.probe(kind, path, prober)
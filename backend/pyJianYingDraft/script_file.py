@@ -1,16 +1,24 @@
 import json
 import math
 import os
+import shutil
+import tempfile
 from copy import deepcopy
-from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import Optional, Literal, Union, Tuple, overload
+from typing import Type, Dict, List, Any, Callable, ContextManager, Iterable, TypeVar, TextIO, TYPE_CHECKING
 
 from . import exceptions
+from . import json_backend
+from . import json_writer
 from . import util
 from .audio_segment import Audio_segment, Audio_fade, Audio_effect
+from .compiled_template import Text_slot, Material_slot, Compiled_template, Slot_filler, MISSING
 from .effect_segment import Effect_segment, Filter_segment
+from .id_factory import Id_source, use_id_factory
 from .local_materials import Video_material, Audio_material
-from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 from .segment import Base_segment, Speed, Clip_settings
 from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, Shrink_mode, \
     Extend_mode, import_track
@@ -20,55 +28,138 @@ from .track import Track_type, Base_track, Track
 from .video_segment import Video_segment, Sticker_segment, Segment_animations, Video_effect, Transition, Filter, \
     BackgroundFilling
 
+if TYPE_CHECKING:
+    # 元数据模块较大, 仅在需要时才导入
+    from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
+
+
+Material_item = TypeVar("Material_item")
+
+class Material_list(List[Material_item]):
+    """带有id索引的素材列表, 索引随列表内容自动同步
+
+    列表本身维持添加顺序(即导出顺序), 索引仅用于按id快速查找
+    """
+
+    key: Callable[[Material_item], str]
+    """从素材中取出id的函数"""
+
+    def __init__(self, key: Callable[[Material_item], str], iterable: Iterable[Material_item] = ()):
+        super().__init__(iterable)
+        self.key = key
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._index: Dict[str, Material_item] = {}
+        for item in self:
+            self._index.setdefault(self.key(item), item)
+
+    def __reduce__(self):
+        # 保证拷贝/序列化时先恢复key再填入元素
+        return (self.__class__, (self.key, list(self)))
+
+    def has_id(self, material_id: str) -> bool:
+        """列表中是否存在给定id的素材"""
+        return material_id in self._index
+
+    def get(self, material_id: str) -> Optional[Material_item]:
+        """根据id获取素材, 有重复id时返回最先加入的一个, 不存在时返回None"""
+        return self._index.get(material_id)
+
+    def append(self, item: Material_item) -> None:
+        super().append(item)
+        self._index.setdefault(self.key(item), item)
+
+    def extend(self, items: Iterable[Material_item]) -> None:
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._index.setdefault(self.key(item), item)
+
+    def __iadd__(self, items: Iterable[Material_item]) -> "Material_list[Material_item]":  # type: ignore
+        self.extend(items)
+        return self
+
+    # 以下操作可能改变重复id的先后关系, 直接重建索引
+    def insert(self, index, item: Material_item) -> None:  # type: ignore
+        super().insert(index, item)
+        self._reindex()
+
+    def remove(self, item: Material_item) -> None:
+        super().remove(item)
+        self._reindex()
+
+    def pop(self, index=-1) -> Material_item:  # type: ignore
+        item = super().pop(index)
+        self._reindex()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._index = {}
+
+    def __setitem__(self, index, value) -> None:  # type: ignore
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:  # type: ignore
+        super().__delitem__(index)
+        self._reindex()
 
 class Script_material:
     """草稿文件中的素材信息部分"""
 
-    audios: List[Audio_material]
+    audios: Material_list[Audio_material]
     """音频素材列表"""
-    videos: List[Video_material]
+    videos: Material_list[Video_material]
     """视频素材列表"""
-    stickers: List[Dict[str, Any]]
+    stickers: Material_list[Dict[str, Any]]
     """贴纸素材列表"""
-    texts: List[Dict[str, Any]]
+    texts: Material_list[Dict[str, Any]]
     """文本素材列表"""
 
-    audio_effects: List[Audio_effect]
+    audio_effects: Material_list[Audio_effect]
     """音频特效列表"""
-    audio_fades: List[Audio_fade]
+    audio_fades: Material_list[Audio_fade]
     """音频淡入淡出效果列表"""
-    animations: List[Segment_animations]
+    animations: Material_list[Segment_animations]
     """动画素材列表"""
-    video_effects: List[Video_effect]
+    video_effects: Material_list[Video_effect]
     """视频特效列表"""
 
-    speeds: List[Speed]
+    speeds: Material_list[Speed]
     """变速列表"""
-    masks: List[Dict[str, Any]]
+    masks: Material_list[Dict[str, Any]]
     """蒙版列表"""
-    transitions: List[Transition]
+    transitions: Material_list[Transition]
     """转场效果列表"""
-    filters: List[Union[Filter, TextBubble]]
+    filters: Material_list[Union[Filter, TextBubble]]
     """滤镜/文本花字/文本气泡列表, 导出到`effects`中"""
-    canvases: List[BackgroundFilling]
+    canvases: Material_list[BackgroundFilling]
     """背景填充列表"""
 
     def __init__(self):
-        self.audios = []
-        self.videos = []
-        self.stickers = []
-        self.texts = []
-
-        self.audio_effects = []
-        self.audio_fades = []
-        self.animations = []
-        self.video_effects = []
-
-        self.speeds = []
-        self.masks = []
-        self.transitions = []
-        self.filters = []
-        self.canvases = []
+        self.audios = Material_list(attrgetter("material_id"))
+        self.videos = Material_list(attrgetter("material_id"))
+        self.stickers = Material_list(itemgetter("id"))
+        self.texts = Material_list(itemgetter("id"))
+
+        self.audio_effects = Material_list(attrgetter("effect_id"))
+        self.audio_fades = Material_list(attrgetter("fade_id"))
+        self.animations = Material_list(attrgetter("animation_id"))
+        self.video_effects = Material_list(attrgetter("global_id"))
+
+        self.speeds = Material_list(attrgetter("global_id"))
+        self.masks = Material_list(itemgetter("id"))
+        self.transitions = Material_list(attrgetter("global_id"))
+        self.filters = Material_list(attrgetter("global_id"))
+        self.canvases = Material_list(attrgetter("global_id"))
+
+    @property
+    def _all_lists(self) -> List[Material_list[Any]]:
+        return [self.audios, self.videos, self.stickers, self.texts,
+                self.audio_effects, self.audio_fades, self.animations, self.video_effects,
+                self.speeds, self.masks, self.transitions, self.filters, self.canvases]
 
     @overload
     def __contains__(
@@ -83,39 +174,51 @@ class Script_material:
 
     def __contains__(self, item) -> bool:
         if isinstance(item, Video_material):
-            return item.material_id in [video.material_id for video in self.videos]
+            return self.videos.has_id(item.material_id)
         elif isinstance(item, Audio_material):
-            return item.material_id in [audio.material_id for audio in self.audios]
+            return self.audios.has_id(item.material_id)
         elif isinstance(item, Audio_fade):
-            return item.fade_id in [fade.fade_id for fade in self.audio_fades]
+            return self.audio_fades.has_id(item.fade_id)
         elif isinstance(item, Audio_effect):
-            return item.effect_id in [effect.effect_id for effect in self.audio_effects]
+            return self.audio_effects.has_id(item.effect_id)
         elif isinstance(item, Segment_animations):
-            return item.animation_id in [ani.animation_id for ani in self.animations]
+            return self.animations.has_id(item.animation_id)
         elif isinstance(item, Video_effect):
-            return item.global_id in [effect.global_id for effect in self.video_effects]
+            return self.video_effects.has_id(item.global_id)
         elif isinstance(item, Transition):
-            return item.global_id in [transition.global_id for transition in self.transitions]
+            return self.transitions.has_id(item.global_id)
         elif isinstance(item, Filter):
-            return item.global_id in [filter_.global_id for filter_ in self.filters]
+            return self.filters.has_id(item.global_id)
         else:
             raise TypeError("Invalid argument type '%s'" % type(item))
 
-    def export_json(self) -> Dict[str, List[Any]]:
+    def get(self, material_id: str) -> Optional[Any]:
+        """根据id在所有类别中查找素材, 未找到时返回None
+
+        对于贴纸、文本及蒙版, 返回的是其导出的json数据
+        """
+        for material_list in self._all_lists:
+            item = material_list.get(material_id)
+            if item is not None:
+                return item
+        return None
+
+    def export_iters(self) -> Dict[str, Iterable[Any]]:
+        """按导出顺序返回各类素材的json数据迭代器, 素材在迭代时才被导出"""
         return {
             "ai_translates": [],
             "audio_balances": [],
-            "audio_effects": [effect.export_json() for effect in self.audio_effects],
-            "audio_fades": [fade.export_json() for fade in self.audio_fades],
+            "audio_effects": (effect.export_json_cached() for effect in self.audio_effects),
+            "audio_fades": (fade.export_json_cached() for fade in self.audio_fades),
             "audio_track_indexes": [],
-            "audios": [audio.export_json() for audio in self.audios],
+            "audios": (audio.export_json_cached() for audio in self.audios),
             "beats": [],
-            "canvases": [canvas.export_json() for canvas in self.canvases],
+            "canvases": (canvas.export_json_cached() for canvas in self.canvases),
             "chromas": [],
             "color_curves": [],
             "digital_humans": [],
             "drafts": [],
-            "effects": [_filter.export_json() for _filter in self.filters],
+            "effects": (_filter.export_json_cached() for _filter in self.filters),
             "flowers": [],
             "green_screens": [],
             "handwrites": [],
@@ -124,8 +227,8 @@ class Script_material:
             "log_color_wheels": [],
             "loudnesses": [],
             "manual_deformations": [],
-            "masks": self.masks,
-            "material_animations": [ani.export_json() for ani in self.animations],
+            "masks": iter(self.masks),
+            "material_animations": (ani.export_json_cached() for ani in self.animations),
             "material_colors": [],
             "multi_language_refs": [],
             "placeholders": [],
@@ -136,20 +239,92 @@ class Script_material:
             "smart_crops": [],
             "smart_relights": [],
             "sound_channel_mappings": [],
-            "speeds": [spd.export_json() for spd in self.speeds],
-            "stickers": self.stickers,
+            "speeds": (spd.export_json_cached() for spd in self.speeds),
+            "stickers": iter(self.stickers),
             "tail_leaders": [],
             "text_templates": [],
-            "texts": self.texts,
+            "texts": iter(self.texts),
             "time_marks": [],
-            "transitions": [transition.export_json() for transition in self.transitions],
-            "video_effects": [effect.export_json() for effect in self.video_effects],
+            "transitions": (transition.export_json_cached() for transition in self.transitions),
+            "video_effects": (effect.export_json_cached() for effect in self.video_effects),
             "video_trackings": [],
-            "videos": [video.export_json() for video in self.videos],
+            "videos": (video.export_json_cached() for video in self.videos),
             "vocal_beautifys": [],
             "vocal_separations": []
         }
 
+    def export_json(self) -> Dict[str, List[Any]]:
+        return {key: list(items) for key, items in self.export_iters().items()}
+
+
+def _same_items(old: List[Any], new: List[Any]) -> bool:
+    """两个列表是否逐项为同一对象"""
+    return len(old) == len(new) and all(a is b for a, b in zip(old, new))
+
+@lru_cache(maxsize=None)
+def _builtin_template() -> Dict[str, Any]:
+    """解析内置的草稿模板, 每个进程只解析一次, 调用方不应修改其返回值"""
+    with open(os.path.join(os.path.dirname(__file__), Script_file.TEMPLATE_FILE), "r", encoding="utf-8") as f:
+        return json_backend.load(f)
+
+def print_material_info(stickers: Iterable[Dict[str, Any]], effects: Iterable[Dict[str, Any]]) -> None:
+    """输出贴纸、文本气泡以及花字素材的元数据, `effects`只会被遍历一次"""
+    print("贴纸素材:")
+    for sticker in stickers:
+        print("\tResource id: %s '%s'" %
+              (sticker["resource_id"], sticker.get("name", "")))
+
+    bubbles: List[Dict[str, Any]] = []
+    flowers: List[Dict[str, Any]] = []
+    for effect in effects:
+        if effect["type"] == "text_shape":
+            bubbles.append(effect)
+        elif effect["type"] == "text_effect":
+            flowers.append(effect)
+
+    print("文字气泡效果:")
+    for effect in bubbles:
+        print("\tEffect id: %s ,Resource id: %s '%s'" %
+              (effect["effect_id"], effect["resource_id"], effect.get("name", "")))
+
+    print("花字效果:")
+    for effect in flowers:
+        print("\tResource id: %s '%s'" %
+              (effect["resource_id"], effect.get("name", "")))
+
+
+def _recalc_style_range(old_len: int, new_len: int, styles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """按新旧文字长度调整字体样式分布, 尽量维持各样式原有占比不变"""
+    new_styles: List[Dict[str, Any]] = []
+    for style in styles:
+        start = math.ceil(style["range"][0] / old_len * new_len)
+        end = math.ceil(style["range"][1] / old_len * new_len)
+        style["range"] = [start, end]
+        if start != end:
+            new_styles.append(style)
+    return new_styles
+
+def _replaced_text_content(content: str, text: str, recalc_style: bool) -> str:
+    """将文本素材`content`字段中的文字替换为`text`, 返回新的`content`字段"""
+    content_obj = json.loads(content)
+    if recalc_style:
+        content_obj["styles"] = _recalc_style_range(len(content_obj["text"]), len(text), content_obj["styles"])
+    content_obj["text"] = text
+    return json.dumps(content_obj, ensure_ascii=False)
+
+_VIDEO_MATERIAL_FIELDS = ("material_name", "path", "duration", "width", "height", "material_type")
+_AUDIO_MATERIAL_FIELDS = ("name", "path", "duration")
+
+def _replaced_material_fields(material: Union[Video_material, Audio_material], replace_crop: bool) -> Dict[str, Any]:
+    """按名称替换素材时需要更新的字段, 顺序与`_VIDEO_MATERIAL_FIELDS`或`_AUDIO_MATERIAL_FIELDS`一致, 替换裁剪设置时最后附加`crop`"""
+    if isinstance(material, Video_material):
+        fields: Dict[str, Any] = {"material_name": material.material_name, "path": material.path, "duration": material.duration,
+                                  "width": material.width, "height": material.height, "material_type": material.material_type}
+        if replace_crop:
+            fields["crop"] = material.crop_settings.export_json()
+        return fields
+    return {"name": material.material_name, "path": material.path, "duration": material.duration}
+
 
 class Script_file:
     """剪映草稿文件, 大部分接口定义在此"""
@@ -157,7 +332,10 @@ class Script_file:
     save_path: Optional[str]
     """草稿文件保存路径, 仅在模板模式下有效"""
     content: Dict[str, Any]
-    """草稿文件内容"""
+    """草稿文件内容, 导出时以其为基础生成新的字典, 本身不会被修改
+
+    非模板模式下, 其嵌套结构与进程内缓存的内置模板共享, 如需修改请整体替换相应的顶层键
+    """
 
     width: int
     """视频的宽度, 单位为像素"""
@@ -178,17 +356,26 @@ class Script_file:
     imported_tracks: List[ImportedTrack]
     """导入的轨道信息"""
 
+    id_factory: Optional[Id_source]
+    """通过本对象的方法创建轨道及片段时所用的id生成器, 为None时使用当前线程生效的生成器"""
+
+    _dumps_cache: Dict[bool, Tuple[Tuple[int, int, int, int], Dict[str, List[Any]], List[Dict[str, Any]], str]]
+    """`dumps`的结果, 以是否紧凑格式为键, 同时记录导出时的帧率、时长、画布尺寸以及素材和轨道部分的各项导出结果"""
+
     TEMPLATE_FILE = "draft_content_template.json"
 
-    def __init__(self, width: int, height: int, fps: int = 30):
+    def __init__(self, width: int, height: int, fps: int = 30, *, id_factory: Optional[Id_source] = None):
         """创建一个剪映草稿
 
         Args:
             width (int): 视频宽度, 单位为像素
             height (int): 视频高度, 单位为像素
             fps (int, optional): 视频帧率. 默认为30.
+            id_factory (`Id_factory` or `Callable[[], str]`, optional): 本草稿使用的id生成器, 如`Id_factory(seed=0)`可使输出可复现.
+                默认使用当前线程生效的生成器. 在`id_scope`块内创建的片段等对象也将使用它.
         """
         self.save_path = None
+        self.id_factory = id_factory
 
         self.width = width
         self.height = height
@@ -201,8 +388,18 @@ class Script_file:
         self.imported_materials = {}
         self.imported_tracks = []
 
-        with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
-            self.content = json.load(f)
+        # 复制进程内缓存的模板, 避免每次构造都读取并解析文件
+        # 草稿只会整体替换顶层键(fps/duration/canvas_config/materials/tracks), 不会原地修改其中的嵌套结构, 故浅拷贝即可
+        self.content = dict(_builtin_template())
+
+        self._dumps_cache = {}
+
+    def id_scope(self) -> ContextManager[None]:
+        """在`with`块内让当前线程使用本草稿的id生成器创建片段、关键帧等对象, 未设置`id_factory`时不做任何改变
+
+        本草稿的方法(如`add_track`、`add_effect`及`import_srt`)内部创建的对象总是使用本草稿的id生成器
+        """
+        return use_id_factory(self.id_factory)
 
     # 这个函数可以从本地的JSON文件加载一个草稿模板, 并返回一个`Script_file`对象 可以用于用户使用现成的模板进行开发
     # 也可以搞一个接口 给用户返回一个模板使用
@@ -217,18 +414,34 @@ class Script_file:
         Raises:
             `FileNotFoundError`: JSON文件不存在
         """
-        obj = Script_file(**util.provide_ctor_defaults(Script_file))
-        obj.save_path = json_path
         if not os.path.exists(json_path):
             raise FileNotFoundError("JSON文件 '%s' 不存在" % json_path)
         with open(json_path, "r", encoding="utf-8") as f:
-            obj.content = json.load(f)
+            content = json_backend.load(f)
+
+        return Script_file.from_content(content, json_path)
+
+    @staticmethod
+    def from_content(content: Dict[str, Any], save_path: Optional[str] = None) -> "Script_file":
+        """从已解析的草稿内容创建模板模式下的草稿对象
+
+        创建的对象与`content`共享嵌套的json数据, 但不会修改它, 故同一份`content`可以反复用于创建多个互不影响的草稿
+
+        Args:
+            content (`Dict[str, Any]`): 解析后的草稿文件内容
+            save_path (`str`, optional): 草稿的保存路径, 默认不设置
+        """
+        obj = Script_file(**util.provide_ctor_defaults(Script_file))
+        obj.save_path = save_path
+        obj.content = dict(content)
 
         util.assign_attr_with_json(obj, ["fps", "duration"], obj.content)
         util.assign_attr_with_json(
             obj, ["width", "height"], obj.content["canvas_config"])
 
-        obj.imported_materials = deepcopy(obj.content["materials"])
+        # 写时复制: 导入的素材与轨道均直接引用解析出的json数据, 只在修改时复制相应的部分
+        obj.imported_materials = {material_type: list(material_list)
+                                  for material_type, material_list in obj.content["materials"].items()}
         obj.imported_tracks = [import_track(
             track_data) for track_data in obj.content["tracks"]]
 
@@ -238,6 +451,7 @@ class Script_file:
     # Video_material/Audio_material 可以从本地load素材 不需要构造
     def add_material(self, material: Union[Video_material, Audio_material]) -> "Script_file":
         """向草稿文件中添加一个素材"""
+        self.mark_dirty()
         if material in self.materials:  # 素材已存在
             return self
         if isinstance(material, Video_material):
@@ -272,6 +486,7 @@ class Script_file:
         Raises:
             `NameError`: 已存在同类型轨道且未指定名称, 或已存在同名轨道
         """
+        self.mark_dirty()
 
         if track_name is None:
             if track_type in [track.track_type for track in self.tracks.values()]:
@@ -284,8 +499,9 @@ class Script_file:
         if absolute_index is not None:
             render_index = absolute_index
 
-        self.tracks[track_name] = Track(
-            track_type, track_name, render_index, mute)
+        with self.id_scope():
+            self.tracks[track_name] = Track(
+                track_type, track_name, render_index, mute)
         return self
 
     # 获取指定类型的轨道, 如果有多个同类型的轨道则需要指定名称
@@ -321,6 +537,7 @@ class Script_file:
             `TypeError`: 片段类型不匹配轨道类型
             `SegmentOverlap`: 新片段与已有片段重叠
         """
+        self.mark_dirty()
         # 从自身类的类型中获取轨道类型
         target = self._get_track(type(segment), track_name)
 
@@ -328,7 +545,40 @@ class Script_file:
         target.add_segment(segment)
         self.duration = max(self.duration, segment.end)
 
-        # 自动添加相关素材
+        self._add_segment_materials(segment)
+        return self
+
+    def add_segments(self, segments: Iterable[Union[Video_segment, Sticker_segment, Audio_segment, Text_segment]],
+                     track_name: Optional[str] = None) -> "Script_file":
+        """向指定轨道中批量添加片段, 效果与逐个调用`add_segment`相同
+
+        只进行一次轨道查找, 将新片段排序后一次性检查重叠, 并在最后统一更新草稿时长.
+        任一片段不合法时不会添加其中的任何片段
+
+        Args:
+            segments (`Iterable`): 要添加的片段, 可以是生成器. 所有片段须添加到同一轨道中
+            track_name (`str`, optional): 添加到的轨道名称. 当此类型的轨道仅有一条时可省略.
+
+        Raises:
+            `NameError`: 未找到指定名称的轨道, 或必须提供`track_name`参数时未提供
+            `TypeError`: 片段类型不匹配轨道类型
+            `SegmentOverlap`: 新片段之间或新片段与已有片段重叠
+        """
+        self.mark_dirty()
+        segment_list = list(segments)
+        if len(segment_list) == 0:
+            return self
+
+        target = self._get_track(type(segment_list[0]), track_name)
+        target.add_segments(segment_list)
+        self.duration = max(self.duration, max(segment.end for segment in segment_list))
+
+        for segment in segment_list:
+            self._add_segment_materials(segment)
+        return self
+
+    def _add_segment_materials(self, segment: Union[Video_segment, Sticker_segment, Audio_segment, Text_segment]) -> None:
+        """将片段依赖的素材(动画/特效/滤镜/变速等)加入素材列表"""
         if isinstance(segment, Video_segment):
             # 出入场等动画
             if (segment.animations_instance is not None) and (segment.animations_instance not in self.materials):
@@ -380,11 +630,9 @@ class Script_file:
         if isinstance(segment, (Video_segment, Audio_segment)):
             self.add_material(segment.material_instance)
 
-        return self
-
     # 添加一个特效片段  Effect_segment 类可以定义特效
 
-    def add_effect(self, effect: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect: Union["Video_scene_effect_type", "Video_character_effect_type"],
                    t_range: Timerange, track_name: Optional[str] = None, *,
                    params: Optional[List[Optional[float]]] = None) -> "Script_file":
         """向指定的特效轨道中添加一个特效片段
@@ -401,10 +649,12 @@ class Script_file:
             `TypeError`: 指定的轨道不是特效轨道
             `ValueError`: 新片段与已有片段重叠、提供的参数数量超过了该特效类型的参数数量, 或参数值超出范围.
         """
+        self.mark_dirty()
         target = self._get_track(Effect_segment, track_name)
 
         # 加入轨道并更新时长
-        segment = Effect_segment(effect, t_range, params)
+        with self.id_scope():
+            segment = Effect_segment(effect, t_range, params)
         target.add_segment(segment)
 
         # 更新草稿时长
@@ -417,7 +667,7 @@ class Script_file:
 
     # 添加一个滤镜片段
 
-    def add_filter(self, filter_meta: Filter_type,
+    def add_filter(self, filter_meta: "Filter_type",
                    t_range: Timerange,
                    track_name: Optional[str] = None,
                    intensity: float = 100.0) -> "Script_file":
@@ -434,11 +684,13 @@ class Script_file:
             `TypeError`: 指定的轨道不是滤镜轨道
             `ValueError`: 新片段与已有片段重叠
         """
+        self.mark_dirty()
         target = self._get_track(Filter_segment, track_name)
 
         # 加入轨道并更新时长
-        segment = Filter_segment(filter_meta, t_range,
-                                 intensity / 100.0)  # 转换为0-1范围
+        with self.id_scope():
+            segment = Filter_segment(filter_meta, t_range,
+                                     intensity / 100.0)  # 转换为0-1范围
         target.add_segment(segment)
         self.duration = max(self.duration, t_range.end)
 
@@ -467,6 +719,7 @@ class Script_file:
             `NameError`: 已存在同名轨道
             `TypeError`: 轨道类型不匹配
         """
+        self.mark_dirty()
         if style_reference is None and clip_settings is None:
             raise ValueError("未提供样式参考时请提供`clip_settings`参数")
 
@@ -479,14 +732,15 @@ class Script_file:
             lines = srt_file.readlines()
 
         def __add_text_segment(text: str, t_range: Timerange) -> None:
-            if style_reference:
-                seg = Text_segment.create_from_template(
-                    text, t_range, style_reference)
-                if clip_settings is not None:
-                    seg.clip_settings = deepcopy(clip_settings)
-            else:
-                seg = Text_segment(
-                    text, t_range, style=text_style, clip_settings=clip_settings)
+            with self.id_scope():
+                if style_reference:
+                    seg = Text_segment.create_from_template(
+                        text, t_range, style_reference)
+                    if clip_settings is not None:
+                        seg.clip_settings = deepcopy(clip_settings)
+                else:
+                    seg = Text_segment(
+                        text, t_range, style=text_style, clip_settings=clip_settings)
             self.add_segment(seg, track_name)
 
         index = 0
@@ -581,8 +835,9 @@ class Script_file:
             new_name (`str`, optional): 新轨道名称, 默认使用源轨道名称.
             relative_index (`int`, optional): 相对索引，用于调整导入轨道的渲染层级. 默认保持原有层级.
         """
-        # 直接拷贝原始轨道结构, 按需修改渲染层级
-        imported_track = deepcopy(track)
+        self.mark_dirty()
+        # 拷贝轨道及片段(原始json数据共享), 按需修改渲染层级
+        imported_track = track.copy()
         if relative_index is not None:
             imported_track.render_index = track.track_type.value.render_index + relative_index
         if new_name is not None:
@@ -609,14 +864,13 @@ class Script_file:
             extra_refs: List[str] = segment.get("extra_material_refs", [])
             material_ids.update(extra_refs)
 
-        # 复制素材
+        # 复制素材, 素材的json数据在两个草稿间共享, 替换时会先复制再修改
         for material_type, material_list in source_file.imported_materials.items():
             for material in material_list:
                 if material.get("id") in material_ids:
                     if material_type not in self.imported_materials:
                         self.imported_materials[material_type] = []
-                    self.imported_materials[material_type].append(
-                        deepcopy(material))
+                    self.imported_materials[material_type].append(material)
                     material_ids.remove(material.get("id"))
 
         assert len(material_ids) == 0, "未找到以下素材: %s" % material_ids
@@ -641,32 +895,38 @@ class Script_file:
             `MaterialNotFound`: 根据指定名称未找到与新素材同类的素材
             `AmbiguousMaterial`: 根据指定名称找到多个与新素材同类的素材
         """
+        self.mark_dirty()
         video_mode = isinstance(material, Video_material)
-        # 查找素材
-        target_json_obj: Optional[Dict[str, Any]] = None
         target_material_list = self.imported_materials["videos" if video_mode else "audios"]
+        target_index = self._find_imported_material(material_name, video_mode)
+
+        # 更新素材信息, 先复制再修改, 不影响原始json数据
+        target_json_obj = dict(target_material_list[target_index])
+        target_material_list[target_index] = target_json_obj
+        target_json_obj.update(_replaced_material_fields(material, replace_crop))
+
+        return self
+
+    def _find_imported_material(self, material_name: str, video_mode: bool) -> int:
+        """查找指定名称的导入视频或音频素材, 返回其在相应素材列表中的下标
+
+        Raises:
+            `MaterialNotFound`: 根据指定名称未找到素材
+            `AmbiguousMaterial`: 根据指定名称找到多个素材
+        """
+        material_type = Video_material if video_mode else Audio_material
         name_key = "material_name" if video_mode else "name"
-        for mat in target_material_list:
+        target_index: Optional[int] = None
+        for index, mat in enumerate(self.imported_materials["videos" if video_mode else "audios"]):
             if mat[name_key] == material_name:
-                if target_json_obj is not None:
+                if target_index is not None:
                     raise exceptions.AmbiguousMaterial(
-                        "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
-                target_json_obj = mat
-        if target_json_obj is None:
+                        "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, material_type))
+                target_index = index
+        if target_index is None:
             raise exceptions.MaterialNotFound(
-                "没有找到名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
-
-        # 更新素材信息
-        target_json_obj.update({name_key: material.material_name,
-                               "path": material.path, "duration": material.duration})
-        if video_mode:
-            target_json_obj.update(
-                {"width": material.width, "height": material.height, "material_type": material.material_type})
-            if replace_crop:
-                target_json_obj.update(
-                    {"crop": material.crop_settings.export_json()})
-
-        return self
+                "没有找到名为 '%s', 类型为 '%s' 的素材" % (material_name, material_type))
+        return target_index
 
     def replace_material_by_seg(self, track: EditableTrack, segment_index: int, material: Union[Video_material, Audio_material],
                                 source_timerange: Optional[Timerange] = None, *,
@@ -688,6 +948,7 @@ class Script_file:
             `TypeError`: 轨道或素材类型不正确
             `ExtensionFailed`: 新素材比原素材长时处理失败
         """
+        self.mark_dirty()
         if not isinstance(track, ImportedMediaTrack):
             raise TypeError("指定的轨道(类型为 %s)不支持素材替换" % track.track_type)
         if not 0 <= segment_index < len(track):
@@ -732,134 +993,330 @@ class Script_file:
             `TypeError`: 轨道类型不正确
             `ValueError`: 文本模板片段的文本数量不匹配
         """
+        self.mark_dirty()
+        template, indices = self._locate_text_materials(track, segment_index)
+        texts = self._split_replacement_text(template, text)
+
+        # 文本素材均先复制再修改, 不影响原始json数据
+        text_materials = self.imported_materials["texts"]
+        for index, new_text in zip(indices, texts):
+            if index is None:
+                continue
+            mat = text_materials[index] = dict(text_materials[index])
+            if template is not None and isinstance(mat["content"], str):
+                mat["content"] = new_text
+            else:
+                mat["content"] = _replaced_text_content(mat["content"], new_text, recalc_style)
+
+        return self
+
+    def _locate_text_materials(self, track: EditableTrack, segment_index: int) -> Tuple[Optional[Dict[str, Any]], List[Optional[int]]]:
+        """查找文本片段所引用的文本素材
+
+        Returns:
+            片段引用的文本模板(普通文本片段则为None), 以及各段文字对应的素材在导入的文本素材列表中的下标(未找到则为None)
+
+        Raises:
+            `IndexError`: `segment_index`越界
+            `TypeError`: 轨道类型不正确
+        """
         if not isinstance(track, ImportedTextTrack):
             raise TypeError("指定的轨道(类型为 %s)不支持文本内容替换" % track.track_type)
         if not 0 <= segment_index < len(track):
             raise IndexError("片段下标 %d 超出 [0, %d) 的范围" %
                              (segment_index, len(track)))
 
-        def __recalc_style_range(old_len: int, new_len: int, styles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-            """调整字体样式分布"""
-            new_styles: List[Dict[str, Any]] = []
-            for style in styles:
-                start = math.ceil(style["range"][0] / old_len * new_len)
-                end = math.ceil(style["range"][1] / old_len * new_len)
-                style["range"] = [start, end]
-                if start != end:
-                    new_styles.append(style)
-            return new_styles
-
-        replaced: bool = False
         material_id: str = track.segments[segment_index].material_id
-        # 尝试在文本素材中替换
-        for mat in self.imported_materials["texts"]:
-            if mat["id"] != material_id:
+        text_materials = self.imported_materials["texts"]
+        # 尝试在文本素材中查找
+        for index, mat in enumerate(text_materials):
+            if mat["id"] == material_id:
+                return None, [index]
+
+        # 尝试在文本模板中查找
+        for template in self.imported_materials["text_templates"]:
+            if template["id"] != material_id:
                 continue
 
+            indices: List[Optional[int]] = []
+            for resource in template["text_info_resources"]:
+                indices.append(next((index for index, mat in enumerate(text_materials)
+                                     if mat["id"] == resource["text_material_id"]), None))
+            return template, indices
+
+        assert False, f"未找到指定片段的素材 {material_id}"
+
+    @staticmethod
+    def _split_replacement_text(template: Optional[Dict[str, Any]], text: Union[str, List[str]]) -> List[str]:
+        """将替换内容整理为与各段文字对应的列表
+
+        Raises:
+            `ValueError`: 文本数量不匹配
+        """
+        if template is None:
             if isinstance(text, list):
                 if len(text) != 1:
                     raise ValueError(f"正常文本片段只能有一个文字内容, 但替换内容是 {text}")
-                text = text[0]
-
-            content = json.loads(mat["content"])
-            if recalc_style:
-                content["styles"] = __recalc_style_range(
-                    len(content["text"]), len(text), content["styles"])
-            content["text"] = text
-            mat["content"] = json.dumps(content, ensure_ascii=False)
-            replaced = True
-            break
-        if replaced:
-            return self
+                return text
+            return [text]
 
-        # 尝试在文本模板中替换
-        for template in self.imported_materials["text_templates"]:
-            if template["id"] != material_id:
-                continue
+        if isinstance(text, str):
+            text = [text]
+        resources = template["text_info_resources"]
+        if len(text) > len(resources):
+            raise ValueError(
+                f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
+        return text
 
-            resources = template["text_info_resources"]
-            if isinstance(text, str):
-                text = [text]
-            if len(text) > len(resources):
-                raise ValueError(
-                    f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
-
-            for sub_material_id, new_text in zip(map(lambda x: x["text_material_id"], resources), text):
-                for mat in self.imported_materials["texts"]:
-                    if mat["id"] != sub_material_id:
-                        continue
-
-                    if isinstance(mat["content"], str):
-                        mat["content"] = new_text
-                    else:
-                        content = json.loads(mat["content"])
-                        if recalc_style:
-                            content["styles"] = __recalc_style_range(
-                                len(content["text"]), len(new_text), content["styles"])
-                        content["text"] = new_text
-                        mat["content"] = json.dumps(
-                            content, ensure_ascii=False)
-                    break
-            replaced = True
-            break
-
-        assert replaced, f"未找到指定片段的素材 {material_id}"
+    def compile_template(self, slots: Dict[str, Union[Text_slot, Material_slot]], *, compact: bool = False) -> Compiled_template:
+        """将草稿预编译为带有具名槽位的模板, 适用于以同一模板批量生成大量草稿的场景
 
-        return self
+        草稿中槽位以外的部分被预先序列化, 渲染时只需序列化各槽位的新值,
+        结果与在草稿上调用`replace_text`/`replace_material_by_name`后导出的内容逐字节一致.
+        编译完成后对本草稿的修改不会影响编译结果
+
+        Args:
+            slots (`Dict[str, Text_slot | Material_slot]`): 槽位名称到槽位定义的映射
+            compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为否
+
+        Raises:
+            `IndexError`: 文本槽位的片段下标越界
+            `TypeError`: 文本槽位的轨道类型不正确
+            `ValueError`: 多个槽位对应同一素材的同一字段
+            `MaterialNotFound`: 根据指定名称未找到素材
+            `AmbiguousMaterial`: 根据指定名称找到多个素材
+        """
+        output = self._export_header()
+        # 素材列表每次导出时新建, 可以直接将其中的元素替换为带有占位的副本
+        materials, output["tracks"] = self._export_sections()
+        output["materials"] = materials
+
+        sentinel_prefix = "@@slot-%s-" % os.urandom(16).hex()
+        keys: List[str] = []
+        defaults: List[Any] = []
+        placeholders: Dict[int, Dict[str, Any]] = {}  # id(原始素材) -> 导出结果中带有占位的副本
+
+        def add_placeholder(material_type: str, json_obj: Dict[str, Any], key: str) -> int:
+            """将导出结果中`json_obj`的`key`字段替换为占位, 返回占位序号"""
+            copied = placeholders.get(id(json_obj))
+            if copied is None:
+                export_list = materials[material_type]
+                index = next(i for i, mat in enumerate(export_list) if mat is json_obj)
+                copied = placeholders[id(json_obj)] = export_list[index] = dict(json_obj)
+            elif copied.get(key, MISSING) is not json_obj.get(key, MISSING):
+                raise ValueError("多个槽位对应素材 '%s' 的字段 '%s'" % (json_obj.get("id"), key))
+            keys.append(key)
+            defaults.append(json_obj.get(key, MISSING))
+            copied[key] = "%s%d@@" % (sentinel_prefix, len(defaults) - 1)
+            return len(defaults) - 1
+
+        fillers: Dict[str, Slot_filler] = {}
+        for name, slot in slots.items():
+            if isinstance(slot, Text_slot):
+                fillers[name] = self._compile_text_slot(slot, add_placeholder)
+            elif isinstance(slot, Material_slot):
+                fillers[name] = self._compile_material_slot(slot, add_placeholder)
+            else:
+                raise TypeError("不支持的槽位类型 %s" % type(slot))
+
+        text = json_backend.dumps(output, **json_writer.format_options(compact))
+        return Compiled_template(text, sentinel_prefix, keys, defaults, fillers, compact)
+
+    def _compile_text_slot(self, slot: Text_slot, add_placeholder: Callable[[str, Dict[str, Any], str], int]) -> Slot_filler:
+        template, indices = self._locate_text_materials(slot.track, slot.segment_index)
+        text_materials = self.imported_materials["texts"]
+        targets: List[Optional[Tuple[int, Any]]] = []
+        for index in indices:
+            if index is None:
+                targets.append(None)
+            else:
+                mat = text_materials[index]
+                targets.append((add_placeholder("texts", mat, "content"), mat["content"]))
+
+        def fill(text: Union[str, List[str]]) -> Dict[int, Any]:
+            ret: Dict[int, Any] = {}
+            for target, new_text in zip(targets, self._split_replacement_text(template, text)):
+                if target is None:
+                    continue
+                placeholder, content = target
+                if template is not None and isinstance(content, str):
+                    ret[placeholder] = new_text
+                else:
+                    ret[placeholder] = _replaced_text_content(content, new_text, slot.recalc_style)
+            return ret
+        return fill
+
+    def _compile_material_slot(self, slot: Material_slot, add_placeholder: Callable[[str, Dict[str, Any], str], int]) -> Slot_filler:
+        video_mode = slot.material_type == "video"
+        material_type = "videos" if video_mode else "audios"
+        mat = self.imported_materials[material_type][self._find_imported_material(slot.material_name, video_mode)]
+        fields = _VIDEO_MATERIAL_FIELDS if video_mode else _AUDIO_MATERIAL_FIELDS
+        if video_mode and slot.replace_crop:
+            fields += ("crop",)
+        placeholders = {key: add_placeholder(material_type, mat, key) for key in fields}
+
+        def fill(material: Union[Video_material, Audio_material]) -> Dict[int, Any]:
+            if not isinstance(material, Video_material if video_mode else Audio_material):
+                raise TypeError("素材槽位需要 %s 类型的素材, 但提供的是 %s" % (slot.material_type, type(material)))
+            return {placeholders[key]: value for key, value in _replaced_material_fields(material, slot.replace_crop).items()}
+        return fill
 
     def inspect_material(self) -> None:
         """输出草稿中导入的贴纸、文本气泡以及花字素材的元数据"""
-        print("贴纸素材:")
-        for sticker in self.imported_materials["stickers"]:
-            print("\tResource id: %s '%s'" %
-                  (sticker["resource_id"], sticker.get("name", "")))
-
-        print("文字气泡效果:")
-        for effect in self.imported_materials["effects"]:
-            if effect["type"] == "text_shape":
-                print("\tEffect id: %s ,Resource id: %s '%s'" %
-                      (effect["effect_id"], effect["resource_id"], effect.get("name", "")))
-
-        print("花字效果:")
-        for effect in self.imported_materials["effects"]:
-            if effect["type"] == "text_effect":
-                print("\tResource id: %s '%s'" %
-                      (effect["resource_id"], effect.get("name", "")))
-
-    def dumps(self) -> str:
-        """将草稿文件内容导出为JSON字符串"""
-        self.content["fps"] = self.fps
-        self.content["duration"] = self.duration
-        self.content["canvas_config"] = {
-            "width": self.width, "height": self.height, "ratio": "original"}
-        self.content["materials"] = self.materials.export_json()
+        print_material_info(self.imported_materials["stickers"], self.imported_materials["effects"])
+
+    def mark_dirty(self) -> None:
+        """标记草稿内容已被修改, 使`dumps`缓存的结果失效
 
+        片段、轨道及特效、动画等素材对象的修改可以通过其导出状态自动发现, 通过本类的方法修改草稿时也会自动调用此方法;
+        只有在导出后又直接原地修改了导入的素材(`imported_materials`)或文本、贴纸等以json数据保存的素材时才需手动调用
+        """
+        self._dumps_cache.clear()
+
+    def _export_header(self) -> Dict[str, Any]:
+        """以`content`为基础生成导出结果, 并写入草稿的基本参数, 不含素材及轨道部分"""
+        output = dict(self.content)
+        output["fps"] = self.fps
+        output["duration"] = self.duration
+        output["canvas_config"] = {
+            "width": self.width, "height": self.height, "ratio": "original"}
+        return output
+
+    def _export_sections(self) -> Tuple[Dict[str, List[Any]], List[Dict[str, Any]]]:
+        """导出素材及轨道部分, 导出状态未变的片段、轨道及素材直接沿用上次的导出结果"""
+        materials = {key: list(items) for key, items in self._material_iters().items()}
+        tracks = [track.export_json_cached() for track in self._sorted_tracks()]
+        return materials, tracks
+
+    def _cached_dumps(self, compact: bool, materials: Dict[str, List[Any]], tracks: List[Dict[str, Any]]) -> Optional[str]:
+        """若草稿参数未变, 且素材及轨道部分的每一项都与上次`dumps`时是同一对象, 则返回上次的结果"""
+        cached = self._dumps_cache.get(compact)
+        if cached is None:
+            return None
+        header, cached_materials, cached_tracks, result = cached
+        if header != (self.fps, self.duration, self.width, self.height) or not _same_items(cached_tracks, tracks) \
+                or cached_materials.keys() != materials.keys():
+            return None
+        if not all(_same_items(cached_materials[key], items) for key, items in materials.items()):
+            return None
+        return result
+
+    def _material_iters(self) -> Dict[str, Iterable[Any]]:
+        """各类素材(含导入的素材)的json数据迭代器"""
+        material_iters = self.materials.export_iters()
         # 合并导入的素材
         for material_type, material_list in self.imported_materials.items():
-            if material_type not in self.content["materials"]:
-                self.content["materials"][material_type] = material_list
+            if material_type not in material_iters:
+                material_iters[material_type] = material_list
             else:
-                self.content["materials"][material_type].extend(material_list)
+                material_iters[material_type] = chain(material_iters[material_type], material_list)
+        return material_iters
 
-        # 对轨道排序并导出
+    def _sorted_tracks(self) -> List[Base_track]:
+        """按渲染顺序排序的全部轨道"""
         track_list: List[Base_track] = list(self.tracks.values())
         track_list.extend(self.imported_tracks)
         track_list.sort(key=lambda track: track.render_index)
-        self.content["tracks"] = [track.export_json() for track in track_list]
+        return track_list
+
+    def dumps(self, *, compact: bool = False) -> str:
+        """将草稿文件内容导出为JSON字符串
+
+        片段、轨道及素材的导出结果在其导出状态不变时被缓存; 各部分的导出结果都与上次相同时直接返回上次的JSON字符串
+
+        Args:
+            compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为否, 即缩进4格
+        """
+        materials, tracks = self._export_sections()
+        result = self._cached_dumps(compact, materials, tracks)
+        if result is not None:
+            return result
+
+        output = self._export_header()
+        output["materials"] = materials
+        output["tracks"] = tracks
+
+        result = json_backend.dumps(output, **json_writer.format_options(compact))
+        self._dumps_cache[compact] = ((self.fps, self.duration, self.width, self.height), materials, tracks, result)
+        return result
+
+    def export_dict(self) -> Dict[str, Any]:
+        """导出草稿文件内容的JSON对象, 与`json.loads(self.dumps())`相等, 但省去了序列化及解析的过程
+
+        返回值与导出缓存及模板数据共享嵌套结构, 调用方不应修改它
+        """
+        output = self._export_header()
+        output["materials"], output["tracks"] = self._export_sections()
+        return output
+
+    def export_bytes(self, *, compact: bool = True) -> bytes:
+        """将草稿文件内容导出为UTF-8编码的JSON, 可直接用作HTTP响应体
+
+        Args:
+            compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为是
+        """
+        return self.dumps(compact=compact).encode("utf-8")
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+    def dump(self, file_path: str, *, compact: bool = False, atomic: bool = False) -> None:
+        """将草稿文件内容以流式方式写入文件, 各类素材及各轨道在写出时才逐个导出
 
-    def dump(self, file_path: str) -> None:
-        """将草稿文件内容写入文件"""
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(self.dumps())
+        在相同的格式选项下, 写出的内容与`dumps`的结果完全一致
 
-    def save(self) -> None:
+        Args:
+            file_path (`str`): 目标文件路径
+            compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为否
+            atomic (`bool`, optional): 是否先写入同目录下的临时文件再原子地重命名为目标文件, 默认为否.
+                开启后写出过程中出错不会破坏原有文件
+        """
+        if compact in self._dumps_cache:
+            # 检查`dumps`缓存的结果是否仍然有效, 为此导出的各部分在缓存无效时直接写出
+            materials, tracks = self._export_sections()
+            output: Any = self._cached_dumps(compact, materials, tracks)
+            if output is None:
+                output = self._export_header()
+                output["materials"] = materials
+                output["tracks"] = tracks
+        else:
+            output = self._export_header()
+            # 各类素材及各轨道在写出时才逐个导出
+            output["materials"] = {key: json_writer.Lazy_array(items) for key, items in self._material_iters().items()}
+            output["tracks"] = json_writer.Lazy_array(track.export_json_cached() for track in self._sorted_tracks())
+
+        def write(f: TextIO) -> None:
+            if isinstance(output, str):  # 与`dumps`缓存的结果相同
+                f.write(output)
+            else:
+                json_writer.write_json(f, output, compact=compact)
+
+        if not atomic:
+            with open(file_path, "w", encoding="utf-8") as f:
+                write(f)
+            return
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".draft_", suffix=".tmp",
+                                        dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def save(self, *, compact: bool = False, atomic: bool = False) -> None:
         """保存草稿文件至打开时的路径, 仅在模板模式下可用
 
+        Args:
+            compact (`bool`, optional): 是否使用紧凑格式(无缩进无空格), 默认为否
+            atomic (`bool`, optional): 是否先写入临时文件再原子地替换原文件, 默认为否
+
         Raises:
             `ValueError`: 不在模板模式下
         """
         if self.save_path is None:
             raise ValueError("没有设置保存路径, 可能不在模板模式下")
-        self.dump(self.save_path)
+        self.dump(self.save_path, compact=compact, atomic=atomic)
@@ -1,17 +1,21 @@
 """定义片段基类及部分比较通用的属性类"""
 
-import uuid
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Iterable, Union, Tuple
 
 from .animation import Segment_animations
+from .curve_sampler import Curve, DEFAULT_INTERVAL, sample_curve, simplify_keyframes
+from .export_cache import Export_cached
+from .id_factory import new_id
 from .keyframe import Keyframe_list, Keyframe_property
 from .time_util import Timerange, tim
 
 
 # 基础片段类 ，定义了片段中一些基本的通用的属性和方法
-class Base_segment:
+class Base_segment(Export_cached):
     """片段基类"""
 
+    __slots__ = ("segment_id", "material_id", "target_timerange", "common_keyframes")
+
     segment_id: str
     """片段全局id, 由程序自动生成"""
     material_id: str
@@ -24,7 +28,7 @@ class Base_segment:
 
     # 构造函数
     def __init__(self, material_id: str, target_timerange: Timerange):
-        self.segment_id = uuid.uuid4().hex
+        self.segment_id = new_id()
         self.material_id = material_id
         self.target_timerange = target_timerange
 
@@ -59,6 +63,20 @@ class Base_segment:
         """判断是否与另一个片段有重叠"""
         return self.target_timerange.overlaps(other.target_timerange)
 
+    def _keyframe_list(self, _property: Keyframe_property) -> Keyframe_list:
+        """获取给定属性的关键帧列表, 不存在时创建一个"""
+        for kf_list in self.common_keyframes:
+            if kf_list.keyframe_property == _property:
+                return kf_list
+        kf_list = Keyframe_list(_property)
+        self.common_keyframes.append(kf_list)
+        return kf_list
+
+    def export_state(self) -> Tuple[Any, ...]:
+        """决定导出结果的状态: id、素材、时间范围及关键帧"""
+        return (self.segment_id, self.material_id, self.target_timerange.export_state(),
+                tuple(kf_list.export_state() for kf_list in self.common_keyframes))
+
     def export_json(self) -> Dict[str, Any]:
         """返回通用于各种片段的属性"""
         return {
@@ -86,18 +104,23 @@ class Base_segment:
 
 
 # 只支持固定速度
-class Speed:
+class Speed(Export_cached):
     """播放速度对象, 目前只支持固定速度"""
 
+    __slots__ = ("global_id", "speed")
+
     global_id: str
     """全局id, 由程序自动生成"""
     speed: float
     """播放速度"""
 
     def __init__(self, speed: float):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.speed = speed
 
+    def export_state(self) -> Tuple[str, float]:
+        return (self.global_id, self.speed)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "curve_speed": None,
@@ -111,6 +134,9 @@ class Speed:
 class Clip_settings:
     """素材片段的图像调节设置"""
 
+    __slots__ = ("alpha", "flip_horizontal", "flip_vertical", "rotation",
+                 "scale_x", "scale_y", "transform_x", "transform_y")
+
     alpha: float
     """图像不透明度, 0-1"""
     flip_horizontal: bool
@@ -152,6 +178,10 @@ class Clip_settings:
         self.scale_x, self.scale_y = scale_x, scale_y
         self.transform_x, self.transform_y = transform_x, transform_y
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.alpha, self.flip_horizontal, self.flip_vertical, self.rotation,
+                self.scale_x, self.scale_y, self.transform_x, self.transform_y)
+
     def export_json(self) -> Dict[str, Any]:
         clip_settings_json = {
             "alpha": self.alpha,
@@ -166,6 +196,8 @@ class Clip_settings:
 class Media_segment(Base_segment):
     """媒体片段基类"""
 
+    __slots__ = ("source_timerange", "speed", "volume", "extra_material_refs")
+
     source_timerange: Optional[Timerange]
     """截取的素材片段的时间范围, 对贴纸而言不存在"""
     speed: Speed
@@ -185,6 +217,11 @@ class Media_segment(Base_segment):
 
         self.extra_material_refs = [self.speed.global_id]
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return super().export_state() + (
+            self.source_timerange.export_state() if self.source_timerange else None,
+            self.speed.speed, self.volume, tuple(self.extra_material_refs))
+
     def export_json(self) -> Dict[str, Any]:
         """返回通用于音频和视频片段的默认属性"""
         ret = super().export_json()
@@ -200,6 +237,8 @@ class Media_segment(Base_segment):
 class Visual_segment(Media_segment):
     """视觉片段基类，用于处理所有可见片段（视频、贴纸、文本）的共同属性和行为"""
 
+    __slots__ = ("clip_settings", "uniform_scale", "animations_instance")
+
     clip_settings: Clip_settings
     """图像调节设置, 其效果可被关键帧覆盖"""
 
@@ -241,6 +280,47 @@ class Visual_segment(Media_segment):
         Raises:
             `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者
         """
+        if isinstance(time_offset, str):
+            time_offset = tim(time_offset)
+
+        self._visual_keyframe_list(_property).add_keyframe(time_offset, value)
+        return self
+
+    def add_keyframes(self, _property: Keyframe_property, times: Iterable[int], values: Iterable[float]) -> "Visual_segment":
+        """为给定属性批量创建关键帧, 效果与对每组值调用`add_keyframe`相同, 但适用于成千上万个关键帧
+
+        Args:
+            _property (`Keyframe_property`): 要控制的属性
+            times (`Iterable[int]`): 各关键帧的时间偏移量, 单位为微秒, 可以是`array`或NumPy数组, 无需有序
+            values (`Iterable[float]`): 属性在各时间偏移量处的值, 与`times`一一对应
+
+        Raises:
+            `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者, 或`times`与`values`的长度不一致
+        """
+        self._visual_keyframe_list(_property).add_keyframes(times, values)
+        return self
+
+    def add_keyframe_curve(self, _property: Keyframe_property, curve: Curve, *,
+                           tolerance: float = 1e-3, interval: int = DEFAULT_INTERVAL) -> "Visual_segment":
+        """在整个片段时长内对运动曲线采样, 精简后作为给定属性的关键帧加入
+
+        生成的关键帧间线性插值的结果在每个采样点处与曲线的偏差不超过`tolerance`, 详见`curve_sampler`模块
+
+        Args:
+            _property (`Keyframe_property`): 要控制的属性
+            curve (`Callable[[int], float]` or `Sequence[float]`): 以相对片段开头的时间偏移量(微秒)为自变量的函数,
+                或在片段时长内均匀分布的一组值
+            tolerance (`float`, optional): 允许的最大偏差, 单位与属性值相同, 默认为0.001
+            interval (`int`, optional): 对函数采样的间隔, 单位为微秒, 默认为30fps下的一帧
+
+        Raises:
+            `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者, 或参数不合法
+        """
+        times, values = simplify_keyframes(*sample_curve(curve, self.duration, interval=interval), tolerance)
+        return self.add_keyframes(_property, times, values)
+
+    def _visual_keyframe_list(self, _property: Keyframe_property) -> Keyframe_list:
+        """处理缩放属性间的互斥关系, 并返回实际控制的属性对应的关键帧列表"""
         if (_property == Keyframe_property.scale_x or _property == Keyframe_property.scale_y) and self.uniform_scale:
             self.uniform_scale = False
         elif _property == Keyframe_property.uniform_scale:
@@ -248,18 +328,10 @@ class Visual_segment(Media_segment):
                 raise ValueError(
                     "已设置 scale_x 或 scale_y 时, 不能再设置 uniform_scale")
             _property = Keyframe_property.scale_x
+        return self._keyframe_list(_property)
 
-        if isinstance(time_offset, str):
-            time_offset = tim(time_offset)
-
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, value)
-                return self
-        kf_list = Keyframe_list(_property)
-        kf_list.add_keyframe(time_offset, value)
-        self.common_keyframes.append(kf_list)
-        return self
+    def export_state(self) -> Tuple[Any, ...]:
+        return super().export_state() + (self.clip_settings.export_state(), self.uniform_scale)
 
     def export_json(self) -> Dict[str, Any]:
         """导出通用于所有视觉片段的JSON数据"""
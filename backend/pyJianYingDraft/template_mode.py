@@ -1,8 +1,8 @@
 """与模板模式相关的类及函数等"""
 
-from copy import deepcopy
+from copy import copy
 from enum import Enum
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from . import exceptions
 from . import util
@@ -41,19 +41,36 @@ class Extend_mode(Enum):
     """延伸尾部, 若有必要则依次后移后续片段, 此方法总是成功"""
 
 class ImportedSegment(Base_segment):
-    """导入的片段"""
+    """导入的片段
+
+    可编辑的属性单独保存, 导出时覆盖到原始json数据的浅拷贝上
+    """
 
     raw_data: Dict[str, Any]
-    """原始json数据"""
+    """原始json数据, 与加载的草稿内容共享, 不应原地修改"""
 
     __DATA_ATTRS = ["material_id", "target_timerange"]
     def __init__(self, json_data: Dict[str, Any]):
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = json_data
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def copy(self) -> "ImportedSegment":
+        """复制此片段, 可编辑的属性被复制, 原始json数据则仍然共享"""
+        new_segment = copy(self)
+        # 时间范围可能位于基类的__slots__中, 因而不能只遍历实例的__dict__
+        for attr in (*vars(self), "target_timerange"):
+            value = getattr(self, attr)
+            if isinstance(value, Timerange):
+                setattr(new_segment, attr, Timerange(value.start, value.duration))
+        return new_segment
+
+    def export_state(self) -> Tuple[Any, ...]:
+        """决定导出结果的状态: 原始json数据(不会被原地修改)及可编辑的属性"""
+        return (self.raw_data, self.material_id, self.target_timerange.export_state())
+
     def export_json(self) -> Dict[str, Any]:
-        json_data = deepcopy(self.raw_data)
+        json_data = dict(self.raw_data)
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
         return json_data
 
@@ -69,6 +86,9 @@ class ImportedMediaSegment(ImportedSegment):
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return super().export_state() + (self.source_timerange.export_state(),)
+
     def export_json(self) -> Dict[str, Any]:
         json_data = super().export_json()
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
@@ -79,7 +99,7 @@ class ImportedTrack(Base_track):
     """模板模式下导入的轨道"""
 
     raw_data: Dict[str, Any]
-    """原始轨道数据"""
+    """原始轨道数据, 与加载的草稿内容共享, 不应原地修改"""
 
     def __init__(self, json_data: Dict[str, Any]):
         self.track_type = Track_type.from_name(json_data["type"])
@@ -87,10 +107,18 @@ class ImportedTrack(Base_track):
         self.track_id = json_data["id"]
         self.render_index = max([int(seg["render_index"]) for seg in json_data["segments"]], default=0)
 
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = json_data
+
+    def copy(self) -> "ImportedTrack":
+        """复制此轨道, 原始json数据不会被复制"""
+        return copy(self)
+
+    def export_state(self) -> Tuple[Any, ...]:
+        """决定导出结果的状态: 原始轨道数据(不会被原地修改)及轨道名称、id"""
+        return (self.raw_data, self.name, self.track_id)
 
     def export_json(self) -> Dict[str, Any]:
-        ret = deepcopy(self.raw_data)
+        ret = dict(self.raw_data)
         ret.update({
             "name": self.name,
             "id": self.track_id
@@ -98,14 +126,41 @@ class ImportedTrack(Base_track):
         return ret
 
 class EditableTrack(ImportedTrack):
-    """模板模式下导入且可修改的轨道(音视频及文本轨道)"""
+    """模板模式下导入且可修改的轨道(音视频及文本轨道)
 
-    segments: List[ImportedSegment]
-    """该轨道包含的片段列表"""
+    片段在首次访问`segments`时才从原始json数据中解析, 未被访问过的轨道按原样导出
+    """
+
+    _segments: Optional[List[ImportedSegment]]
+
+    def __init__(self, json_data: Dict[str, Any]):
+        super().__init__(json_data)
+        self._segments = None
+
+    @property
+    def segments(self) -> List[ImportedSegment]:
+        """该轨道包含的片段列表, 首次访问时解析"""
+        if self._segments is None:
+            self._segments = self._import_segments()
+        return self._segments
+
+    @segments.setter
+    def segments(self, value: List[ImportedSegment]) -> None:
+        self._segments = value
+
+    def _import_segments(self) -> List[ImportedSegment]:
+        """从原始json数据中解析片段"""
+        return [ImportedSegment(seg) for seg in self.raw_data["segments"]]
 
     def __len__(self):
         return len(self.segments)
 
+    def copy(self) -> "EditableTrack":
+        """复制此轨道及其中的片段, 原始json数据不会被复制"""
+        new_track = copy(self)
+        new_track.segments = [seg.copy() for seg in self.segments]
+        return new_track
+
     @property
     def start_time(self) -> int:
         """轨道起始时间, 微秒"""
@@ -120,8 +175,15 @@ class EditableTrack(ImportedTrack):
             return 0
         return self.segments[-1].target_timerange.end
 
+    def export_state(self) -> Tuple[Any, ...]:
+        segment_states = None if self._segments is None else tuple(seg.export_state() for seg in self._segments)
+        return super().export_state() + (self.render_index, segment_states)
+
     def export_json(self) -> Dict[str, Any]:
         ret = super().export_json()
+        # 片段未被解析过且渲染顺序无需改写时, 直接沿用原始片段数据
+        if self._segments is None and all(seg["render_index"] == self.render_index for seg in self.raw_data["segments"]):
+            return ret
         # 为每个片段写入render_index
         segment_exports = [seg.export_json() for seg in self.segments]
         for seg in segment_exports:
@@ -132,19 +194,13 @@ class EditableTrack(ImportedTrack):
 class ImportedTextTrack(EditableTrack):
     """模板模式下导入的文本轨道"""
 
-    def __init__(self, json_data: Dict[str, Any]):
-        super().__init__(json_data)
-        self.segments = [ImportedSegment(seg) for seg in json_data["segments"]]
-
 class ImportedMediaTrack(EditableTrack):
     """模板模式下导入的音频/视频轨道"""
 
-    segments: List[ImportedMediaSegment]
-    """该轨道包含的片段列表"""
+    segments: List[ImportedMediaSegment]  # type: ignore
 
-    def __init__(self, json_data: Dict[str, Any]):
-        super().__init__(json_data)
-        self.segments = [ImportedMediaSegment(seg) for seg in json_data["segments"]]
+    def _import_segments(self) -> List[ImportedSegment]:
+        return [ImportedMediaSegment(seg) for seg in self.raw_data["segments"]]
 
     def check_material_type(self, material: object) -> bool:
         """检查素材类型是否与轨道类型匹配"""
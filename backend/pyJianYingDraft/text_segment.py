@@ -1,23 +1,31 @@
 """定义文本片段及其相关类"""
 
 import json
-import uuid
 from copy import deepcopy
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, TYPE_CHECKING
 from typing import Union, Optional, Literal
 
 from .animation import Segment_animations, Text_animation
-from .metadata import Font_type, Effect_meta
-from .metadata import Text_intro, Text_outro, Text_loop_anim
+from .export_cache import Export_cached
+from .id_factory import new_id
+from .metadata import Effect_meta
 from .segment import Clip_settings, Visual_segment
 from .time_util import Timerange, tim
 
+if TYPE_CHECKING:
+    # 元数据模块较大, 仅在需要时才导入
+    from .metadata import Font_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+
 
 
 
 class Text_style:
     """字体样式类"""
 
+    __slots__ = ("size", "bold", "italic", "underline", "color", "alpha",
+                 "align", "vertical", "letter_spacing", "line_spacing")
+
     size: float
     """字体大小"""
 
@@ -168,7 +176,7 @@ class Text_background:
         }
 
 
-class TextBubble:
+class TextBubble(Export_cached):
     """文本气泡素材, 与滤镜素材本质上一致"""
 
     global_id: str
@@ -178,10 +186,13 @@ class TextBubble:
     resource_id: str
 
     def __init__(self, effect_id: str, resource_id: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_id
         self.resource_id = resource_id
 
+    def export_state(self) -> Tuple[str, str, str]:
+        return (self.global_id, self.effect_id, self.resource_id)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "apply_target_type": 0,
@@ -207,6 +218,8 @@ class TextEffect(TextBubble):
 class Text_segment(Visual_segment):
     """文本片段类, 目前仅支持设置基本的字体样式"""
 
+    __slots__ = ("text", "font", "style", "border", "background", "bubble", "effect")
+
     text: str
     """文本内容"""
     font: Optional[Effect_meta]
@@ -225,7 +238,7 @@ class Text_segment(Visual_segment):
     """文本花字效果, 在放入轨道时加入素材列表中, 目前仅支持一部分花字效果"""
 
     def __init__(self, text: str, timerange: Timerange, *,
-                 font: Optional[Font_type] = None,
+                 font: Optional["Font_type"] = None,
                  style: Optional[Text_style] = None, clip_settings: Optional[Clip_settings] = None,
                  border: Optional[Text_border] = None, background: Optional[Text_background] = None):
         """创建文本片段, 并指定其时间信息、字体样式及图像调节设置
@@ -241,7 +254,7 @@ class Text_segment(Visual_segment):
             border (`Text_border`, optional): 文本描边参数, 默认无描边
             background (`Text_background`, optional): 文本背景参数, 默认无背景
         """
-        super().__init__(uuid.uuid4().hex, None, timerange,
+        super().__init__(new_id(), None, timerange,
                          1.0, 1.0, clip_settings=clip_settings)
 
         self.text = text
@@ -264,7 +277,7 @@ class Text_segment(Visual_segment):
         if template.animations_instance:
             new_segment.animations_instance = deepcopy(
                 template.animations_instance)
-            new_segment.animations_instance.animation_id = uuid.uuid4().hex
+            new_segment.animations_instance.animation_id = new_id()
             new_segment.extra_material_refs.append(
                 new_segment.animations_instance.animation_id)
         if template.bubble:
@@ -275,7 +288,7 @@ class Text_segment(Visual_segment):
 
         return new_segment
 
-    def add_animation(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
+    def add_animation(self, animation_type: Union["Text_intro", "Text_outro", "Text_loop_anim"],
                       duration: Union[str, float] = 500000) -> "Text_segment":
         """将给定的入场/出场/循环动画添加到此片段的动画列表中, 出入场动画的持续时间可以自行设置, 循环动画则会自动填满其余无动画部分
 
@@ -286,6 +299,7 @@ class Text_segment(Visual_segment):
             duration (`str` or `float`, optional): 动画持续时间, 单位为微秒, 仅对入场/出场动画有效.
                 若传入字符串则会调用`tim()`函数进行解析. 默认为0.5秒
         """
+        from .metadata import Text_intro, Text_outro, Text_loop_anim
         duration = min(tim(duration), self.target_timerange.duration)
 
         if isinstance(animation_type, Text_intro):
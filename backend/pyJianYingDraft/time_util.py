@@ -1,6 +1,6 @@
 """定义时间范围类以及与时间相关的辅助函数"""
 
-from typing import Dict
+from typing import Dict, Tuple
 from typing import Union
 
 SEC = 1000000
@@ -33,6 +33,9 @@ def tim(inp: Union[str, float]) -> int:
 
 class Timerange:
     """记录了起始时间及持续长度的时间范围"""
+
+    __slots__ = ("start", "duration")
+
     start: int
     """起始时间, 单位为微秒"""
     duration: int
@@ -74,6 +77,9 @@ class Timerange:
     def __str__(self) -> str:
         return f"[start={self.start}, end={self.end}]"
 
+    def export_state(self) -> Tuple[int, int]:
+        return (self.start, self.duration)
+
     def export_json(self) -> Dict[str, int]:
         return {"start": self.start, "duration": self.duration}
 
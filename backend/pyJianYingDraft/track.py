@@ -1,17 +1,19 @@
 """轨道类及其元数据"""
 
-import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Union, Iterable, Sequence, Callable, Tuple
 from typing import TypeVar, Generic, Type
 
 from .audio_segment import Audio_segment
 from .effect_segment import Effect_segment, Filter_segment
 from .exceptions import SegmentOverlap
+from .export_cache import Export_cached
+from .id_factory import new_id
 from .segment import Base_segment
 from .text_segment import Text_segment
+from .time_util import Timerange
 from .video_segment import Video_segment, Sticker_segment
 
 
@@ -56,7 +58,7 @@ class Track_type(Enum):
         raise ValueError("Invalid track type: %s" % name)
 
 
-class Base_track(ABC):
+class Base_track(Export_cached, ABC):
     """轨道基类"""
 
     track_type: Track_type
@@ -74,6 +76,27 @@ class Base_track(ABC):
 
 Seg_type = TypeVar("Seg_type", bound=Base_segment)
 
+def _segment_start(segment: Base_segment) -> int:
+    return segment.target_timerange.start
+
+def _segment_end(segment: Base_segment) -> int:
+    return segment.target_timerange.end
+
+def _bisect(segments: Sequence[Base_segment], value: int, key: Callable[[Base_segment], int], right: bool) -> int:
+    """按`key`对有序片段列表二分查找, 语义同`bisect_right`(`right`为真时)或`bisect_left`
+
+    `bisect`模块的`key`参数需要Python 3.10, 故在此实现
+    """
+    lo, hi = 0, len(segments)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        k = key(segments[mid])
+        if k < value or (right and k == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
 
 class Track(Base_track, Generic[Seg_type]):
     """非模板模式下的轨道"""
@@ -82,12 +105,12 @@ class Track(Base_track, Generic[Seg_type]):
     """是否静音"""
 
     segments: List[Seg_type]
-    """该轨道包含的片段列表"""
+    """该轨道包含的片段列表, 按起始时间排序"""
 
     def __init__(self, track_type: Track_type, name: str, render_index: int, mute: bool):
         self.track_type = track_type
         self.name = name
-        self.track_id = uuid.uuid4().hex
+        self.track_id = new_id()
         self.render_index = render_index
 
         self.mute = mute
@@ -98,6 +121,7 @@ class Track(Base_track, Generic[Seg_type]):
         """轨道结束时间, 微秒"""
         if len(self.segments) == 0:
             return 0
+        # 片段按起始时间排序且互不重叠, 故最后一个片段的结束时间即为最大值
         return self.segments[-1].target_timerange.end
 
     @property
@@ -119,20 +143,76 @@ class Track(Base_track, Generic[Seg_type]):
             raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (
                 type(segment), self.accept_segment_type))
 
-        # 检查片段是否重叠
-        for seg in self.segments:
-            if seg.overlaps(segment):
+        # 二分查找插入位置, 只需与前后相邻的片段比较是否重叠
+        index = _bisect(self.segments, segment.target_timerange.start, _segment_start, right=True)
+        for neighbor in self.segments[max(0, index - 1):index + 1]:
+            if neighbor.overlaps(segment):
                 raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
                                      .format(segment.target_timerange.start, segment.target_timerange.end))
 
-        self.segments.append(segment)
+        self.segments.insert(index, segment)
         return self
 
+    def add_segments(self, segments: Iterable[Seg_type]) -> "Track[Seg_type]":
+        """向轨道中批量添加片段, 先将新片段排序, 再一次性检查所有片段间的重叠
+
+        任一片段不合法时不会添加其中的任何片段
+
+        Args:
+            segments (Iterable[Seg_type]): 要添加的片段, 可以是生成器
+
+        Raises:
+            `TypeError`: 新片段类型与轨道类型不匹配
+            `SegmentOverlap`: 新片段之间或新片段与现有片段重叠
+        """
+        new_segments = sorted(segments, key=_segment_start)
+        for segment in new_segments:
+            if not isinstance(segment, self.accept_segment_type):
+                raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (
+                    type(segment), self.accept_segment_type))
+        if len(new_segments) == 0:
+            return self
+
+        # 新片段全部位于现有片段之后时直接追加, 否则归并两个有序序列(排序是稳定的, 同起点时现有片段在前)
+        if len(self.segments) == 0 or new_segments[0].start >= self.segments[-1].start:
+            check_from = max(0, len(self.segments) - 1)
+            merged = self.segments + new_segments
+        else:
+            check_from = 0
+            merged = sorted(self.segments + new_segments, key=_segment_start)
+
+        for prev, cur in zip(merged[check_from:], merged[check_from + 1:]):
+            if prev.overlaps(cur):
+                raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
+                                     .format(cur.target_timerange.start, cur.target_timerange.end))
+
+        self.segments = merged
+        return self
+
+    def segments_at(self, time: int) -> List[Seg_type]:
+        """返回在给定时刻(微秒)处于播放状态的片段, 即满足`start <= time < end`的片段"""
+        lo = _bisect(self.segments, time, _segment_end, right=True)
+        hi = _bisect(self.segments, time, _segment_start, right=True)
+        return [seg for seg in self.segments[lo:hi] if seg.start <= time < seg.end]
+
+    def segments_in(self, timerange: Timerange) -> List[Seg_type]:
+        """返回与给定时间范围有重叠的片段, 按起始时间排序"""
+        lo = _bisect(self.segments, timerange.start, _segment_end, right=True)
+        hi = _bisect(self.segments, timerange.end, _segment_start, right=False)
+        return [seg for seg in self.segments[lo:hi] if seg.target_timerange.overlaps(timerange)]
+
+    def export_state(self) -> Tuple[Any, ...]:
+        """决定导出结果的状态: 轨道属性及各片段的状态"""
+        return (self.mute, self.track_id, self.name, self.track_type, self.render_index,
+                tuple(seg.export_state() for seg in self.segments))
+
     def export_json(self) -> Dict[str, Any]:
-        # 为每个片段写入render_index
-        segment_exports = [seg.export_json() for seg in self.segments]
-        for seg in segment_exports:
-            seg["render_index"] = self.render_index
+        # 为每个片段写入render_index, 片段的导出结果被缓存, 故先浅拷贝再写入
+        segment_exports: List[Dict[str, Any]] = []
+        for seg in self.segments:
+            seg_json = dict(seg.export_json_cached())
+            seg_json["render_index"] = self.render_index
+            segment_exports.append(seg_json)
 
         return {
             "attribute": int(self.mute),
@@ -3,20 +3,24 @@
 包含图像调节设置、动画效果、特效、转场等相关类
 """
 
-import uuid
-from copy import deepcopy
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, TYPE_CHECKING
 from typing import Optional, Literal, Union
 
 from .animation import Segment_animations, Video_animation
+from .export_cache import Export_cached
+from .id_factory import new_id
 from .local_materials import Video_material
 from .metadata import Effect_meta, Effect_param_instance
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Mask_meta, Mask_type, Filter_type, Transition_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
+from .metadata import Mask_meta
 from .segment import Visual_segment, Clip_settings
 from .time_util import tim, Timerange
 
+if TYPE_CHECKING:
+    # 元数据模块较大, 仅在需要时才导入
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Filter_type, Mask_type, Transition_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
+
 
 class Mask:
     """蒙版对象"""
@@ -45,7 +49,7 @@ class Mask:
                  cx: float, cy: float, w: float, h: float,
                  ratio: float, rot: float, inv: bool, feather: float, round_corner: float):
         self.mask_meta = mask_meta
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
 
         self.center_x, self.center_y = cx, cy
         self.width, self.height = w, h
@@ -79,7 +83,7 @@ class Mask:
             # 不导出path字段
         }
 
-class Video_effect:
+class Video_effect(Export_cached):
     """视频特效素材"""
 
     name: str
@@ -97,13 +101,14 @@ class Video_effect:
 
     adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Video_scene_effect_type, Video_character_effect_type],
+    def __init__(self, effect_meta: Union["Video_scene_effect_type", "Video_character_effect_type"],
                  params: Optional[List[Optional[float]]] = None, *,
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的特效元数据及参数列表构造一个视频特效对象, params的范围是0~100"""
+        from .metadata import Video_scene_effect_type, Video_character_effect_type
 
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
         self.adjust_params = []
@@ -118,6 +123,10 @@ class Video_effect:
 
         self.adjust_params = effect_meta.value.parse_params(params)
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.name, self.global_id, self.effect_id, self.resource_id, self.effect_type, self.apply_target_type,
+                tuple(param.export_state() for param in self.adjust_params))
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "adjust_params": [param.export_json() for param in self.adjust_params],
@@ -143,7 +152,7 @@ class Video_effect:
             # 不导出path、request_id和algorithm_artifact_path字段
         }
 
-class Filter:
+class Filter(Export_cached):
     """滤镜素材"""
 
     global_id: str
@@ -161,11 +170,15 @@ class Filter:
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的滤镜元数据及强度构造滤镜素材对象"""
 
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_meta = meta
         self.intensity = intensity
         self.apply_target_type = apply_target_type
 
+    def export_state(self) -> Tuple[Any, ...]:
+        meta = self.effect_meta
+        return (self.global_id, meta.name, meta.effect_id, meta.resource_id, self.intensity, self.apply_target_type)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "adjust_params": [],
@@ -200,7 +213,7 @@ class Filter:
             # 不导出path和request_id
         }
 
-class Transition:
+class Transition(Export_cached):
     """转场对象"""
 
     name: str
@@ -217,16 +230,19 @@ class Transition:
     is_overlap: bool
     """是否与上一个片段重叠(?)"""
 
-    def __init__(self, effect_meta: Transition_type, duration: Optional[int] = None):
+    def __init__(self, effect_meta: "Transition_type", duration: Optional[int] = None):
         """根据给定的转场元数据及持续时间构造一个转场对象"""
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
 
         self.duration = duration if duration is not None else effect_meta.value.default_duration
         self.is_overlap = effect_meta.value.is_overlap
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.name, self.global_id, self.effect_id, self.resource_id, self.duration, self.is_overlap)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "category_id": "",  # 一律设为空
@@ -242,7 +258,7 @@ class Transition:
             # 不导出path和request_id字段
         }
 
-class BackgroundFilling:
+class BackgroundFilling(Export_cached):
     """背景填充对象"""
 
     global_id: str
@@ -255,11 +271,14 @@ class BackgroundFilling:
     """背景颜色, 格式为'#RRGGBBAA'"""
 
     def __init__(self, fill_type: Literal["canvas_blur", "canvas_color"], blur: float, color: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = new_id()
         self.fill_type = fill_type
         self.blur = blur
         self.color = color
 
+    def export_state(self) -> Tuple[Any, ...]:
+        return (self.global_id, self.fill_type, self.blur, self.color)
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "id": self.global_id,
@@ -272,8 +291,10 @@ class BackgroundFilling:
 class Video_segment(Visual_segment):
     """安放在轨道上的一个视频/图片片段"""
 
+    __slots__ = ("material_instance", "material_size", "effects", "filters", "mask", "transition", "background_filling")
+
     material_instance: Video_material
-    """素材实例"""
+    """素材实例, 素材不可修改, 可能与其他片段共享"""
     material_size: Tuple[int, int]
     """素材尺寸"""
 
@@ -333,7 +354,7 @@ class Video_segment(Visual_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume, clip_settings=clip_settings)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material  # 素材不可修改, 直接共享而无须复制
         self.material_size = (material.width, material.height)
         self.effects = []
         self.filters = []
@@ -341,7 +362,7 @@ class Video_segment(Visual_segment):
         self.mask = None
         self.background_filling = None
 
-    def add_animation(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type],
+    def add_animation(self, animation_type: Union["Intro_type", "Outro_type", "Group_animation_type"],
                       duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """将给定的入场/出场/组合动画添加到此片段的动画列表中
 
@@ -350,6 +371,7 @@ class Video_segment(Visual_segment):
             duration (`int` or `str`, optional): 动画持续时间, 单位为微秒. 若传入字符串则会调用`tim()`函数进行解析.
                 若不指定则使用动画类型定义的默认值. 理论上只适用于入场和出场动画.
         """
+        from .metadata import Intro_type, Outro_type, Group_animation_type
         if duration is not None:
             duration = tim(duration)
         if isinstance(animation_type, Intro_type):
@@ -372,7 +394,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_effect(self, effect_type: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect_type: Union["Video_scene_effect_type", "Video_character_effect_type"],
                    params: Optional[List[Optional[float]]] = None) -> "Video_segment":
         """为视频片段添加一个作用于整个片段的特效
 
@@ -393,7 +415,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_filter(self, filter_type: Filter_type, intensity: float = 100.0) -> "Video_segment":
+    def add_filter(self, filter_type: "Filter_type", intensity: float = 100.0) -> "Video_segment":
         """为视频片段添加一个滤镜
 
         Args:
@@ -406,7 +428,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_mask(self, mask_type: Mask_type, *, center_x: float = 0.0, center_y: float = 0.0, size: float = 0.5,
+    def add_mask(self, mask_type: "Mask_type", *, center_x: float = 0.0, center_y: float = 0.0, size: float = 0.5,
                  rotation: float = 0.0, feather: float = 0.0, invert: bool = False,
                  rect_width: Optional[float] = None, round_corner: Optional[float] = None) -> "Video_segment":
         """为视频片段添加蒙版
@@ -425,6 +447,7 @@ class Video_segment(Visual_segment):
         Raises:
             `ValueError`: 试图添加多个蒙版或不正确地设置了`rect_width`及`round_corner`
         """
+        from .metadata import Mask_type
 
         if self.mask is not None:
             raise ValueError("当前片段已有蒙版, 不能再添加新的蒙版")
@@ -442,7 +465,7 @@ class Video_segment(Visual_segment):
         self.extra_material_refs.append(self.mask.global_id)
         return self
 
-    def add_transition(self, transition_type: Transition_type, *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
+    def add_transition(self, transition_type: "Transition_type", *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """为视频片段添加转场, 注意转场应当添加在**前面的**片段上
 
         Args:
@@ -496,6 +519,8 @@ class Video_segment(Visual_segment):
 class Sticker_segment(Visual_segment):
     """安放在轨道上的一个贴纸片段"""
 
+    __slots__ = ("resource_id",)
+
     resource_id: str
     """贴纸资源id"""
 
@@ -509,7 +534,7 @@ class Sticker_segment(Visual_segment):
             target_timerange (`Timerange`): 片段在轨道上的目标时间范围
             clip_settings (`Clip_settings`, optional): 图像调节设置, 默认不作任何变换
         """
-        super().__init__(uuid.uuid4().hex, None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
+        super().__init__(new_id(), None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
         self.resource_id = resource_id
 
     def export_material(self) -> Dict[str, Any]: